@@ -10,10 +10,23 @@ import os
 import sys
 import subprocess
 import shutil
-import yaml
 import time
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from core.skill_index import SkillIndex
+    from core.execution import (
+        DEFAULT_TIMEOUT, SkillResult, build_command, execute_skill, execution_mode,
+        reap_process, run_streaming, stream_skill
+    )
+except ImportError:
+    from skill_index import SkillIndex
+    from execution import (
+        DEFAULT_TIMEOUT, SkillResult, build_command, execute_skill, execution_mode,
+        reap_process, run_streaming, stream_skill
+    )
 
 # Detect if running as PyInstaller exe
 RUNNING_AS_EXE = getattr(sys, 'frozen', False) and hasattr(sys, '_MEIPASS')
@@ -24,82 +37,138 @@ if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
 
-try:
-    from rich.console import Console
-    from rich.table import Table
-    from rich.panel import Panel
-    from rich.syntax import Syntax
-    from rich.markdown import Markdown
-    from rich.text import Text
-    from rich.progress import Progress, SpinnerColumn, TextColumn
-    from rich.layout import Layout
-    from rich.live import Live
-except ImportError:
-    print("Error: 'rich' is required. Install with: pip install rich")
-    sys.exit(1)
+_console = None
+
+def get_console():
+    """Return the shared rich Console, importing rich on first use."""
+    global _console
+    if _console is None:
+        try:
+            from rich.console import Console
+        except ImportError:
+            print("Error: 'rich' is required. Install with: pip install rich")
+            sys.exit(1)
+        
+        # Use simpler console options if running as exe to avoid unicode issues
+        if RUNNING_AS_EXE:
+            _console = Console(force_terminal=True, width=100, legacy_windows=True, no_color=False)
+        else:
+            _console = Console(force_terminal=True, width=100, legacy_windows=False)
+    return _console
+
+class _LazyConsole:
+    """
+    Stand-in for the shared Console that defers the rich import to first use.
+    Commands that never render (e.g. `ask run --plain`) never import rich.
+    """
+    
+    def __getattr__(self, name):
+        return getattr(get_console(), name)
+
+console = _LazyConsole()
 
-# Use simpler console options if running as exe to avoid unicode issues
-if RUNNING_AS_EXE:
-    console = Console(force_terminal=True, width=100, legacy_windows=True, no_color=False)
-else:
-    console = Console(force_terminal=True, width=100, legacy_windows=False)
+def default_skills_dir() -> Path:
+    """The skills folder to use when none is given: ASK_SKILLS_DIR, else the installed or project skills."""
+    skills_dir = os.environ.get('ASK_SKILLS_DIR') or None
+    if skills_dir is not None:
+        return Path(skills_dir)
+    
+    # Try multiple locations for skills folder:
+    # 1. Relative to this file (site-packages structure)
+    # 2. Project root (local development)
+    # 3. Current working directory (fallback)
+    
+    # For site-packages: skills is a top-level package alongside core
+    site_skills = Path(__file__).parent.parent / "skills"
+    # For development: skills is at project root
+    project_skills = Path(__file__).resolve().parent.parent / "skills"
+    
+    if site_skills.exists():
+        return site_skills
+    if project_skills.exists():
+        return project_skills
+    return Path("skills")
 
 class SkillManager:
     """Manage and execute skills."""
     
     def __init__(self, skills_dir: str = None):
         if skills_dir is None:
-            # Try multiple locations for skills folder:
-            # 1. Relative to this file (site-packages structure)
-            # 2. Project root (local development)
-            # 3. Current working directory (fallback)
-            
-            # For site-packages: skills is a top-level package alongside core
-            site_skills = Path(__file__).parent.parent / "skills"
-            # For development: skills is at project root
-            project_skills = Path(__file__).resolve().parent.parent / "skills"
-            
-            if site_skills.exists():
-                skills_dir = site_skills
-            elif project_skills.exists():
-                skills_dir = project_skills
-            else:
-                skills_dir = "skills"
+            skills_dir = default_skills_dir()
         
         self.skills_dir = Path(skills_dir)
         self.skills = self._load_skills()
     
-    def _load_skills(self) -> Dict[str, Dict]:
-        """Load all available skills and their manifests."""
+    def _load_skills(self, current: Optional[Dict[str, Dict]] = None) -> Dict[str, Dict]:
+        """
+        Load all available skills and their manifests.
+        
+        Entries of `current` whose manifest is unchanged are reused as-is.
+        """
         skills = {}
+        current = current or {}
         
         if not self.skills_dir.exists():
             return skills
         
-        for skill_folder in self.skills_dir.iterdir():
-            if not skill_folder.is_dir():
-                continue
-            
-            manifest_path = skill_folder / "manifest.yaml"
-            if not manifest_path.exists():
+        # Manifests are served from the compiled index; only changed ones are re-parsed
+        manifests, errors = SkillIndex(self.skills_dir).load()
+        
+        for name, manifest in manifests.items():
+            if name in current and current[name]['manifest'] == manifest:
+                skills[name] = current[name]
                 continue
-            
+            skill_folder = self.skills_dir / name
+            skills[name] = {
+                'path': skill_folder,
+                'manifest': manifest,
+                'script': skill_folder / "script.py"
+            }
+        
+        for name, e in errors:
             try:
-                with open(manifest_path, 'r', encoding='utf-8') as f:
-                    manifest = yaml.safe_load(f)
-                    skills[skill_folder.name] = {
-                        'path': skill_folder,
-                        'manifest': manifest,
-                        'script': skill_folder / "script.py"
-                    }
-            except Exception as e:
-                try:
-                    console.print(f"[red]Error loading {skill_folder.name}: {e}[/red]")
-                except:
-                    print(f"Error loading {skill_folder.name}: {e}")
+                console.print(f"[red]Error loading {name}: {e}[/red]")
+            except:
+                print(f"Error loading {name}: {e}")
         
         return skills
     
+    def refresh(self) -> Dict[str, List[str]]:
+        """
+        Bring the registry up to date with the skills directory.
+        
+        Only added, edited or removed entries change; the registry dict is
+        swapped in one step so concurrent readers never see a partial update.
+        Returns {'added': [...], 'updated': [...], 'removed': [...]}.
+        """
+        old = self.skills
+        new = self._load_skills(old)
+        self.skills = new
+        return {
+            'added': sorted(set(new) - set(old)),
+            'updated': sorted(name for name in new if name in old and new[name] is not old[name]),
+            'removed': sorted(set(old) - set(new)),
+        }
+    
+    def watch(self, on_change=None):
+        """
+        Refresh the registry whenever the skills directory changes.
+        
+        on_change(changes) is called after each refresh that changed something.
+        Returns the running SkillWatcher (call .stop() to end watching).
+        """
+        try:
+            from core.watcher import SkillWatcher
+        except ImportError:
+            from watcher import SkillWatcher
+        
+        def reload():
+            changes = self.refresh()
+            if on_change is not None and any(changes.values()):
+                on_change(changes)
+        
+        return SkillWatcher(self.skills_dir, reload).start()
+    
     def display_banner(self):
         """Display ASK-2026 banner."""
         if RUNNING_AS_EXE:
@@ -127,6 +196,8 @@ class SkillManager:
     
     def display_system_health(self):
         """Display system health dashboard."""
+        from rich.table import Table
+        
         # Check Python version
         python_version = f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}"
         
@@ -157,6 +228,10 @@ class SkillManager:
     
     def display_dashboard(self):
         """Display the beautiful skill dashboard with system health."""
+        from rich.table import Table
+        from rich.panel import Panel
+        from rich.text import Text
+        
         console.print("\n")
         title = Text("Agent-Skill-Kit Dashboard", style="bold cyan", justify="center")
         console.print(Panel(title, expand=False))
@@ -183,10 +258,24 @@ class SkillManager:
         console.print(table)
         console.print("\n")
     
-    def run_skill(self, skill_name: str, args: List[str] = None) -> int:
-        """Execute a skill and display results with live output."""
+    def run_skill(self, skill_name: str, args: List[str] = None, plain: bool = False,
+                  use_cache: bool = True, profile: Optional[str] = None,
+                  profile_dir: Optional[str] = None, source: str = 'cli') -> int:
+        """
+        Execute a skill and display results with live output.
+        
+        With plain=True the skill's stdout/stderr are written through unchanged
+        and rich is never imported, which keeps agent invocations fast.
+        Skills marked `cacheable: true` are served from the result cache
+        unless use_cache is False. profile ('cpu', 'memory' or 'all') runs the
+        skill under cProfile/tracemalloc and writes the profile to profile_dir.
+        Every completed run is recorded in the telemetry store under source.
+        """
         if skill_name not in self.skills:
-            console.print(f"[red]Skill '{skill_name}' not found![/red]")
+            if plain:
+                print(f"Skill '{skill_name}' not found!", file=sys.stderr)
+            else:
+                console.print(f"[red]Skill '{skill_name}' not found![/red]")
             return 1
         
         skill = self.skills[skill_name]
@@ -194,55 +283,240 @@ class SkillManager:
         script_path = skill['script']
         
         if not script_path.exists():
-            console.print(f"[red]Script not found: {script_path}[/red]")
+            if plain:
+                print(f"Script not found: {script_path}", file=sys.stderr)
+            else:
+                console.print(f"[red]Script not found: {script_path}[/red]")
             return 1
         
+        try:
+            from core.result_cache import is_cacheable, reads_stdin
+        except ImportError:
+            from result_cache import is_cacheable, reads_stdin
+        
+        # Cacheable and profiled runs are captured so they can be stored or measured;
+        # runs reading stdin (`-`) always run live as a subprocess that inherits it
+        live = not profile and (reads_stdin(args) or (
+            execution_mode(skill) == 'subprocess' and not (use_cache and is_cacheable(skill, args))))
+        
+        if plain:
+            if live:
+                result = self._run_plain(build_command(skill, args))
+                if result is not None:
+                    self._record(skill_name, result, source)
+                    return result.returncode
+                return 1
+            result, cache_hit, report = self._run_captured(skill_name, args, use_cache, profile, profile_dir)
+            self._record(skill_name, result, source, cache_hit)
+            sys.stdout.write(result.stdout)
+            sys.stderr.write(result.stderr)
+            if profile:
+                try:
+                    from core.profiling import format_report
+                except ImportError:
+                    from profiling import format_report
+                print(format_report(report), file=sys.stderr)
+            return result.returncode
+        
+        from rich.panel import Panel
+        from rich.progress import Progress, SpinnerColumn, TextColumn
+        
         # Display skill info with styling
         console.print(f"\n[bold cyan]▶ Executing: {manifest.get('name', skill_name)}[/bold cyan]")
         console.print(f"[dim]{manifest.get('description', '')}[/dim]\n")
         
-        # Build command
-        cmd = [sys.executable, str(script_path)]
-        if args:
-            cmd.extend(args)
-        
         try:
             # Run skill with live output display
             with Progress(
                 SpinnerColumn(),
                 TextColumn("[progress.description]{task.description}"),
-                console=console,
+                console=get_console(),
                 transient=True
             ) as progress:
                 task = progress.add_task("[cyan]Running skill...", start=False)
                 
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=30,
-                    encoding='utf-8',
-                    errors='replace'
-                )
-            
-            # Display output in panel
-            if result.stdout:
-                console.print(Panel(result.stdout, title="Output", border_style="green"))
+                if live:
+                    # Subprocess skills stream their output live, line by line
+                    result = self._run_live(skill, args, inherit_stdin=reads_stdin(args))
+                    cache_hit = False
+                else:
+                    result, cache_hit, report = self._run_captured(
+                        skill_name, args, use_cache, profile, profile_dir)
+                    if cache_hit:
+                        console.print("[dim]⚡ Served from result cache[/dim]")
+                    
+                    # Display output in panel
+                    if result.stdout:
+                        console.print(Panel(result.stdout, title="Output", border_style="green"))
+                    
+                    if result.stderr:
+                        console.print(Panel(result.stderr, title="Warnings", border_style="yellow"))
+                    
+                    if profile:
+                        try:
+                            from core.profiling import format_report
+                        except ImportError:
+                            from profiling import format_report
+                        console.print(Panel(format_report(report), title="Profile", border_style="magenta"))
             
-            if result.stderr:
-                console.print(Panel(result.stderr, title="Warnings", border_style="yellow"))
+            self._record(skill_name, result, source, cache_hit)
+            if result.timed_out:
+                console.print("[red]Skill execution timed out![/red]")
+                return 1
             
             return result.returncode
         
-        except subprocess.TimeoutExpired:
-            console.print("[red]Skill execution timed out![/red]")
-            return 1
         except Exception as e:
             console.print(f"[red]Error running skill: {e}[/red]")
             return 1
     
+    def _record(self, skill_name: str, result, source: str, cached: bool = False):
+        """Store a finished run in the telemetry database."""
+        try:
+            from core.telemetry import record_result
+        except ImportError:
+            from telemetry import record_result
+        record_result(skill_name, source, result, cached=cached,
+                      mode=execution_mode(self.skills[skill_name]))
+    
+    def _run_captured(self, skill_name: str, args: List[str], use_cache: bool,
+                      profile: Optional[str], profile_dir: Optional[str]):
+        """Run a skill to completion with captured output: (result, cache hit, profile report)."""
+        skill = self.skills[skill_name]
+        
+        if profile:
+            try:
+                from core.profiling import run_profiled
+            except ImportError:
+                from profiling import run_profiled
+            result, report = run_profiled(skill, skill_name, args, mode=profile, out_dir=profile_dir)
+            return result, False, report
+        
+        try:
+            from core.result_cache import execute_cached
+        except ImportError:
+            from result_cache import execute_cached
+        result, cache_hit = execute_cached(skill, args, use_cache=use_cache)
+        return result, cache_hit, None
+    
+    def _run_live(self, skill: Dict, args: List[str] = None, inherit_stdin: bool = False):
+        """Render a subprocess skill's output as it arrives; memory stays bounded."""
+        pending = {'stdout': '', 'stderr': ''}
+        styles = {'stdout': None, 'stderr': 'yellow'}
+        
+        def render(name: str, text: str):
+            lines = (pending[name] + text).split('\n')
+            pending[name] = lines.pop()
+            for line in lines:
+                console.print(line, style=styles[name], markup=False, highlight=False, soft_wrap=True)
+        
+        console.rule("[green]Output[/green]", style="green")
+        result = run_streaming(skill, args, on_output=render, inherit_stdin=inherit_stdin)
+        for name, rest in pending.items():
+            if rest:
+                console.print(rest, style=styles[name], markup=False, highlight=False, soft_wrap=True)
+        console.rule(style="green")
+        
+        for label, path in (("Output", result.stdout_file), ("Warnings", result.stderr_file)):
+            if path:
+                console.print(f"[dim]{label} was large; full copy saved to {path}[/dim]")
+        
+        return result
+    
+    def stream_skill(self, skill_name: str, args: List[str] = None, timeout: float = DEFAULT_TIMEOUT):
+        """
+        Run a skill and iterate over its output as ('stdout' | 'stderr', text) chunks.
+        
+        The generator's return value (StopIteration.value) is the SkillResult;
+        use core.execution.run_streaming for a callback-style API.
+        """
+        if skill_name not in self.skills:
+            raise KeyError(f"Skill '{skill_name}' not found")
+        return stream_skill(self.skills[skill_name], args, timeout)
+    
+    async def arun_skill(self, skill_name: str, args: List[str] = None,
+                         timeout: Optional[float] = DEFAULT_TIMEOUT) -> SkillResult:
+        """
+        Run a skill from async code without blocking the event loop.
+        
+        Output is captured (not printed). A timeout, or cancelling the awaiting
+        task, kills the skill's whole process group.
+        """
+        try:
+            from core.async_execution import arun_skill
+        except ImportError:
+            from async_execution import arun_skill
+        if skill_name not in self.skills:
+            raise KeyError(f"Skill '{skill_name}' not found")
+        result = await arun_skill(self.skills[skill_name], args, timeout)
+        self._record(skill_name, result, 'async')
+        return result
+    
+    async def arun_many(self, jobs: List[Tuple[str, List[str]]], concurrency: int = 16,
+                        timeout: Optional[float] = DEFAULT_TIMEOUT) -> List[SkillResult]:
+        """
+        Run many (skill name, args) jobs concurrently on the running event loop.
+        
+        At most `concurrency` skills run at once; results are returned in job order.
+        """
+        try:
+            from core.async_execution import arun_many
+        except ImportError:
+            from async_execution import arun_many
+        jobs = [(name, list(args or [])) for name, args in jobs]
+        results = await arun_many(self.skills, jobs, concurrency, timeout)
+        for (name, _), result in zip(jobs, results):
+            if name in self.skills:
+                self._record(name, result, 'async')
+        return results
+    
+    def _run_plain(self, cmd: List[str]) -> Optional[SkillResult]:
+        """
+        Run a skill command with its output passed straight through.
+        
+        Returns the SkillResult (without captured output, so its output_size
+        is None), or None if the command could not be started.
+        """
+        sys.stdout.flush()
+        start = time.perf_counter()
+        try:
+            proc = subprocess.Popen(cmd)
+        except Exception as e:
+            print(f"Error running skill: {e}", file=sys.stderr)
+            return None
+        
+        # Kill from a timer rather than proc.wait(timeout) so the child is
+        # reaped by reap_process, which also collects its resource usage
+        expired = threading.Event()
+        
+        def kill():
+            expired.set()
+            proc.kill()
+        
+        timer = threading.Timer(DEFAULT_TIMEOUT, kill)
+        timer.start()
+        try:
+            returncode, cpu_time, max_rss_kb = reap_process(proc)
+        finally:
+            timer.cancel()
+        
+        timed_out = expired.is_set()
+        if timed_out:
+            print("Skill execution timed out!", file=sys.stderr)
+        return SkillResult(
+            returncode=1 if timed_out else returncode,
+            duration=time.perf_counter() - start,
+            timed_out=timed_out,
+            cpu_time=cpu_time,
+            max_rss_kb=max_rss_kb,
+            captured=False,
+        )
+    
     def doctor(self) -> int:
         """Check system dependencies."""
+        from rich.panel import Panel
+        from rich.text import Text
+        
         console.print("\n")
         title = Text("System Doctor", style="bold cyan", justify="center")
         console.print(Panel(title, expand=False))
@@ -307,10 +581,50 @@ def show_help():
   Example: `ask run repo-visualizer .`
   Example: `ask run agent-identity MyProject`
 
+**run --no-cache <skill-name> [args]**
+  Bypass the result cache for skills marked `cacheable: true`
+  Example: `ask run --no-cache convert-csv-to data.csv`
+
+**run --profile[=cpu|memory|all] [--profile-dir=DIR] <skill-name> [args]**
+  Run under cProfile/tracemalloc; writes .pstats, collapsed stacks (for flamegraphs) and a JSON summary
+  Example: `ask run --profile repo-visualizer .`
+
+**run --plain <skill-name> [args]**
+  Execute a skill with raw output and no TUI (fast path for agents, also via `ASK_PLAIN=1`)
+  Example: `ask run --plain tech-pulse`
+
+**batch [--concurrency=N] [--timeout=S] [--no-cache] [FILE|-]**
+  Run many `skill args...` lines (or a JSON list) in parallel, printing NDJSON results as they finish
+  Example: `ls -d repos/* | sed 's/^/repo-visualizer /' | ask batch --concurrency=8`
+
+**bench [--iterations=N] [--sizes=10,100,1000] [--concurrency=1,2,4,8] [--output=FILE] [--compare=baseline.json] [--threshold=0.2]**
+  Measure ASK overhead (start-up, manifest loading, run overhead, MCP round trip, throughput) as JSON
+  Example: `ask bench --output=baseline.json` then `ask bench --compare=baseline.json`
+
+**loadtest [--rate=50] [--duration=10] [--mix=list_tools=1,noop=6,cpu=2,sleep=1] [--transport=stdio|memory] [--execution=subprocess|pool|inprocess] [--env=ASK_MCP_WORKERS=4] [--output=FILE] [--compare=baseline.json] [--max-error-rate=R]**
+  Drive the MCP gateway with synthetic no-op, CPU and sleep skills at a target rate; reports throughput, error rate and latency percentiles as JSON
+  Example: `ask loadtest --rate=100 --duration=30 --max-error-rate=0.01`
+
+**pipe [--timeout=S] <skill> [args] -- <skill> [args] [-- ...]**
+  Stream skills into each other through OS pipes (stdout of one is stdin of the next); a stage reads stdin when given `-`
+  Example: `ask pipe convert-csv-to big.csv -- transform-json-to - > big.yaml`
+
+**serve [--socket=PATH] [--status] [--stop]**
+  Keep skills, caches and the worker pool loaded in a daemon on a Unix socket; `ask run --plain` forwards to it while it runs
+  Example: `ask serve &` then `ask run --plain tech-pulse`
+
+**stats [--since=24h] [--skill=NAME] [--source=cli|gui|mcp|batch] [--json]**
+  Show recorded run telemetry per skill: p50/p95/p99 latency, CPU time, peak memory and throughput
+  Example: `ask stats --since=7d`
+
 **doctor**
   Check system dependencies and configuration
   Example: `ask doctor`
 
+**--startup-profile [command]**
+  Show an import-time breakdown of ASK startup for a command
+  Example: `ask --startup-profile run --plain repo-visualizer`
+
 **help**
   Show this help message
   Example: `ask help` (or `ask --help`)
@@ -348,8 +662,186 @@ python ask.py run tech-pulse
 python ask.py doctor
 ```
 """
+    from rich.markdown import Markdown
     console.print(Markdown(help_text))
 
+def parse_command_args(argv: List[str]):
+    """
+    Split command arguments into (options, first positional, remaining args).
+    
+    Only --options placed before the first positional (e.g. the skill name
+    for `ask run`) belong to ask; everything after it is passed on untouched.
+    """
+    options = {}
+    index = 0
+    while index < len(argv) and argv[index].startswith('--') and argv[index] != '--':
+        key, _, value = argv[index][2:].partition('=')
+        options[key.replace('-', '_')] = value or True
+        index += 1
+    
+    skill_name = argv[index] if index < len(argv) else None
+    return options, skill_name, argv[index + 1:]
+
+def run_batch_command(manager: SkillManager, argv: List[str]) -> int:
+    """`ask batch [--concurrency=N] [--timeout=S] [--no-cache] [FILE|-]`: NDJSON results on stdout."""
+    try:
+        from core.batch import parse_jobs, run_batch
+    except ImportError:
+        from batch import parse_jobs, run_batch
+    
+    options, source, _ = parse_command_args(argv)
+    try:
+        concurrency = int(options.get('concurrency', 0)) or None
+        use_cache = not options.get('no_cache')
+        timeout = float(options.get('timeout', DEFAULT_TIMEOUT))
+        if source in (None, '-'):
+            text = sys.stdin.read()
+        else:
+            with open(source, 'r', encoding='utf-8') as f:
+                text = f.read()
+        jobs = parse_jobs(text)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    
+    summary = run_batch(manager.skills, jobs, concurrency=concurrency, timeout=timeout,
+                        use_cache=use_cache)
+    print(
+        f"{summary['jobs']} jobs, {summary['failures']} failed in {summary['wall_seconds']:.2f}s "
+        f"({summary['throughput_per_sec']:.1f} jobs/s, concurrency {summary['concurrency']}) | "
+        f"p50 {summary['p50_ms']:.1f} ms, p95 {summary['p95_ms']:.1f} ms",
+        file=sys.stderr
+    )
+    return 0 if summary['failures'] == 0 else 1
+
+def pipe_command(manager: SkillManager, argv: List[str]) -> int:
+    """`ask pipe [--timeout=S] a [args] -- b [args] ...`: raw pipeline, exit status like pipefail."""
+    try:
+        from core.pipeline import parse_pipeline, run_pipeline
+        from core.telemetry import record_result
+    except ImportError:
+        from pipeline import parse_pipeline, run_pipeline
+        from telemetry import record_result
+    
+    options, first, rest = parse_command_args(argv)
+    try:
+        stages = parse_pipeline(([first] if first is not None else []) + rest)
+        timeout = float(options['timeout']) if 'timeout' in options else None
+        result = run_pipeline(manager.skills, stages, timeout=timeout)
+    except (KeyError, FileNotFoundError, ValueError) as e:
+        message = e.args[0] if isinstance(e, KeyError) else e
+        print(f"Error: {message}", file=sys.stderr)
+        return 1
+    
+    for name, stage_result in result.stages:
+        record_result(name, 'pipe', stage_result, mode='subprocess')
+    
+    if result.timed_out:
+        print("Pipeline timed out!", file=sys.stderr)
+    failed = result.failed_stage()
+    if failed:
+        index, name, stage_result = failed
+        print(f"Stage {index + 1} ({name}) exited with code {stage_result.returncode}", file=sys.stderr)
+    return result.returncode
+
+def serve_command(argv: List[str]) -> int:
+    """`ask serve [--socket=PATH] [--status] [--stop]`: run or control the skill daemon."""
+    try:
+        from core.daemon import SkillDaemon, request
+    except ImportError:
+        from daemon import SkillDaemon, request
+    
+    options, _, _ = parse_command_args(argv)
+    socket_path = options.get('socket') if options.get('socket') is not True else None
+    
+    if options.get('status') or options.get('stop'):
+        command = 'shutdown' if options.get('stop') else 'ping'
+        reply = request({'command': command}, socket_path)
+        if reply is None:
+            print("ask daemon is not running", file=sys.stderr)
+            return 1
+        if command == 'shutdown':
+            print("ask daemon stopping")
+        else:
+            import json
+            print(json.dumps(reply, indent=2))
+        return 0
+    
+    manager = SkillManager()
+    if any(execution_mode(skill) == 'pool' for skill in manager.skills.values()):
+        try:
+            from core.worker_pool import get_pool
+        except ImportError:
+            from worker_pool import get_pool
+        get_pool().start()
+    
+    if os.environ.get('ASK_WATCH') != '0':
+        manager.watch(lambda changes: print(
+            f"Skills reloaded: {', '.join(f'{k} {v}' for k, v in changes.items() if v)}", file=sys.stderr))
+    
+    daemon = SkillDaemon(manager, socket_path)
+    print(f"ask daemon listening on {daemon.socket_path} with {len(manager.skills)} skills (Ctrl+C to stop)",
+          file=sys.stderr)
+    try:
+        daemon.serve_forever()
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+def stats_command(argv: List[str]) -> int:
+    """`ask stats [--since=24h] [--skill=NAME] [--source=S] [--json]`: per-skill run telemetry."""
+    try:
+        from core.telemetry import get_telemetry, parse_window
+    except ImportError:
+        from telemetry import get_telemetry, parse_window
+    
+    options, _, _ = parse_command_args(argv)
+    window = options.get('since', '24h')
+    try:
+        since = parse_window(window)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    
+    store = get_telemetry()
+    if store is None:
+        print("Telemetry is disabled (ASK_TELEMETRY=0) or its database is unavailable.", file=sys.stderr)
+        return 1
+    stats = store.query_stats(since, skill=options.get('skill'), source=options.get('source'))
+    
+    if options.get('json'):
+        import json
+        print(json.dumps({'window': window, 'skills': stats}, indent=2))
+        return 0
+    
+    if not stats:
+        console.print(f"[dim]No runs recorded in the last {window}.[/dim]")
+        return 0
+    
+    from rich.table import Table
+    
+    def fmt(value):
+        return "-" if value is None else f"{value:,.1f}"
+    
+    table = Table(title=f"⏱ Skill runs in the last {window}", show_header=True, header_style="bold magenta")
+    for column in ("Skill", "Runs", "Fail", "Cache", "p50 ms", "p95 ms", "p99 ms", "CPU ms", "RSS MiB", "Runs/min"):
+        if column == "Skill":
+            table.add_column(column, no_wrap=True, min_width=15)
+        else:
+            table.add_column(column, justify="right", no_wrap=True)
+    for row in stats:
+        table.add_row(
+            row['skill'], str(row['runs']), str(row['failures']), str(row['cache_hits']),
+            fmt(row['p50_ms']), fmt(row['p95_ms']), fmt(row['p99_ms']), fmt(row['mean_cpu_ms']),
+            fmt(row['max_rss_kb'] / 1024 if row['max_rss_kb'] is not None else None),
+            f"{row['runs_per_min']:.3f}",
+        )
+    console.print(table)
+    return 0
+
 def main():
     """Main entry point."""
     if len(sys.argv) < 2:
@@ -365,8 +857,76 @@ def main():
         show_help()
         return 0
     
+    if command == '--startup-profile':
+        try:
+            from core.startup_profile import profile_startup
+        except ImportError:
+            from startup_profile import profile_startup
+        return profile_startup(sys.argv[2:])
+    
+    if command == 'bench':
+        try:
+            from core.bench import bench_command
+        except ImportError:
+            from bench import bench_command
+        options, _, _ = parse_command_args(sys.argv[2:])
+        return bench_command(options)
+    
+    if command == 'loadtest':
+        try:
+            from core.loadtest import loadtest_command
+        except ImportError:
+            from loadtest import loadtest_command
+        options, _, _ = parse_command_args(sys.argv[2:])
+        return loadtest_command(options)
+    
+    if command == 'stats':
+        return stats_command(sys.argv[2:])
+    
+    if command == 'run':
+        options, skill_name, args = parse_command_args(sys.argv[2:])
+        plain = bool(options.get('plain') or os.environ.get('ASK_PLAIN'))
+        if skill_name is None:
+            if plain:
+                print("Usage: ask run [--plain] <skill-name> [args]", file=sys.stderr)
+            else:
+                console.print("[red]Usage: ask run [--plain] <skill-name> [args][/red]")
+            return 1
+        
+        profile = options.get('profile')
+        if profile is True:
+            profile = 'all'
+        if profile and profile not in ('cpu', 'memory', 'all'):
+            print(f"Unknown profile mode '{profile}' (use cpu, memory or all)", file=sys.stderr)
+            return 1
+        
+        # Agents' fast path: hand the run to `ask serve` when it is up
+        if plain and not profile and '-' not in args:
+            try:
+                from core.daemon import forward_run
+            except ImportError:
+                from daemon import forward_run
+            code = forward_run(skill_name, args, use_cache=not options.get('no_cache'),
+                               skills_dir=default_skills_dir())
+            if code is not None:
+                return code
+        
+        manager = SkillManager()
+        return manager.run_skill(skill_name, args or None, plain=plain,
+                                 use_cache=not options.get('no_cache'),
+                                 profile=profile, profile_dir=options.get('profile_dir'))
+    
+    if command == 'serve':
+        return serve_command(sys.argv[2:])
+    
     manager = SkillManager()
     
+    if command == 'batch':
+        return run_batch_command(manager, sys.argv[2:])
+    
+    if command == 'pipe':
+        return pipe_command(manager, sys.argv[2:])
+    
     if command == 'dashboard':
         manager.display_banner()
         manager.display_dashboard()
@@ -375,15 +935,6 @@ def main():
     elif command == 'doctor':
         return manager.doctor()
     
-    elif command == 'run':
-        if len(sys.argv) < 3:
-            console.print("[red]Usage: ask run <skill-name> [args][/red]")
-            return 1
-        
-        skill_name = sys.argv[2]
-        args = sys.argv[3:] if len(sys.argv) > 3 else None
-        return manager.run_skill(skill_name, args)
-    
     else:
         console.print(f"[red]Unknown command: {command}[/red]")
         console.print("[dim]Run 'ask help' for available commands[/dim]\n")
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+Async Skill Execution
+asyncio-native counterparts of core.execution for embedding ASK in async
+agents. Subprocess skills run via asyncio.create_subprocess_exec in their own
+process group, so a timeout or a cancelled task kills the skill and anything
+it spawned. In-process and pooled skills run on the loop's default executor.
+"""
+
+import asyncio
+import codecs
+import time
+import threading
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+try:
+    from core.execution import (
+        DEFAULT_MAX_MEMORY, DEFAULT_TIMEOUT, OutputBuffer, SkillResult, build_command,
+        execute_skill, execution_mode, kill_process_group, process_group_kwargs
+    )
+except ImportError:
+    from execution import (
+        DEFAULT_MAX_MEMORY, DEFAULT_TIMEOUT, OutputBuffer, SkillResult, build_command,
+        execute_skill, execution_mode, kill_process_group, process_group_kwargs
+    )
+
+Job = Tuple[str, List[str]]
+# Awaited with (stream name, decoded text) as a subprocess skill produces output
+OutputCallback = Callable[[str, str], Awaitable[None]]
+
+_CHUNK_SIZE = 64 * 1024
+
+
+async def _pump(stream: asyncio.StreamReader, buffer: OutputBuffer, name: str,
+                on_output: Optional[OutputCallback] = None):
+    """Decode a child's output stream into buffer until EOF, reporting each chunk."""
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    while True:
+        data = await stream.read(_CHUNK_SIZE)
+        if not data:
+            break
+        text = decoder.decode(data)
+        buffer.write(text)
+        if on_output is not None and text:
+            await on_output(name, text)
+    buffer.write(decoder.decode(b'', final=True))
+
+
+async def _communicate(proc, stdout: OutputBuffer, stderr: OutputBuffer,
+                       on_output: Optional[OutputCallback] = None) -> int:
+    await asyncio.gather(_pump(proc.stdout, stdout, 'stdout', on_output),
+                         _pump(proc.stderr, stderr, 'stderr', on_output))
+    return await proc.wait()
+
+
+async def arun_command(cmd: List[str], timeout: Optional[float] = DEFAULT_TIMEOUT,
+                       max_memory: int = DEFAULT_MAX_MEMORY,
+                       on_output: Optional[OutputCallback] = None) -> SkillResult:
+    """
+    Run a command without blocking the event loop and capture its output.
+
+    on_output, if given, is awaited with each chunk as it is read, so callers
+    can forward partial output. On timeout the child's process group is
+    killed and a timed-out result is returned; if the awaiting task is
+    cancelled the group is killed and the CancelledError propagates.
+    """
+    start = time.perf_counter()
+    stdout, stderr = OutputBuffer(max_memory), OutputBuffer(max_memory)
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        **process_group_kwargs()
+    )
+    spawn_time = time.perf_counter() - start
+
+    timed_out = False
+    try:
+        returncode = await asyncio.wait_for(_communicate(proc, stdout, stderr, on_output), timeout)
+    except asyncio.TimeoutError:
+        timed_out = True
+        kill_process_group(proc)
+        returncode = await proc.wait()
+    except BaseException:
+        # Cancelled (or failed): never leave the skill running behind us
+        kill_process_group(proc)
+        await asyncio.shield(proc.wait())
+        stdout.discard()
+        stderr.discard()
+        raise
+    finally:
+        stdout.close()
+        stderr.close()
+
+    return SkillResult(
+        returncode=1 if timed_out else returncode,
+        stdout=stdout.getvalue(),
+        stderr=stderr.getvalue(),
+        duration=time.perf_counter() - start,
+        timed_out=timed_out,
+        stdout_file=stdout.path,
+        stderr_file=stderr.path,
+        output_size=stdout.size + stderr.size,
+        spawn_time=spawn_time,
+    )
+
+
+async def arun_skill(skill: Dict, args: List[str] = None, timeout: Optional[float] = DEFAULT_TIMEOUT,
+                     max_memory: int = DEFAULT_MAX_MEMORY,
+                     on_output: Optional[OutputCallback] = None) -> SkillResult:
+    """
+    Async execute_skill(): run a skill in its execution mode without blocking the loop.
+
+    on_output only sees subprocess skills; in-process and pooled runs return
+    their output all at once. Every mode spills output beyond max_memory.
+    """
+    if execution_mode(skill) != 'subprocess':
+        # The executor thread cannot be stopped; a run finishing after its
+        # caller gave up deletes its own spill files
+        lock = threading.Lock()
+        state = {'abandoned': False, 'result': None}
+
+        def run() -> SkillResult:
+            result = execute_skill(skill, args, timeout, None, max_memory)
+            with lock:
+                state['result'] = result
+                if state['abandoned']:
+                    result.discard_files()
+            return result
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(None, run)
+        except asyncio.CancelledError:
+            with lock:
+                state['abandoned'] = True
+                if state['result'] is not None:
+                    state['result'].discard_files()
+            raise
+    return await arun_command(build_command(skill, args), timeout, max_memory, on_output)
+
+
+async def arun_many(skills: Dict[str, Dict], jobs: List[Job], concurrency: int = 16,
+                    timeout: Optional[float] = DEFAULT_TIMEOUT) -> List[SkillResult]:
+    """
+    Run (skill, args) jobs with at most `concurrency` in flight.
+
+    Results come back in job order; unknown skills yield a failed result
+    instead of raising, so one bad job does not cancel the rest.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run_job(name: str, args: List[str]) -> SkillResult:
+        if name not in skills:
+            return SkillResult(returncode=1, stderr=f"Skill '{name}' not found")
+        async with semaphore:
+            try:
+                return await arun_skill(skills[name], args, timeout)
+            except Exception as e:
+                return SkillResult(returncode=1, stderr=f"Error running skill: {e}")
+
+    return list(await asyncio.gather(*(run_job(name, args) for name, args in jobs)))
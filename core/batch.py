@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+Batch Runner
+Runs many skill invocations with bounded concurrency and reports each
+result as an NDJSON line as soon as it completes.
+"""
+
+import os
+import sys
+import json
+import time
+import shlex
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, TextIO, Tuple
+
+try:
+    from core.execution import DEFAULT_TIMEOUT, execution_mode
+    from core.result_cache import execute_cached
+    from core.telemetry import record_result
+    from core.timing import summarize
+except ImportError:
+    from execution import DEFAULT_TIMEOUT, execution_mode
+    from result_cache import execute_cached
+    from telemetry import record_result
+    from timing import summarize
+
+Job = Tuple[str, List[str]]
+
+
+def parse_jobs(text: str) -> List[Job]:
+    """
+    Parse batch input into (skill, args) jobs.
+
+    Accepts either a JSON list (items may be "skill args", ["skill", "arg"...]
+    or {"skill": ..., "args": [...] or "args..."}) or one `skill args...` line
+    per job, with blank lines and # comments ignored. Raises ValueError for
+    malformed input.
+    """
+    if text.lstrip().startswith('['):
+        jobs = []
+        for item in json.loads(text):
+            if isinstance(item, str):
+                item = shlex.split(item)
+            if isinstance(item, dict):
+                if not isinstance(item.get('skill'), str) or not item['skill']:
+                    raise ValueError(f"Batch entry has no \"skill\" name: {item!r}")
+                args = item.get('args', [])
+                if isinstance(args, str):
+                    args = shlex.split(args)
+                elif not isinstance(args, list):
+                    raise ValueError(f"Batch entry \"args\" must be a list or a string: {item!r}")
+                jobs.append((item['skill'], [str(a) for a in args]))
+            elif isinstance(item, list) and item:
+                jobs.append((str(item[0]), [str(a) for a in item[1:]]))
+            else:
+                raise ValueError(f"Invalid batch entry: {item!r}")
+        return jobs
+
+    jobs = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        parts = shlex.split(line)
+        jobs.append((parts[0], parts[1:]))
+    return jobs
+
+
+def _batch_skill(skill: Dict, concurrency: int) -> Dict:
+    """
+    The skill as a batch job runs it: in-process runs share one interpreter
+    and one lock, so with concurrency each job gets its own process instead.
+    """
+    if concurrency > 1 and execution_mode(skill) == 'inprocess':
+        return dict(skill, manifest=dict(skill.get('manifest') or {}, execution='subprocess'))
+    return skill
+
+
+def run_batch(skills: Dict[str, Dict], jobs: List[Job], concurrency: int = None,
+              timeout: float = DEFAULT_TIMEOUT, out: TextIO = None, use_cache: bool = True) -> Dict:
+    """
+    Run jobs on a bounded pool, writing one NDJSON record per finished job.
+
+    Returns a summary with throughput and latency percentiles (milliseconds).
+    """
+    out = out or sys.stdout
+    concurrency = max(1, concurrency or os.cpu_count() or 1)
+    latencies = []
+    failures = 0
+
+    def run_job(index: int, skill_name: str, args: List[str]) -> Dict:
+        record = {'index': index, 'skill': skill_name, 'args': args}
+        start = time.perf_counter()
+        if skill_name not in skills:
+            record.update(exit_code=1, timed_out=False, stdout='', stderr=f"Skill '{skill_name}' not found")
+        else:
+            skill = _batch_skill(skills[skill_name], concurrency)
+            try:
+                result, cache_hit = execute_cached(skill, args, timeout, use_cache)
+                record_result(skill_name, 'batch', result, cached=cache_hit, mode=execution_mode(skill))
+                record.update(exit_code=result.returncode, timed_out=result.timed_out,
+                              stdout=result.stdout, stderr=result.stderr, cached=cache_hit)
+            except Exception as e:
+                record.update(exit_code=1, timed_out=False, stdout='', stderr=f"Error running skill: {e}")
+        record['duration_ms'] = round((time.perf_counter() - start) * 1000, 3)
+        return record
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(run_job, i, name, args) for i, (name, args) in enumerate(jobs)]
+        for future in as_completed(futures):
+            record = future.result()
+            latencies.append(record['duration_ms'])
+            if record['exit_code'] != 0:
+                failures += 1
+            out.write(json.dumps(record, ensure_ascii=False) + '\n')
+            out.flush()
+    wall = time.perf_counter() - start
+
+    stats = summarize(latencies)
+    return {
+        'jobs': len(jobs),
+        'failures': failures,
+        'concurrency': concurrency,
+        'wall_seconds': round(wall, 3),
+        'throughput_per_sec': round(len(jobs) / wall, 3) if wall > 0 else 0.0,
+        'p50_ms': stats['p50'],
+        'p95_ms': stats['p95'],
+    }
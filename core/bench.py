@@ -0,0 +1,400 @@
+# -*- coding: utf-8 -*-
+"""
+ASK Benchmark Suite
+Measures ASK's own overhead: cold CLI start-up, manifest loading versus
+number of skills, per-run overhead for a no-op skill in each execution
+mode, MCP call_tool round trips and batch throughput at several
+concurrency levels. Produces a JSON report that can be compared against
+a saved baseline.
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import asyncio
+import tempfile
+import subprocess
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+try:
+    from core.execution import execute_skill
+    from core import skill_index
+    from core.skill_index import SkillIndex
+    from core.batch import run_batch
+    from core.timing import summarize
+except ImportError:
+    from execution import execute_skill
+    import skill_index
+    from skill_index import SkillIndex
+    from batch import run_batch
+    from timing import summarize
+
+ASK_SCRIPT = Path(__file__).resolve().parent / "ask.py"
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_SIZES = (10, 100, 1000)
+DEFAULT_CONCURRENCY = (1, 2, 4, 8)
+DEFAULT_THRESHOLD = 0.20
+# Latency changes smaller than this are treated as noise
+MIN_DELTA_MS = 1.0
+
+SYNTHETIC_MANIFEST = '''name: {name}
+version: "1.0.0"
+description: "Synthetic {kind} skill generated by ask bench"
+
+author: "Agent-Skill-Kit Benchmarks"
+category: "benchmark"
+
+requirements:
+  - name: "python"
+    version: ">=3.8"
+
+api_keys_required: false
+dependencies: []
+{extra}
+usage:
+  command: "python script.py"
+  args_optional:
+    - name: "input"
+      description: "Input argument"
+      example: "python script.py example"
+
+output_format: "markdown"
+
+tags:
+  - "benchmark"
+  - "keyless"
+  - "local"
+'''
+
+SYNTHETIC_SCRIPTS = {
+    'noop': '''def main(*args):
+    pass
+
+
+if __name__ == "__main__":
+    main()
+''',
+    'cpu': '''import sys
+
+
+def main(n="200000", *args):
+    total = 0
+    for i in range(int(n)):
+        total += i * i
+    print(total)
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
+''',
+    'sleep': '''import sys
+import time
+
+
+def main(seconds="0.1", *args):
+    time.sleep(float(seconds))
+    print("slept", seconds)
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
+''',
+}
+
+
+def make_synthetic_skills(root: Path, count: int, kind: str = 'noop', prefix: str = 'bench',
+                          extra_manifest: str = '') -> List[str]:
+    """Create count synthetic skills of the given kind under root; returns their names."""
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    names = []
+    for i in range(count):
+        name = f"{prefix}-{kind}-{i:05d}"
+        skill_dir = root / name
+        skill_dir.mkdir(exist_ok=True)
+        (skill_dir / "manifest.yaml").write_text(
+            SYNTHETIC_MANIFEST.format(name=name, kind=kind, extra=extra_manifest), encoding='utf-8')
+        (skill_dir / "script.py").write_text(SYNTHETIC_SCRIPTS[kind], encoding='utf-8')
+        names.append(name)
+    return names
+
+
+def _time_ms(func: Callable, iterations: int) -> List[float]:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _stats(samples: List[float]) -> Dict[str, float]:
+    stats = summarize(samples)
+    return {
+        'p50_ms': round(stats['p50'], 3),
+        'p95_ms': round(stats['p95'], 3),
+        'mean_ms': round(stats['mean'], 3),
+    }
+
+
+def bench_startup(skills_dir: Path, iterations: int) -> Dict:
+    """Cold CLI start-up: bare interpreter, module import and `ask run --plain` of a no-op."""
+    # No daemon forwarding, no telemetry writes and a private cache directory,
+    # so the runs measure this tree alone rather than a running daemon or the user's caches
+    env = dict(os.environ, ASK_SKILLS_DIR=str(skills_dir), PYTHONDONTWRITEBYTECODE='1',
+               ASK_NO_DAEMON='1', ASK_TELEMETRY='0',
+               ASK_CACHE_DIR=str(skills_dir.parent / "startup-cache"))
+    import_cmd = [sys.executable, '-c',
+                  f"import sys; sys.path.insert(0, {str(PROJECT_ROOT)!r}); import core.ask"]
+    commands = {
+        'python_baseline': [sys.executable, '-c', 'pass'],
+        'import_ask': import_cmd,
+        'run_plain_noop': [sys.executable, str(ASK_SCRIPT), 'run', '--plain', 'bench-noop-00000'],
+    }
+    results = {}
+    for label, cmd in commands.items():
+        samples = _time_ms(
+            lambda: subprocess.run(cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL),
+            iterations)
+        results[label] = _stats(samples)
+    return results
+
+
+def _pure_python_loader():
+    """Temporarily force the pure-Python SafeLoader (for comparison with libyaml)."""
+    import yaml
+    saved = skill_index._loader
+    skill_index._loader = yaml.SafeLoader
+    return lambda: setattr(skill_index, '_loader', saved)
+
+
+def bench_manifest_loading(work_dir: Path, sizes: List[int], iterations: int) -> Dict:
+    """
+    SkillIndex load time versus skill count.
+
+    cold: empty index, parsed with the default strategy (C loader, concurrent
+    for large directories); cold_serial: same loader, one manifest at a time;
+    cold_pure_python: serial with the pure-Python loader; warm: stat pass only.
+    """
+    results = {}
+    skill_index.yaml_loader()  # keep the one-off yaml import out of the samples
+    for size in sizes:
+        skills_dir = work_dir / f"skills-{size}"
+        make_synthetic_skills(skills_dir, size)
+        # Age the manifests so the index does not treat them as racily modified
+        past = time.time() - 60
+        for manifest in skills_dir.glob("*/manifest.yaml"):
+            os.utime(manifest, (past, past))
+
+        index_path = work_dir / f"index-{size}.pickle"
+
+        def cold_load(strategy: str) -> List[float]:
+            samples = []
+            for _ in range(max(1, iterations // 5)):
+                if index_path.exists():
+                    index_path.unlink()
+                start = time.perf_counter()
+                SkillIndex(skills_dir, index_path=index_path).load(strategy)
+                samples.append((time.perf_counter() - start) * 1000)
+            return samples
+
+        entry = {'cold': _stats(cold_load('auto')), 'cold_serial': _stats(cold_load('serial'))}
+        restore = _pure_python_loader()
+        try:
+            entry['cold_pure_python'] = _stats(cold_load('serial'))
+        finally:
+            restore()
+        entry['warm'] = _stats(_time_ms(lambda: SkillIndex(skills_dir, index_path=index_path).load(), iterations))
+        results[str(size)] = entry
+    return results
+
+
+def bench_run_overhead(skills_dir: Path, iterations: int) -> Dict:
+    """Wall time of one no-op skill run in each execution mode."""
+    skill = {
+        'path': skills_dir / 'bench-noop-00000',
+        'script': skills_dir / 'bench-noop-00000' / 'script.py',
+        'manifest': {},
+    }
+    results = {}
+    for mode in ('subprocess', 'pool', 'inprocess'):
+        variant = dict(skill, manifest={'execution': mode})
+        execute_skill(variant)  # warm caches / pool
+        samples = _time_ms(lambda: execute_skill(variant), iterations)
+        results[mode] = _stats(samples)
+    return results
+
+
+def bench_mcp_call_tool(skills_dir: Path, iterations: int) -> Optional[Dict]:
+    """Round trip through the gateway's tools/call handler (None if mcp is not installed)."""
+    try:
+        from mcp import types
+        try:
+            from core.mcp_gateway import SkillMCPServer
+        except ImportError:
+            from mcp_gateway import SkillMCPServer
+    except (ImportError, SystemExit):
+        return None
+
+    with redirect_stdout(io.StringIO()):
+        server = SkillMCPServer(skills_dir=str(skills_dir))
+    handler = server.server.request_handlers[types.CallToolRequest]
+    request = types.CallToolRequest(
+        method='tools/call',
+        params=types.CallToolRequestParams(name='bench-noop-00000', arguments={}),
+    )
+
+    async def measure():
+        await handler(request)
+        samples = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            await handler(request)
+            samples.append((time.perf_counter() - start) * 1000)
+        return samples
+
+    return _stats(asyncio.run(measure()))
+
+
+def bench_throughput(skills_dir: Path, levels: List[int], jobs: int) -> Dict:
+    """Batch throughput of no-op subprocess runs at each concurrency level."""
+    skills = {
+        'bench-noop-00000': {
+            'path': skills_dir / 'bench-noop-00000',
+            'script': skills_dir / 'bench-noop-00000' / 'script.py',
+            'manifest': {'execution': 'subprocess'},
+        }
+    }
+    results = {}
+    for level in levels:
+        summary = run_batch(skills, [('bench-noop-00000', [])] * jobs, concurrency=level,
+                            out=io.StringIO(), use_cache=False)
+        results[f"c{level}"] = {
+            'jobs_per_sec': summary['throughput_per_sec'],
+            'p50_ms': summary['p50_ms'],
+            'p95_ms': summary['p95_ms'],
+        }
+    return results
+
+
+def run_benchmarks(iterations: int = 10, sizes: List[int] = DEFAULT_SIZES,
+                   levels: List[int] = DEFAULT_CONCURRENCY, log=None) -> Dict:
+    """Run every benchmark section and return the JSON-serialisable report."""
+    log = log or (lambda message: print(message, file=sys.stderr))
+    work_dir = Path(tempfile.mkdtemp(prefix='ask-bench-'))
+    # The in-process sections must not write telemetry rows or index and
+    # result caches into the user's cache directory
+    saved_env = dict(os.environ)
+    os.environ.update(ASK_TELEMETRY='0', ASK_CACHE_DIR=str(work_dir / "cache"))
+    try:
+        skills_dir = work_dir / "skills"
+        make_synthetic_skills(skills_dir, 1)
+
+        report = {
+            'meta': {
+                'python': sys.version.split()[0],
+                'platform': sys.platform,
+                'cpu_count': os.cpu_count(),
+                'iterations': iterations,
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            }
+        }
+        log("▶ cold start-up")
+        report['startup'] = bench_startup(skills_dir, iterations)
+        log("▶ manifest loading")
+        report['manifest_loading'] = bench_manifest_loading(work_dir, list(sizes), iterations)
+        log("▶ run_skill overhead")
+        report['run_overhead'] = bench_run_overhead(skills_dir, iterations)
+        log("▶ MCP call_tool round trip")
+        mcp_result = bench_mcp_call_tool(skills_dir, iterations)
+        if mcp_result is not None:
+            report['mcp_call_tool'] = mcp_result
+        else:
+            log("  skipped (mcp not installed)")
+        log("▶ throughput")
+        report['throughput'] = bench_throughput(skills_dir, list(levels), max(iterations * 4, 20))
+        return report
+    finally:
+        os.environ.clear()
+        os.environ.update(saved_env)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def flatten(report: Dict, prefix: str = '') -> Dict[str, float]:
+    """Flatten numeric metrics into dotted keys (meta is skipped)."""
+    flat = {}
+    for key, value in report.items():
+        if key == 'meta' and not prefix:
+            continue
+        name = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, name))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = float(value)
+    return flat
+
+
+def compare(current: Dict, baseline: Dict, threshold: float = DEFAULT_THRESHOLD) -> List[Dict]:
+    """
+    Regressions beyond threshold: latencies (*_ms) that grew (by more than
+    MIN_DELTA_MS), or throughputs (*per_sec) that shrank.
+    """
+    now, before = flatten(current), flatten(baseline)
+    regressions = []
+    for key in sorted(set(now) & set(before)):
+        old, new = before[key], now[key]
+        if old <= 0:
+            continue
+        change = (new - old) / old
+        if key.endswith('_ms') and change > threshold and new - old > MIN_DELTA_MS:
+            regressions.append({'metric': key, 'baseline': old, 'current': new, 'change': round(change, 3)})
+        elif key.endswith('per_sec') and change < -threshold:
+            regressions.append({'metric': key, 'baseline': old, 'current': new, 'change': round(change, 3)})
+    return regressions
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in str(value).split(',') if v.strip()]
+
+
+def bench_command(options: Dict) -> int:
+    """`ask bench [--iterations=N] [--sizes=10,100] [--concurrency=1,4] [--output=F] [--compare=F] [--threshold=0.2]`"""
+    iterations = int(options.get('iterations', 10))
+    sizes = _int_list(options['sizes']) if 'sizes' in options else DEFAULT_SIZES
+    levels = _int_list(options['concurrency']) if 'concurrency' in options else DEFAULT_CONCURRENCY
+    threshold = float(options.get('threshold', DEFAULT_THRESHOLD))
+
+    report = run_benchmarks(iterations, sizes, levels)
+
+    status = 0
+    if options.get('compare'):
+        with open(options['compare'], 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, threshold)
+        report['comparison'] = {
+            'baseline': options['compare'],
+            'threshold': threshold,
+            'regressions': regressions,
+        }
+        for item in regressions:
+            print(f"⚠️  regression: {item['metric']} {item['baseline']:.3f} -> {item['current']:.3f} "
+                  f"({item['change']:+.0%})", file=sys.stderr)
+        if regressions:
+            status = 1
+        else:
+            print(f"✅ no regressions beyond {threshold:.0%}", file=sys.stderr)
+
+    text = json.dumps(report, indent=2)
+    if options.get('output'):
+        with open(options['output'], 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+        print(f"Report written to {options['output']}", file=sys.stderr)
+    else:
+        print(text)
+    return status
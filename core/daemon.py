@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+"""
+ASK Daemon
+`ask serve` keeps a SkillManager (registry, result cache, worker pool and
+in-process modules) alive behind a Unix domain socket. `ask run --plain`
+forwards to it when it is running, so a call costs a socket round trip
+instead of a full Python start-up and skill scan; without a daemon the CLI
+runs the skill itself as before.
+
+Protocol: one JSON request line from the client, e.g.
+    {"command": "run", "skill": "tech-pulse", "args": [], "cwd": "/src",
+     "skills_dir": "/src/skills", "use_cache": true}
+answered by JSON lines
+    {"stream": "stdout", "data": "..."} ... {"exit": 0}
+or, when the daemon serves a different skills folder than the client
+resolved, by {"declined": "..."}; the client then runs the skill itself.
+Other commands: "ping" (daemon status) and "shutdown".
+
+Skills run in the client's working directory but with the daemon's
+environment, and with no stdin.
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import threading
+import socketserver
+from typing import Dict, List, Optional
+
+try:
+    from core.paths import get_socket_path
+except ImportError:
+    from paths import get_socket_path
+
+
+def _connect(path: Optional[str] = None) -> Optional[socket.socket]:
+    """Connected socket to a running daemon, or None."""
+    if not hasattr(socket, 'AF_UNIX'):
+        return None
+    path = path or str(get_socket_path())
+    if not os.path.exists(path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def request(payload: Dict, path: Optional[str] = None) -> Optional[Dict]:
+    """Send a one-shot command (ping, shutdown) and return the reply, or None without a daemon."""
+    sock = _connect(path)
+    if sock is None:
+        return None
+    with sock, sock.makefile('rw', encoding='utf-8', newline='\n') as stream:
+        stream.write(json.dumps(payload) + '\n')
+        stream.flush()
+        line = stream.readline()
+    return json.loads(line) if line else None
+
+
+def _same_dir(a, b) -> bool:
+    try:
+        return os.path.samefile(a, b)
+    except OSError:
+        return os.path.abspath(a) == os.path.abspath(b)
+
+
+def forward_run(skill_name: str, args: List[str], use_cache: bool = True,
+                skills_dir=None) -> Optional[int]:
+    """
+    Run a skill through the daemon, streaming its output to our stdout/stderr.
+
+    Returns the exit code, or None when no daemon is reachable or it serves
+    a skills folder other than skills_dir (the caller should then run the
+    skill itself). Disabled by ASK_NO_DAEMON=1.
+    """
+    if os.environ.get('ASK_NO_DAEMON'):
+        return None
+    sock = _connect()
+    if sock is None:
+        return None
+
+    payload = {
+        'command': 'run',
+        'skill': skill_name,
+        'args': list(args),
+        'cwd': os.getcwd(),
+        'use_cache': use_cache,
+    }
+    if skills_dir is not None:
+        payload['skills_dir'] = os.path.abspath(str(skills_dir))
+    outputs = {'stdout': sys.stdout, 'stderr': sys.stderr}
+    with sock, sock.makefile('rw', encoding='utf-8', newline='\n') as stream:
+        stream.write(json.dumps(payload) + '\n')
+        stream.flush()
+        for line in stream:
+            message = json.loads(line)
+            if 'exit' in message:
+                return message['exit']
+            if 'declined' in message:
+                return None
+            out = outputs[message['stream']]
+            out.write(message['data'])
+            out.flush()
+
+    # The daemon went away mid-run; do not re-run a skill that may have had effects
+    print("ask daemon closed the connection before the skill finished", file=sys.stderr)
+    return 1
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """One client connection: a single request line, streamed replies."""
+
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+
+        def send(message: Dict):
+            self.wfile.write((json.dumps(message) + '\n').encode('utf-8'))
+            self.wfile.flush()
+
+        try:
+            self.server.skill_daemon.handle(json.loads(line), send)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client went away; any running skill was stopped with it
+
+
+class SkillDaemon:
+    """Serves skill runs for thin `ask` clients over a Unix domain socket."""
+
+    def __init__(self, manager, socket_path: Optional[str] = None):
+        self.manager = manager
+        self.socket_path = str(socket_path or get_socket_path())
+        self.started = time.time()
+        self._server = None
+
+    def handle(self, request: Dict, send):
+        """Dispatch one request; send(message) writes a reply line."""
+        command = request.get('command')
+        if command == 'ping':
+            send({'pid': os.getpid(), 'skills': len(self.manager.skills),
+                  'uptime': round(time.time() - self.started, 3),
+                  'skills_dir': str(self.manager.skills_dir)})
+        elif command == 'shutdown':
+            send({'ok': True})
+            threading.Thread(target=self._server.shutdown, daemon=True).start()
+        elif command == 'run':
+            self._run(request, send)
+        else:
+            send({'stream': 'stderr', 'data': f"Unknown daemon command: {command}\n"})
+            send({'exit': 1})
+
+    def _run(self, request: Dict, send):
+        try:
+            from core.execution import DEFAULT_TIMEOUT, SkillStream, build_command, execution_mode
+            from core.result_cache import execute_cached, is_cacheable
+            from core.telemetry import record_result
+        except ImportError:
+            from execution import DEFAULT_TIMEOUT, SkillStream, build_command, execution_mode
+            from result_cache import execute_cached, is_cacheable
+            from telemetry import record_result
+
+        name = request.get('skill')
+        args = [str(a) for a in request.get('args', [])]
+        cwd = request.get('cwd') or None
+        use_cache = request.get('use_cache', True)
+
+        # A client resolving another skills folder (ASK_SKILLS_DIR, project
+        # checkout) must not get this daemon's skill of the same name
+        skills_dir = request.get('skills_dir')
+        if skills_dir and not _same_dir(skills_dir, self.manager.skills_dir):
+            send({'declined': f"daemon serves {self.manager.skills_dir}, not {skills_dir}"})
+            return
+
+        skill = self.manager.skills.get(name)
+        if skill is None:
+            send({'stream': 'stderr', 'data': f"Skill '{name}' not found!\n"})
+            send({'exit': 1})
+            return
+        if not skill['script'].exists():
+            send({'stream': 'stderr', 'data': f"Script not found: {skill['script']}\n"})
+            send({'exit': 1})
+            return
+
+        mode = execution_mode(skill)
+        cached = False
+        if mode == 'subprocess' and not (use_cache and is_cacheable(skill, args)):
+            stream = SkillStream(build_command(skill, args), DEFAULT_TIMEOUT, cwd=cwd)
+            for stream_name, text in stream:
+                send({'stream': stream_name, 'data': text})
+            result = stream.result
+        else:
+            result, cached = execute_cached(skill, args, use_cache=use_cache, cwd=cwd)
+            if result.stdout:
+                send({'stream': 'stdout', 'data': result.stdout})
+            if result.stderr:
+                send({'stream': 'stderr', 'data': result.stderr})
+
+        record_result(name, 'daemon', result, cached=cached, mode=mode)
+        if result.timed_out:
+            send({'stream': 'stderr', 'data': "Skill execution timed out!\n"})
+        send({'exit': result.returncode})
+
+    def serve_forever(self):
+        """Listen until a shutdown request, SIGTERM or Ctrl+C."""
+        if not hasattr(socketserver, 'ThreadingUnixStreamServer'):
+            raise RuntimeError("ask serve needs Unix domain sockets, which this platform lacks")
+
+        if os.path.exists(self.socket_path):
+            probe = _connect(self.socket_path)
+            if probe is not None:
+                probe.close()
+                raise RuntimeError(f"an ask daemon is already listening on {self.socket_path}")
+            os.unlink(self.socket_path)  # stale socket from a crashed daemon
+
+        # The socket accepts commands that run code: owner access only
+        old_umask = os.umask(0o177)
+        try:
+            self._server = socketserver.ThreadingUnixStreamServer(self.socket_path, _Handler)
+        finally:
+            os.umask(old_umask)
+        self._server.daemon_threads = True
+        self._server.skill_daemon = self
+
+        if threading.current_thread() is threading.main_thread():
+            import signal
+            signal.signal(signal.SIGTERM, lambda *_: threading.Thread(
+                target=self._server.shutdown, daemon=True).start())
+
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
@@ -0,0 +1,416 @@
+# -*- coding: utf-8 -*-
+"""
+Skill Execution
+Shared execution path for the CLI, GUI and MCP gateway. Skills run in a
+fresh Python subprocess by default; manifests may opt into another mode
+with the `execution` field, and ASK_EXECUTION sets the default for skills
+that do not.
+"""
+
+import os
+import sys
+import time
+import codecs
+import signal
+import queue
+import tempfile
+import threading
+import subprocess
+from collections import deque
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# Default per-run timeout in seconds
+DEFAULT_TIMEOUT = 30
+
+EXECUTION_MODES = ('subprocess', 'inprocess', 'pool')
+
+# Streamed output kept in memory before spilling to a temp file
+DEFAULT_MAX_MEMORY = 1024 * 1024
+# Size of the in-memory tail kept once output has spilled
+DEFAULT_TAIL_SIZE = 64 * 1024
+
+_CHUNK_SIZE = 64 * 1024
+
+
+class SkillResult:
+    """Outcome of a single skill run."""
+
+    def __init__(self, returncode: int, stdout: str = "", stderr: str = "",
+                 duration: float = 0.0, timed_out: bool = False,
+                 stdout_file: Optional[str] = None, stderr_file: Optional[str] = None,
+                 cpu_time: Optional[float] = None, max_rss_kb: Optional[int] = None,
+                 output_size: Optional[int] = None, spawn_time: Optional[float] = None,
+                 captured: bool = True):
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+        self.duration = duration
+        self.timed_out = timed_out
+        # Set when a streamed run spilled its full output to disk; stdout/stderr
+        # then hold only the tail of the stream.
+        self.stdout_file = stdout_file
+        self.stderr_file = stderr_file
+        # Resource usage of the skill process, when the platform reports it
+        self.cpu_time = cpu_time
+        self.max_rss_kb = max_rss_kb
+        self._output_size = output_size
+        # False when the output went straight to the terminal and was never seen
+        self.captured = captured
+        # Seconds spent starting the skill process (async subprocess runs)
+        self.spawn_time = spawn_time
+
+    @property
+    def output_size(self) -> Optional[int]:
+        """Characters written to stdout and stderr (including any spilled output), None if not captured."""
+        if not self.captured:
+            return None
+        if self._output_size is not None:
+            return self._output_size
+        return len(self.stdout) + len(self.stderr)
+
+    def discard_files(self):
+        """Delete the spill files of a result whose full output will not be served."""
+        for path in (self.stdout_file, self.stderr_file):
+            if path:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+        self.stdout_file = self.stderr_file = None
+
+    def __repr__(self):
+        return (f"SkillResult(returncode={self.returncode}, duration={self.duration:.3f}, "
+                f"timed_out={self.timed_out})")
+
+
+def execution_mode(skill: Dict) -> str:
+    """Return the manifest's execution mode, defaulting to ASK_EXECUTION or 'subprocess'."""
+    default = os.environ.get('ASK_EXECUTION', 'subprocess')
+    mode = str((skill.get('manifest') or {}).get('execution', default)).lower()
+    return mode if mode in EXECUTION_MODES else 'subprocess'
+
+
+def build_command(skill: Dict, args: List[str] = None) -> List[str]:
+    """Build the subprocess command line for a skill."""
+    cmd = [sys.executable, str(skill['script'])]
+    if args:
+        cmd.extend(args)
+    return cmd
+
+
+def reap_process(proc: subprocess.Popen) -> Tuple[int, Optional[float], Optional[int]]:
+    """
+    Wait for proc and return (returncode, cpu seconds, peak RSS in KiB).
+
+    Resource usage comes from wait4() and is None where that is unavailable
+    or the process was already reaped.
+    """
+    if not hasattr(os, 'wait4') or proc.returncode is not None:
+        return proc.wait(), None, None
+    try:
+        _, status, usage = os.wait4(proc.pid, 0)
+    except ChildProcessError:
+        return proc.wait(), None, None
+
+    if os.WIFSIGNALED(status):
+        proc.returncode = -os.WTERMSIG(status)
+    else:
+        proc.returncode = os.WEXITSTATUS(status)
+    # macOS reports ru_maxrss in bytes, Linux in KiB
+    max_rss = usage.ru_maxrss // 1024 if sys.platform == 'darwin' else usage.ru_maxrss
+    return proc.returncode, usage.ru_utime + usage.ru_stime, max_rss
+
+
+def process_group_kwargs() -> Dict:
+    """Popen/create_subprocess_exec arguments that start the child in its own process group."""
+    if sys.platform == 'win32':
+        return {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {'start_new_session': True}
+
+
+def kill_process_group(proc):
+    """
+    Kill a child started with process_group_kwargs() together with anything
+    it spawned. Works for subprocess.Popen and asyncio processes.
+    """
+    if proc.returncode is not None:
+        return
+    try:
+        if sys.platform == 'win32':
+            proc.kill()
+        else:
+            os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def run_subprocess(cmd: List[str], timeout: float = DEFAULT_TIMEOUT, cwd: Optional[str] = None,
+                   max_memory: int = sys.maxsize) -> SkillResult:
+    """Run a command to completion, capturing its output (all of it by default)."""
+    stream = SkillStream(cmd, timeout, max_memory=max_memory, cwd=cwd)
+    for _ in stream:
+        pass
+    return stream.result
+
+
+def execute_skill(skill: Dict, args: List[str] = None, timeout: float = DEFAULT_TIMEOUT,
+                  cwd: Optional[str] = None, max_memory: int = sys.maxsize) -> SkillResult:
+    """
+    Run a skill in the mode its manifest asks for and capture the result (in cwd, if given).
+
+    Output beyond max_memory characters per stream spills to a temp file
+    (stdout_file/stderr_file) with only its tail kept in memory; by default
+    everything is kept. timeout is not enforced for in-process skills: a thread cannot be killed,
+    so skills that may hang or run long belong in the pool or a subprocess.
+    """
+    mode = execution_mode(skill)
+
+    if mode == 'inprocess':
+        try:
+            from core.inprocess import get_executor
+        except ImportError:
+            from inprocess import get_executor
+        return get_executor().run(Path(skill['script']), args, cwd, max_memory)
+
+    if mode == 'pool':
+        try:
+            from core.worker_pool import get_pool
+        except ImportError:
+            from worker_pool import get_pool
+        return get_pool().run(Path(skill['script']), args, timeout, cwd, max_memory)
+
+    return run_subprocess(build_command(skill, args), timeout, cwd, max_memory)
+
+
+class OutputBuffer:
+    """
+    Accumulates one output stream with bounded memory.
+
+    Output is kept in memory up to max_memory characters. Beyond that the full
+    stream is spilled to a temp file and only the last tail_size characters
+    stay in memory.
+    """
+
+    def __init__(self, max_memory: int = DEFAULT_MAX_MEMORY, tail_size: int = DEFAULT_TAIL_SIZE):
+        self.max_memory = max_memory
+        self.tail_size = tail_size
+        self.size = 0
+        self.path: Optional[str] = None
+        self._chunks = deque()
+        self._held = 0
+        self._file = None
+
+    @property
+    def spilled(self) -> bool:
+        return self.path is not None
+
+    def write(self, text: str):
+        if not text:
+            return
+        self.size += len(text)
+        if self._file is None and self.size > self.max_memory:
+            self._file = tempfile.NamedTemporaryFile(
+                'w', encoding='utf-8', prefix='ask-output-', suffix='.txt', delete=False)
+            self.path = self._file.name
+            self._file.write(''.join(self._chunks))
+        if self._file is not None:
+            self._file.write(text)
+        self._chunks.append(text)
+        self._held += len(text)
+        if self._file is not None:
+            self._trim()
+
+    def _trim(self):
+        """Drop whole chunks from the front while the tail stays large enough."""
+        while self._chunks and self._held - len(self._chunks[0]) >= self.tail_size:
+            self._held -= len(self._chunks.popleft())
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+    def discard(self):
+        """Close and delete the spill file (output nobody will read)."""
+        self.close()
+        if self.path is not None:
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+            self.path = None
+
+    def getvalue(self) -> str:
+        """Full output, or only its tail once it has spilled to disk."""
+        text = ''.join(self._chunks)
+        if self.spilled:
+            return text[-self.tail_size:]
+        return text
+
+    @classmethod
+    def from_file(cls, path: str, max_memory: int = DEFAULT_MAX_MEMORY,
+                  tail_size: int = DEFAULT_TAIL_SIZE) -> 'OutputBuffer':
+        """
+        Buffer for output another process already wrote to path. The file is
+        kept as the spill file when the output exceeds max_memory and deleted
+        otherwise; either way memory stays bounded while reading it.
+        """
+        buffer = cls(max_memory, tail_size)
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        with open(path, 'rb') as f:
+            for data in iter(lambda: f.read(_CHUNK_SIZE), b''):
+                buffer._hold(decoder.decode(data))
+            buffer._hold(decoder.decode(b'', final=True))
+        if buffer.size > max_memory:
+            buffer.path = path
+        else:
+            os.unlink(path)
+        return buffer
+
+    def _hold(self, text: str):
+        if not text:
+            return
+        self.size += len(text)
+        self._chunks.append(text)
+        self._held += len(text)
+        if self.size > self.max_memory:
+            self._trim()
+
+
+class SkillStream:
+    """
+    A running skill subprocess whose output is read incrementally.
+
+    Iterate to receive ('stdout' | 'stderr', text) chunks as they are produced;
+    once iteration finishes, .result holds the SkillResult with bounded output.
+    """
+
+    def __init__(self, cmd: List[str], timeout: Optional[float] = DEFAULT_TIMEOUT,
+                 max_memory: int = DEFAULT_MAX_MEMORY, **popen_kwargs):
+        self.cmd = cmd
+        self.timeout = timeout
+        self.result: Optional[SkillResult] = None
+        self.stdout = OutputBuffer(max_memory)
+        self.stderr = OutputBuffer(max_memory)
+        self._chunks = queue.Queue()
+        self._start = time.perf_counter()
+        self.proc = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            stdin=popen_kwargs.pop('stdin', subprocess.DEVNULL),
+            **popen_kwargs
+        )
+        self._readers = [
+            threading.Thread(target=self._pump, args=('stdout', self.proc.stdout), daemon=True),
+            threading.Thread(target=self._pump, args=('stderr', self.proc.stderr), daemon=True),
+        ]
+        for reader in self._readers:
+            reader.start()
+
+    def _pump(self, name: str, pipe):
+        """Reader thread: forward decoded chunks until EOF."""
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        try:
+            while True:
+                data = pipe.read1(_CHUNK_SIZE)
+                if not data:
+                    break
+                text = decoder.decode(data)
+                if text:
+                    self._chunks.put((name, text))
+            tail = decoder.decode(b'', final=True)
+            if tail:
+                self._chunks.put((name, tail))
+        finally:
+            pipe.close()
+            self._chunks.put((name, None))
+
+    def kill(self):
+        """Terminate the skill process."""
+        if self.proc.poll() is None:
+            self.proc.kill()
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        deadline = None if self.timeout is None else self._start + self.timeout
+        open_streams = 2
+        timed_out = False
+
+        try:
+            while open_streams:
+                wait = None if deadline is None else deadline - time.perf_counter()
+                try:
+                    if wait is not None and wait <= 0:
+                        raise queue.Empty
+                    name, text = self._chunks.get(timeout=wait)
+                except queue.Empty:
+                    timed_out = True
+                    self.kill()
+                    deadline = None
+                    continue
+                if text is None:
+                    open_streams -= 1
+                    continue
+                (self.stdout if name == 'stdout' else self.stderr).write(text)
+                yield name, text
+        finally:
+            if open_streams:
+                # Consumer stopped early
+                self.kill()
+            returncode, cpu_time, max_rss_kb = reap_process(self.proc)
+            self.stdout.close()
+            self.stderr.close()
+            self.result = SkillResult(
+                returncode=1 if timed_out else returncode,
+                stdout=self.stdout.getvalue(),
+                stderr=self.stderr.getvalue(),
+                duration=time.perf_counter() - self._start,
+                timed_out=timed_out,
+                stdout_file=self.stdout.path,
+                stderr_file=self.stderr.path,
+                cpu_time=cpu_time,
+                max_rss_kb=max_rss_kb,
+                output_size=self.stdout.size + self.stderr.size,
+            )
+
+
+def stream_skill(skill: Dict, args: List[str] = None, timeout: float = DEFAULT_TIMEOUT,
+                 max_memory: int = DEFAULT_MAX_MEMORY,
+                 inherit_stdin: bool = False) -> Iterator[Tuple[str, str]]:
+    """
+    Iterate over a skill's output as it runs, yielding (stream, text) chunks.
+
+    Subprocess skills stream live; in-process and pooled skills yield their
+    captured output once they finish. With inherit_stdin the skill always
+    runs as a subprocess reading this process's stdin (for `-` arguments).
+    The generator returns the SkillResult (available as StopIteration.value,
+    or use run_streaming()).
+    """
+    if execution_mode(skill) != 'subprocess' and not inherit_stdin:
+        result = execute_skill(skill, args, timeout)
+        if result.stdout:
+            yield 'stdout', result.stdout
+        if result.stderr:
+            yield 'stderr', result.stderr
+        return result
+
+    stream = SkillStream(build_command(skill, args), timeout, max_memory,
+                         stdin=None if inherit_stdin else subprocess.DEVNULL)
+    for chunk in stream:
+        yield chunk
+    return stream.result
+
+
+def run_streaming(skill: Dict, args: List[str] = None,
+                  on_output: Optional[Callable[[str, str], None]] = None,
+                  timeout: float = DEFAULT_TIMEOUT, max_memory: int = DEFAULT_MAX_MEMORY,
+                  inherit_stdin: bool = False) -> SkillResult:
+    """Run a skill, calling on_output(stream, text) for each chunk, and return its result."""
+    chunks = stream_skill(skill, args, timeout, max_memory, inherit_stdin)
+    while True:
+        try:
+            name, text = next(chunks)
+        except StopIteration as stop:
+            return stop.value
+        if on_output is not None:
+            on_output(name, text)
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+In-Process Skill Executor
+Runs opted-in skills (`execution: inprocess` in manifest.yaml) inside the
+current interpreter instead of spawning a new Python process per call.
+"""
+
+import io
+import os
+import sys
+import time
+import codecs
+import types
+import hashlib
+import inspect
+import threading
+import traceback
+from contextlib import redirect_stdout, redirect_stderr
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from core.execution import OutputBuffer, SkillResult
+except ImportError:
+    from execution import OutputBuffer, SkillResult
+
+
+class _Sink(io.RawIOBase):
+    """Binary stream decoding UTF-8 into an OutputBuffer."""
+
+    def __init__(self, output: OutputBuffer):
+        super().__init__()
+        self.output = output
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.output.write(self._decoder.decode(bytes(data)))
+        return len(data)
+
+    def finish(self):
+        self.output.write(self._decoder.decode(b'', final=True))
+        self.output.close()
+
+
+class _Capture(io.TextIOWrapper):
+    """
+    Text stream collected into an OutputBuffer, so output beyond max_memory
+    spills to a temp file instead of growing in memory.
+
+    Skills re-wrap sys.stdout.buffer on Windows, so the capture has to expose
+    a real binary buffer rather than being a plain StringIO.
+    """
+
+    def __init__(self, max_memory: int):
+        self.sink = _Sink(OutputBuffer(max_memory))
+        super().__init__(io.BufferedWriter(self.sink), encoding='utf-8', errors='replace',
+                         write_through=True)
+
+    def finish(self) -> OutputBuffer:
+        """Flush everything written and return the collected output."""
+        self.flush()
+        self.sink.finish()
+        return self.sink.output
+
+
+class InProcessExecutor:
+    """Load each skill script once (keyed by content hash) and call its main()."""
+
+    def __init__(self):
+        self._modules: Dict[str, Tuple[str, types.ModuleType]] = {}
+        # stdout/stderr redirection and sys.argv are process-wide state
+        self._lock = threading.RLock()
+
+    def _load(self, script_path: Path) -> types.ModuleType:
+        """Return the cached module for script_path, reloading it if the file changed."""
+        source = script_path.read_bytes()
+        digest = hashlib.sha256(source).hexdigest()
+
+        cached = self._modules.get(str(script_path))
+        if cached and cached[0] == digest:
+            return cached[1]
+
+        module = types.ModuleType(f"ask_skill_{digest[:16]}")
+        module.__file__ = str(script_path)
+        code = compile(source, str(script_path), 'exec')
+        exec(code, module.__dict__)
+
+        if not callable(getattr(module, 'main', None)):
+            raise AttributeError(f"{script_path} does not define main()")
+
+        self._modules[str(script_path)] = (digest, module)
+        return module
+
+    @staticmethod
+    def _bind_args(func, args: List[str]) -> List[str]:
+        """Drop surplus positional args the way the scripts' argv handling does."""
+        try:
+            params = inspect.signature(func).parameters.values()
+        except (TypeError, ValueError):
+            return list(args)
+        if any(p.kind == p.VAR_POSITIONAL for p in params):
+            return list(args)
+        positional = [p for p in params if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)]
+        return list(args)[:len(positional)]
+
+    def run(self, script_path: Path, args: List[str] = None, cwd: Optional[str] = None,
+            max_memory: int = sys.maxsize):
+        """
+        Execute script_path's main(*args) with captured output (spilled to a
+        temp file beyond max_memory characters per stream).
+
+        Returns a SkillResult. Timeouts are not enforced for in-process skills.
+        With cwd the process working directory is switched for the duration
+        of the run (runs are serialised, so this is safe between them).
+        """
+        args = list(args or [])
+        stdout, stderr = _Capture(max_memory), _Capture(max_memory)
+        returncode = 0
+
+        with self._lock:
+            # Timed from acquiring the lock, so waiting for another run is not counted
+            start = time.perf_counter()
+            cpu_start = time.thread_time()
+            saved_argv = sys.argv
+            saved_cwd = os.getcwd() if cwd else None
+            sys.argv = [str(script_path)] + args
+            try:
+                if cwd:
+                    os.chdir(cwd)
+                with redirect_stdout(stdout), redirect_stderr(stderr):
+                    try:
+                        module = self._load(script_path)
+                        value = module.main(*self._bind_args(module.main, args))
+                        if isinstance(value, int) and not isinstance(value, bool):
+                            returncode = value
+                    except SystemExit as e:
+                        if e.code is None:
+                            returncode = 0
+                        elif isinstance(e.code, int):
+                            returncode = e.code
+                        else:
+                            print(e.code, file=sys.stderr)
+                            returncode = 1
+                    except Exception:
+                        traceback.print_exc()
+                        returncode = 1
+                    finally:
+                        # Flush any wrapper the skill installed over our capture
+                        sys.stdout.flush()
+                        sys.stderr.flush()
+            finally:
+                sys.argv = saved_argv
+                if saved_cwd:
+                    os.chdir(saved_cwd)
+            duration = time.perf_counter() - start
+            # The skill runs on this thread, so its thread CPU time is the skill's
+            cpu_time = time.thread_time() - cpu_start
+
+        out, err = stdout.finish(), stderr.finish()
+        return SkillResult(
+            returncode=returncode,
+            stdout=out.getvalue(),
+            stderr=err.getvalue(),
+            duration=duration,
+            stdout_file=out.path,
+            stderr_file=err.path,
+            cpu_time=cpu_time,
+            output_size=out.size + err.size,
+        )
+
+
+_executor = None
+
+
+def get_executor() -> InProcessExecutor:
+    """Return the process-wide in-process executor."""
+    global _executor
+    if _executor is None:
+        _executor = InProcessExecutor()
+    return _executor
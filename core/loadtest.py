@@ -0,0 +1,396 @@
+# -*- coding: utf-8 -*-
+"""
+MCP Gateway Load Test
+Launches the gateway on synthetic skills (no-op, CPU-bound and sleep),
+replays a weighted mix of list_tools / call_tool requests at a target rate
+from a scripted MCP client, and reports throughput, error rate and latency
+percentiles per operation. Everything runs locally, so it works offline.
+
+Requests are sent open-loop (arrivals follow the target rate, not the
+responses), so an overloaded gateway shows up as rising latency rather than
+a silently lower request rate. Arrivals that would exceed the client's cap
+on outstanding requests are counted as dropped.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import asyncio
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    from core.bench import compare, make_synthetic_skills
+    from core.scheduler import parse_weights
+    from core.timing import summarize
+except ImportError:
+    from bench import compare, make_synthetic_skills
+    from scheduler import parse_weights
+    from timing import summarize
+
+GATEWAY_SCRIPT = Path(__file__).resolve().parent / "mcp_gateway.py"
+
+OPERATIONS = ('list_tools', 'noop', 'cpu', 'sleep')
+DEFAULT_MIX = 'list_tools=1,noop=6,cpu=2,sleep=1'
+DEFAULT_RATE = 50.0
+DEFAULT_DURATION = 10.0
+DEFAULT_MAX_OUTSTANDING = 256
+DEFAULT_TIMEOUT = 30.0
+# Work per synthetic call: loop iterations of the cpu skill, seconds of the sleep skill
+DEFAULT_CPU_N = 20000
+DEFAULT_SLEEP = 0.05
+
+# Synthetic calls are identical, so coalescing would hide the execution cost
+_NO_COALESCE = "coalesce: false\n"
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """'list_tools=1,noop=6' -> weights per operation; unknown operations are an error."""
+    mix = parse_weights(spec)
+    unknown = sorted(set(mix) - set(OPERATIONS))
+    if unknown:
+        raise ValueError(f"unknown operation(s) in mix: {', '.join(unknown)} "
+                         f"(use {', '.join(OPERATIONS)})")
+    if not mix:
+        raise ValueError("mix needs at least one operation with a positive weight")
+    return mix
+
+
+def make_load_skills(root: Path, coalesce: bool = False, execution: str = 'subprocess') -> Dict[str, str]:
+    """One synthetic skill per kind under root; returns operation -> tool name."""
+    extra = ('' if coalesce else _NO_COALESCE) + f"execution: {execution}\n"
+    return {kind: make_synthetic_skills(root, 1, kind, prefix='load', extra_manifest=extra)[0]
+            for kind in ('noop', 'cpu', 'sleep')}
+
+
+def _arguments(op: str, cpu_n: int, sleep: float) -> Dict[str, str]:
+    if op == 'cpu':
+        return {'input': str(cpu_n)}
+    if op == 'sleep':
+        return {'input': str(sleep)}
+    return {}
+
+
+class _Recorder:
+    """Latency samples and failures per operation."""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {op: [] for op in OPERATIONS}
+        self.errors: Dict[str, int] = {op: 0 for op in OPERATIONS}
+        self.error_kinds: Dict[str, int] = {}
+
+    def add(self, op: str, latency_ms: float, error: Optional[str] = None):
+        self.samples[op].append(latency_ms)
+        if error is not None:
+            self.errors[op] += 1
+            self.error_kinds[error] = self.error_kinds.get(error, 0) + 1
+
+
+async def _request(session, op: str, tools: Dict[str, str], arguments: Dict[str, str],
+                   timeout: float, recorder: _Recorder):
+    start = time.perf_counter()
+    error = None
+    try:
+        if op == 'list_tools':
+            await asyncio.wait_for(session.list_tools(), timeout)
+        else:
+            result = await asyncio.wait_for(session.call_tool(tools[op], arguments), timeout)
+            text = result.content[0].text if result.content else ''
+            # The gateway reports skill failures as text rather than protocol errors
+            if result.isError or text.startswith('Error'):
+                error = 'tool_error'
+    except asyncio.TimeoutError:
+        error = 'timeout'
+    except Exception as e:
+        error = type(e).__name__
+    recorder.add(op, (time.perf_counter() - start) * 1000, error)
+
+
+async def drive(session, tools: Dict[str, str], mix: Dict[str, float], rate: float, duration: float,
+                max_outstanding: int = DEFAULT_MAX_OUTSTANDING, timeout: float = DEFAULT_TIMEOUT,
+                cpu_n: int = DEFAULT_CPU_N, sleep: float = DEFAULT_SLEEP, seed: int = 0) -> Dict:
+    """
+    Send rate requests/second for duration seconds over an initialized
+    ClientSession and wait for the stragglers; returns the report's
+    measurement sections.
+    """
+    rng = random.Random(seed)
+    ops, weights = zip(*mix.items())
+    recorder = _Recorder()
+    pending = set()
+    total = max(1, int(rate * duration))
+    dropped = 0
+    max_lag = 0.0
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    for i in range(total):
+        due = start + i / rate
+        delay = due - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        else:
+            max_lag = max(max_lag, -delay)  # the client itself fell behind schedule
+        op = rng.choices(ops, weights)[0]
+        if len(pending) >= max_outstanding:
+            dropped += 1
+            continue
+        task = asyncio.ensure_future(_request(session, op, tools, _arguments(op, cpu_n, sleep),
+                                              timeout, recorder))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+    if pending:
+        await asyncio.wait(pending)
+    elapsed = loop.time() - start
+
+    completed = sum(len(samples) for samples in recorder.samples.values())
+    errors = sum(recorder.errors.values())
+    by_op = {}
+    for op in ops:
+        stats = summarize(recorder.samples[op])
+        by_op[op] = {
+            'requests': stats['count'],
+            'errors': recorder.errors[op],
+            'p50_ms': round(stats['p50'], 3),
+            'p95_ms': round(stats['p95'], 3),
+            'p99_ms': round(stats['p99'], 3),
+            'max_ms': round(stats['max'], 3),
+        }
+    overall = summarize([ms for samples in recorder.samples.values() for ms in samples])
+    return {
+        'requests': {
+            'scheduled': total,
+            'completed': completed,
+            'errors': errors,
+            'dropped': dropped,
+            'error_rate': round((errors + dropped) / total, 4),
+            'error_kinds': recorder.error_kinds,
+        },
+        'elapsed_sec': round(elapsed, 3),
+        'throughput_per_sec': round(completed / elapsed, 2) if elapsed > 0 else 0.0,
+        'latency': {
+            'p50_ms': round(overall['p50'], 3),
+            'p95_ms': round(overall['p95'], 3),
+            'p99_ms': round(overall['p99'], 3),
+            'max_ms': round(overall['max'], 3),
+            'mean_ms': round(overall['mean'], 3),
+        },
+        'by_operation': by_op,
+        'client_lag_max_ms': round(max_lag * 1000, 3),
+    }
+
+
+async def _warm_up(session, tools: Dict[str, str], mix: Dict[str, float], cpu_n: int, sleep: float):
+    """One request per operation, so process start-up and first imports are not measured."""
+    await session.list_tools()
+    for op in mix:
+        if op != 'list_tools':
+            await session.call_tool(tools[op], _arguments(op, cpu_n, sleep))
+
+
+async def _gateway_stats(session) -> Dict:
+    """The gateway's own view (runs, coalescing, queue waits) from its queue_stats tool."""
+    try:
+        result = await session.call_tool('queue_stats', {})
+        stats = json.loads(result.content[0].text)
+    except Exception:
+        return {}
+    return {key: stats.get(key) for key in ('budget', 'runs', 'single_flight', 'classes')}
+
+
+async def _run_stdio(skills_dir: Path, log_path: Path, env: Dict[str, str], measure):
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.stdio import stdio_client
+
+    params = StdioServerParameters(command=sys.executable, args=[str(GATEWAY_SCRIPT)],
+                                   cwd=str(skills_dir.parent), env=env)
+    with open(log_path, 'w', encoding='utf-8') as errlog:
+        async with stdio_client(params, errlog=errlog) as (read_stream, write_stream):
+            async with ClientSession(read_stream, write_stream) as session:
+                await session.initialize()
+                return await measure(session)
+
+
+async def _run_memory(skills_dir: Path, measure):
+    from mcp.shared.memory import create_connected_server_and_client_session
+    try:
+        from core.mcp_gateway import SkillMCPServer
+    except ImportError:
+        from mcp_gateway import SkillMCPServer
+
+    gateway = SkillMCPServer(skills_dir=str(skills_dir))
+    try:
+        async with create_connected_server_and_client_session(gateway.server) as session:
+            return await measure(session)
+    finally:
+        gateway.outputs.close()
+
+
+def run_load_test(rate: float = DEFAULT_RATE, duration: float = DEFAULT_DURATION, mix: str = DEFAULT_MIX,
+                  transport: str = 'stdio', max_outstanding: int = DEFAULT_MAX_OUTSTANDING,
+                  timeout: float = DEFAULT_TIMEOUT, cpu_n: int = DEFAULT_CPU_N, sleep: float = DEFAULT_SLEEP,
+                  coalesce: bool = False, execution: str = 'subprocess', seed: int = 0,
+                  env: Optional[Dict[str, str]] = None, log=None) -> Dict:
+    """
+    Run one load test and return the JSON-serialisable report.
+
+    transport: 'stdio' launches mcp_gateway.py as a child process (what agents
+    do); 'memory' runs the gateway in this process over in-memory streams,
+    leaving out pipe and process overhead. execution is the synthetic skills'
+    execution mode. env adds variables for the gateway (e.g. ASK_MCP_WORKERS).
+    """
+    log = log or (lambda message: print(message, file=sys.stderr))
+    weights = parse_mix(mix)
+    if transport not in ('stdio', 'memory'):
+        raise ValueError(f"unknown transport '{transport}' (use stdio or memory)")
+    if execution not in ('subprocess', 'pool', 'inprocess'):
+        raise ValueError(f"unknown execution mode '{execution}' (use subprocess, pool or inprocess)")
+    if rate <= 0 or duration <= 0:
+        raise ValueError("rate and duration must be positive")
+
+    work_dir = Path(tempfile.mkdtemp(prefix='ask-loadtest-'))
+    try:
+        skills_dir = work_dir / "skills"
+        tools = make_load_skills(skills_dir, coalesce=coalesce, execution=execution)
+        # Keep load-test runs out of the user's telemetry and caches
+        gateway_env = dict(os.environ, ASK_SKILLS_DIR=str(skills_dir), ASK_WATCH='0', ASK_TELEMETRY='0',
+                           ASK_CACHE_DIR=str(work_dir / "cache"), **(env or {}))
+
+        async def measure(session):
+            await _warm_up(session, tools, weights, cpu_n, sleep)
+            log(f"▶ {rate:g} req/s for {duration:g}s over {transport} ({mix})")
+            result = await drive(session, tools, weights, rate, duration, max_outstanding,
+                                 timeout, cpu_n, sleep, seed)
+            result['gateway'] = await _gateway_stats(session)
+            return result
+
+        if transport == 'stdio':
+            result = asyncio.run(_run_stdio(skills_dir, work_dir / "gateway.log", gateway_env, measure))
+        else:
+            saved = dict(os.environ)
+            os.environ.update(gateway_env)
+            try:
+                result = asyncio.run(_run_memory(skills_dir, measure))
+            finally:
+                os.environ.clear()
+                os.environ.update(saved)
+
+        report = {
+            'meta': {
+                'python': sys.version.split()[0],
+                'platform': sys.platform,
+                'cpu_count': os.cpu_count(),
+                'transport': transport,
+                'target_rate_per_sec': rate,
+                'duration_sec': duration,
+                'mix': weights,
+                'max_outstanding': max_outstanding,
+                'cpu_n': cpu_n,
+                'sleep_sec': sleep,
+                'coalesce': coalesce,
+                'execution': execution,
+                'gateway_env': env or {},
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            }
+        }
+        report.update(result)
+        return report
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _parse_env(values: str) -> Dict[str, str]:
+    """'ASK_MCP_CONCURRENCY=4,ASK_MCP_COALESCE=0' -> dict."""
+    env = {}
+    for item in str(values).split(','):
+        name, sep, value = item.partition('=')
+        if sep and name.strip():
+            env[name.strip()] = value.strip()
+    return env
+
+
+def _comparable(report: Dict) -> Dict:
+    """Throughput and latency percentiles only; max latency and client lag are too noisy."""
+    def percentiles(section: Dict) -> Dict:
+        return {key: value for key, value in section.items() if key in ('p50_ms', 'p95_ms', 'p99_ms')}
+    return {
+        'throughput_per_sec': report['throughput_per_sec'],
+        'latency': percentiles(report['latency']),
+        'by_operation': {op: percentiles(stats) for op, stats in report['by_operation'].items()},
+    }
+
+
+def _summary_line(report: Dict) -> str:
+    requests, latency = report['requests'], report['latency']
+    return (f"{report['throughput_per_sec']:.1f} req/s, error rate {requests['error_rate']:.2%} "
+            f"({requests['errors']} errors, {requests['dropped']} dropped), "
+            f"p50 {latency['p50_ms']:.1f} ms, p95 {latency['p95_ms']:.1f} ms, p99 {latency['p99_ms']:.1f} ms")
+
+
+def loadtest_command(options: Dict) -> int:
+    """
+    `ask loadtest [--rate=50] [--duration=10] [--mix=list_tools=1,noop=6,cpu=2,sleep=1]
+    [--transport=stdio|memory] [--max-outstanding=256] [--timeout=30] [--cpu-n=20000]
+    [--sleep=0.05] [--coalesce] [--execution=subprocess|pool|inprocess] [--seed=0]
+    [--env=ASK_MCP_WORKERS=4] [--output=F]
+    [--compare=F] [--threshold=0.2] [--max-error-rate=R]`
+
+    Exits 1 when the error rate exceeds --max-error-rate or, with --compare,
+    when throughput or latency regressed beyond --threshold.
+    """
+    try:
+        report = run_load_test(
+            rate=float(options.get('rate', DEFAULT_RATE)),
+            duration=float(options.get('duration', DEFAULT_DURATION)),
+            mix=str(options.get('mix', DEFAULT_MIX)),
+            transport=str(options.get('transport', 'stdio')),
+            max_outstanding=int(options.get('max_outstanding', DEFAULT_MAX_OUTSTANDING)),
+            timeout=float(options.get('timeout', DEFAULT_TIMEOUT)),
+            cpu_n=int(options.get('cpu_n', DEFAULT_CPU_N)),
+            sleep=float(options.get('sleep', DEFAULT_SLEEP)),
+            coalesce=bool(options.get('coalesce')),
+            execution=str(options.get('execution', 'subprocess')),
+            seed=int(options.get('seed', 0)),
+            env=_parse_env(options['env']) if options.get('env') else None,
+        )
+    except ImportError as e:
+        print(f"Error: the load test needs the mcp package ({e}); install with: pip install mcp",
+              file=sys.stderr)
+        return 1
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print(f"✅ {_summary_line(report)}", file=sys.stderr)
+    status = 0
+    if 'max_error_rate' in options:
+        limit = float(options['max_error_rate'])
+        if report['requests']['error_rate'] > limit:
+            print(f"⚠️  error rate {report['requests']['error_rate']:.2%} exceeds {limit:.2%}", file=sys.stderr)
+            status = 1
+
+    if options.get('compare'):
+        threshold = float(options.get('threshold', 0.2))
+        with open(options['compare'], 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(_comparable(report), _comparable(baseline), threshold)
+        report['comparison'] = {'baseline': options['compare'], 'threshold': threshold,
+                                'regressions': regressions}
+        for item in regressions:
+            print(f"⚠️  regression: {item['metric']} {item['baseline']:.3f} -> {item['current']:.3f} "
+                  f"({item['change']:+.0%})", file=sys.stderr)
+        if regressions:
+            status = 1
+
+    text = json.dumps(report, indent=2)
+    if options.get('output'):
+        with open(options['output'], 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+        print(f"Report written to {options['output']}", file=sys.stderr)
+    else:
+        print(text)
+    return status
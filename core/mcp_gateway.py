@@ -10,10 +10,13 @@ import sys
 import io
 import os
 import json
-import subprocess
+import time
+import signal
 import asyncio
+import threading
+import contextvars
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Optional, Tuple
 
 # Set UTF-8 encoding on Windows
 if sys.platform == 'win32':
@@ -23,64 +26,283 @@ if sys.platform == 'win32':
 try:
     import yaml
     from mcp.server.models import InitializationOptions
-    from mcp.types import Tool, TextContent
+    from mcp.types import Resource, Tool, TextContent
     from mcp.server import Server
+    from mcp.server.lowlevel.helper_types import ReadResourceContents
 except ImportError as e:
     print(f"Error: Required package not installed: {e}")
     print("Install with: pip install mcp pyyaml")
     sys.exit(1)
 
+try:
+    from core.async_execution import arun_command, arun_skill
+    from core.execution import DEFAULT_TIMEOUT, execution_mode
+    from core.metrics import SIZE_BUCKETS, MetricsRegistry
+    from core.output_store import OutputStore
+    from core.paths import get_cache_dir
+    from core.pipeline import run_pipeline
+    from core.profiling import PROFILE_MODES, format_report, profile_command, read_report, run_profiled
+    from core.scheduler import PRIORITIES, Scheduler, normalize_priority, parse_weights
+    from core.shard_pool import ShardPool, worker_count
+    from core.single_flight import SingleFlight
+    from core.skill_index import SkillIndex
+    from core.telemetry import record_result
+    from core.ttl_cache import DEFAULT_MAX_BYTES, DEFAULT_MAX_ENTRIES, TTLCache, cache_policy
+    from core.worker_pool import get_pool
+except ImportError:
+    from async_execution import arun_command, arun_skill
+    from execution import DEFAULT_TIMEOUT, execution_mode
+    from metrics import SIZE_BUCKETS, MetricsRegistry
+    from output_store import OutputStore
+    from paths import get_cache_dir
+    from pipeline import run_pipeline
+    from profiling import PROFILE_MODES, format_report, profile_command, read_report, run_profiled
+    from scheduler import PRIORITIES, Scheduler, normalize_priority, parse_weights
+    from shard_pool import ShardPool, worker_count
+    from single_flight import SingleFlight
+    from skill_index import SkillIndex
+    from telemetry import record_result
+    from ttl_cache import DEFAULT_MAX_BYTES, DEFAULT_MAX_ENTRIES, TTLCache, cache_policy
+    from worker_pool import get_pool
+
+# Tool calls that may run at once; more wait in the scheduler's queues
+DEFAULT_MAX_CONCURRENCY = 16
+
+# Characters of each output stream returned inline; the rest is kept on disk
+# and served as an ask-output:// resource
+DEFAULT_OUTPUT_LIMIT = 100_000
+
+# Seconds between writes of ASK_METRICS_FILE
+DEFAULT_METRICS_INTERVAL = 15.0
+
+# Built-in tool that chains skills through OS pipes
+PIPELINE_TOOL = Tool(
+    name="pipeline",
+    description=(
+        "Run skills as a streaming pipeline: each stage's stdout feeds the next "
+        "stage's stdin (pass '-' as a stage's input argument to read it). "
+        "Example: convert-csv-to data.csv | transform-json-to -"
+    ),
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "stages": {
+                "type": "array",
+                "minItems": 1,
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "skill": {"type": "string", "description": "Skill folder name"},
+                        "args": {"type": "array", "items": {"type": "string"}}
+                    },
+                    "required": ["skill"]
+                }
+            },
+            "input": {"type": "string", "description": "Text written to the first stage's stdin"},
+            "timeout": {"type": "number",
+                        "description": f"Seconds before every stage is killed (default {DEFAULT_TIMEOUT})"}
+        },
+        "required": ["stages"]
+    }
+)
+
+# Built-in tool reporting the scheduler's queues; answered without queuing
+QUEUE_STATS_TOOL = Tool(
+    name="queue_stats",
+    description=("Show running and queued tool calls, queue wait times per priority class, "
+                 "completed vs cancelled runs, how many identical concurrent calls were "
+                 "coalesced and result cache hits"),
+    inputSchema={"type": "object", "properties": {}}
+)
+
+# Built-in tool returning the gateway's metrics; answered without queuing
+METRICS_TOOL = Tool(
+    name="metrics",
+    description=("Show gateway metrics in Prometheus text format: call latency, queue wait, "
+                 "process spawn time and output size histograms, cache hits, timeouts and "
+                 "errors per tool"),
+    inputSchema={"type": "object", "properties": {}}
+)
+
+# Longest JSON-RPC line accepted on stdin
+_MAX_MESSAGE_BYTES = 64 * 1024 * 1024
+
+
+class _LoopStdin:
+    """
+    stdin lines read on the event loop instead of a worker thread, so a
+    shutdown can cancel the read rather than wait for the client's next line.
+    """
+    
+    def __init__(self, reader: asyncio.StreamReader):
+        self.reader = reader
+    
+    async def __aiter__(self):
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                return
+            yield line.decode('utf-8', errors='replace')
+
+
+async def _loop_stdin() -> Optional[_LoopStdin]:
+    """A _LoopStdin for pipes and terminals on POSIX, else None (use the default reader)."""
+    if sys.platform == 'win32':
+        return None
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(limit=_MAX_MESSAGE_BYTES)
+    try:
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin.buffer)
+    except (ValueError, OSError):
+        return None  # e.g. stdin redirected from a regular file
+    return _LoopStdin(reader)
+
 
 class SkillMCPServer:
     """MCP Server that exposes ASK skills as tools."""
     
-    def __init__(self, skills_dir: str = "skills"):
+    def __init__(self, skills_dir: str = "skills", max_concurrency: Optional[int] = None,
+                 workers: Optional[int] = None):
         self.skills_dir = Path(skills_dir)
         self.server = Server("agent-skill-kit")
         self.skills = self._load_skills()
+        self.max_concurrency = max(1, max_concurrency or int(
+            os.environ.get('ASK_MCP_CONCURRENCY', DEFAULT_MAX_CONCURRENCY)))
+        # With workers, this process keeps MCP framing, scheduling and caching
+        # and executes calls in worker processes (started by run()), each
+        # allowed max_concurrency calls at once
+        self.workers = worker_count(os.environ.get('ASK_MCP_WORKERS')) if workers is None else workers
+        self.shards = None
+        self.scheduler = Scheduler(self.max_concurrency * max(1, self.workers), self._skill_limit,
+                                   parse_weights(os.environ.get('ASK_MCP_WEIGHTS', '')))
+        # Identical calls arriving while one is running share its result
+        self.flights = SingleFlight()
+        self.coalesce = os.environ.get('ASK_MCP_COALESCE') != '0'
+        # Output of skills declaring cache_ttl, kept across restarts with ASK_MCP_CACHE_PERSIST=1
+        self.results = TTLCache(
+            max_entries=int(os.environ.get('ASK_MCP_CACHE_ENTRIES', 0)) or DEFAULT_MAX_ENTRIES,
+            max_bytes=int(os.environ.get('ASK_MCP_CACHE_MB', 0)) * 1024 * 1024 or DEFAULT_MAX_BYTES,
+            path=get_cache_dir() / "gateway-cache.json" if os.environ.get('ASK_MCP_CACHE_PERSIST') else None)
+        self.results.load()
+        self._revalidating = {}
+        # Tool calls that started executing, by outcome; cancelled runs had
+        # their skill's process group killed
+        self.runs = {'running': 0, 'completed': 0, 'cancelled': 0}
+        # Output beyond the limit spills to disk (bounding memory per call)
+        # and is returned as a summary plus resource URI
+        self.output_limit = max(1000, int(os.environ.get('ASK_MCP_OUTPUT_LIMIT', 0)) or DEFAULT_OUTPUT_LIMIT)
+        self.outputs = OutputStore()
+        self.metrics = MetricsRegistry()
+        self._setup_metrics()
+        # Client session and loop, captured on the first request, used to
+        # push tools/list_changed when the watcher reloads skills
+        self._session = None
+        self._loop = None
         self._setup_handlers()
+        
+        # Warm the worker pool up front when any skill runs on it here
+        if not self.workers and any(execution_mode(skill) == 'pool' for skill in self.skills.values()):
+            get_pool().start()
     
-    def _load_skills(self) -> dict:
-        """Load all available skills and create MCP tool definitions."""
+    def _load_skills(self, current: Optional[dict] = None) -> dict:
+        """
+        Load all available skills and create MCP tool definitions.
+        
+        Entries of `current` whose manifest is unchanged are reused as-is.
+        """
         skills = {}
+        current = current or {}
         
         if not self.skills_dir.exists():
-            print(f"Warning: Skills directory not found: {self.skills_dir}")
+            print(f"Warning: Skills directory not found: {self.skills_dir}", file=sys.stderr)
             return skills
         
-        for skill_folder in sorted(self.skills_dir.iterdir()):
-            if not skill_folder.is_dir():
-                continue
-            
-            manifest_path = skill_folder / "manifest.yaml"
-            if not manifest_path.exists():
+        # Shares the CLI's compiled index; changed manifests are parsed with
+        # the C loader, concurrently for large skill directories
+        manifests, errors = SkillIndex(self.skills_dir).load()
+        
+        for skill_name, manifest in manifests.items():
+            if skill_name in current and current[skill_name]['manifest'] == manifest:
+                skills[skill_name] = current[skill_name]
                 continue
-            
+            skill_folder = self.skills_dir / skill_name
             try:
-                with open(manifest_path, 'r', encoding='utf-8') as f:
-                    manifest = yaml.safe_load(f)
-                    skill_name = skill_folder.name
-                    
-                    # Create MCP tool definition from manifest
-                    skills[skill_name] = {
-                        'path': skill_folder,
-                        'script': skill_folder / "script.py",
-                        'manifest': manifest,
-                        'tool': Tool(
-                            name=manifest.get('name', skill_name),
-                            description=manifest.get('description', f'Run {skill_name} skill'),
-                            inputSchema={
-                                "type": "object",
-                                "properties": self._build_properties(manifest),
-                                "required": self._get_required_args(manifest)
-                            }
-                        )
-                    }
+                # Create MCP tool definition from manifest
+                skills[skill_name] = {
+                    'path': skill_folder,
+                    'script': skill_folder / "script.py",
+                    'manifest': manifest,
+                    'tool': Tool(
+                        name=manifest.get('name', skill_name),
+                        description=manifest.get('description', f'Run {skill_name} skill'),
+                        inputSchema={
+                            "type": "object",
+                            "properties": self._build_properties(manifest),
+                            "required": self._get_required_args(manifest)
+                        }
+                    )
+                }
             except Exception as e:
-                print(f"Warning: Failed to load {skill_folder.name}: {e}")
+                print(f"Warning: Failed to load {skill_name}: {e}", file=sys.stderr)
+        
+        for skill_name, e in errors:
+            print(f"Warning: Failed to load {skill_name}: {e}", file=sys.stderr)
         
         return skills
     
+    def refresh(self) -> bool:
+        """
+        Re-sync the registry with the skills directory, replacing only the
+        entries that changed. Returns True if the tool list changed.
+        """
+        old = self.skills
+        new = self._load_skills(old)
+        self.skills = new
+        return set(old) != set(new) or any(new[name] is not old[name] for name in new)
+    
+    def _on_skills_changed(self):
+        """Watcher callback (background thread): refresh and tell clients."""
+        if not self.refresh():
+            return
+        print(f"Skills reloaded: {len(self.skills)} available", file=sys.stderr)
+        if self.shards is not None:
+            self._shard_loop.call_soon_threadsafe(self.shards.refresh)
+        session, loop = self._session, self._loop
+        if session is not None and loop is not None:
+            asyncio.run_coroutine_threadsafe(session.send_tool_list_changed(), loop)
+    
+    def _setup_metrics(self):
+        """Register the gateway's metrics; tool labels are registry keys."""
+        m = self.metrics
+        self.m_calls = m.counter(
+            'ask_mcp_calls_total', 'Tool calls received, including cached and coalesced ones', ['tool'])
+        self.m_call_seconds = m.histogram(
+            'ask_mcp_call_duration_seconds', 'Time from receiving a tool call to answering it', ['tool'])
+        self.m_queue_seconds = m.histogram(
+            'ask_mcp_queue_wait_seconds', 'Time a call waited in the scheduler for a slot',
+            ['tool', 'priority'])
+        self.m_executions = m.counter(
+            'ask_mcp_executions_total', 'Tool executions by outcome (ok, error, timeout, cancelled)',
+            ['tool', 'status'])
+        self.m_spawn_seconds = m.histogram(
+            'ask_mcp_spawn_seconds', 'Time to start a skill subprocess', ['tool'])
+        self.m_output_chars = m.histogram(
+            'ask_mcp_output_chars', 'Characters of stdout and stderr per execution', ['tool'],
+            buckets=SIZE_BUCKETS)
+        self.m_cache = m.counter(
+            'ask_mcp_cache_lookups_total', 'Result cache lookups (hit, stale, miss)', ['tool', 'result'])
+        m.counter_callback('ask_mcp_coalesced_calls_total', 'Calls answered by an identical in-flight call',
+                           lambda: self.flights.stats()['coalesced'])
+        m.counter_callback('ask_mcp_spilled_outputs_total', 'Outputs too large to return inline',
+                           lambda: self.outputs.spilled)
+        m.gauge_callback('ask_mcp_running_calls', 'Calls holding a scheduler slot',
+                         lambda: self.scheduler.running)
+        m.gauge_callback('ask_mcp_queued_calls', 'Calls waiting for a slot, by priority class',
+                         lambda: {p: c['queued'] for p, c in self.scheduler.stats()['classes'].items()},
+                         labelname='priority')
+        m.gauge_callback('ask_mcp_cache_bytes', 'Size of cached results', lambda: self.results.bytes)
+        m.gauge_callback('ask_mcp_skills', 'Skills exposed as tools', lambda: len(self.skills))
+    
     def _build_properties(self, manifest: dict) -> dict:
         """Build JSON schema properties from manifest."""
         properties = {}
@@ -101,6 +323,22 @@ class SkillMCPServer:
                     "description": arg.get('description', 'Optional argument')
                 }
         
+        # Reserved gateway options are prefixed with '_' and never passed to the skill
+        properties['_profile'] = {
+            "type": "string",
+            "enum": list(PROFILE_MODES),
+            "description": "Run under cProfile/tracemalloc and append a profile summary"
+        }
+        properties['_priority'] = {
+            "type": "string",
+            "enum": list(PRIORITIES),
+            "description": "Queue priority when the gateway is busy (overrides the skill's default)"
+        }
+        properties['_client'] = {
+            "type": "string",
+            "description": "Caller identity for fair sharing between agents (defaults to the MCP client name)"
+        }
+        
         return properties
     
     def _get_required_args(self, manifest: dict) -> list:
@@ -116,75 +354,476 @@ class SkillMCPServer:
         @self.server.list_tools()
         async def list_tools() -> list[Tool]:
             """List all available skills as MCP tools."""
-            return [skill['tool'] for skill in self.skills.values()]
+            self._remember_session()
+            return [skill['tool'] for skill in self.skills.values()] + [
+                PIPELINE_TOOL, QUEUE_STATS_TOOL, METRICS_TOOL]
         
         @self.server.call_tool()
         async def call_tool(name: str, arguments: dict) -> list[TextContent]:
             """Execute a skill and return results."""
-            if name not in self.skills:
-                return [TextContent(
-                    type="text",
-                    text=f"Error: Skill '{name}' not found"
-                )]
+            self._remember_session()
+            arguments = arguments or {}
+            key = self._resolve(name)
+            if key is None and name == QUEUE_STATS_TOOL.name:
+                stats = dict(self.scheduler.stats(), runs=dict(self.runs), single_flight=self.flights.stats(),
+                             result_cache=self.results.stats())
+                if self.shards is not None:
+                    stats['shards'] = self.shards.stats()
+                return [TextContent(type="text", text=json.dumps(stats, indent=2))]
+            if key is None and name == METRICS_TOOL.name:
+                return [TextContent(type="text", text=self.metrics.render())]
             
-            skill = self.skills[name]
-            script_path = skill['script']
+            # Unknown names share one label so clients cannot grow the series
+            tool = self._metric_tool(name, key)
+            self.m_calls.inc(tool=tool)
+            start = time.perf_counter()
+            contents = await self._dispatch(name, key, tool, arguments)
+            self.m_call_seconds.observe(time.perf_counter() - start, tool=tool)
+            return contents
+        
+        @self.server.list_resources()
+        async def list_resources() -> list[Resource]:
+            """Full outputs of recent calls that were too large to return inline."""
+            return [Resource(uri=entry['uri'], name=entry['uri'].split('://', 1)[1],
+                             description=f"{entry['description']} ({entry['size']:,} bytes)",
+                             mimeType="text/plain")
+                    for entry in self.outputs.resources()]
+        
+        @self.server.read_resource()
+        async def read_resource(uri) -> list[ReadResourceContents]:
+            """One chunk of a stored output (?offset=<bytes>&length=<bytes>)."""
+            loop = asyncio.get_running_loop()
+            text = await loop.run_in_executor(None, self.outputs.read, str(uri))
+            if text is None:
+                raise ValueError(f"Unknown or expired resource: {uri}")
+            return [ReadResourceContents(content=text, mime_type="text/plain")]
+    
+    async def _dispatch(self, name: str, key: Optional[str], tool: str, arguments: dict) -> list[TextContent]:
+        """Answer a call from the result cache, an identical in-flight call or a new run."""
+        skill = self.skills.get(key) if key else None
+        priority = arguments.get('_priority') or (skill['manifest'].get('priority') if skill else None)
+        
+        policy = cache_policy(skill['manifest']) if skill and not arguments.get('_profile') else None
+        cache_key = self._cache_key(key, arguments) if policy else None
+        
+        async def run(priority=priority):
+            # Skills run without blocking the loop; the scheduler decides which
+            # waiting call gets each of the max_concurrency slots
+            queued = time.perf_counter()
+            async with self.scheduler.slot(key or name, self._client_id(arguments), priority):
+                self.m_queue_seconds.observe(time.perf_counter() - queued, tool=tool,
+                                             priority=normalize_priority(priority))
+                return await self._execute(name, arguments, cache_key, policy)
+        
+        if cache_key:
+            cached = self.results.get(cache_key)
+            self.m_cache.inc(tool=tool, result='miss' if cached is None else 'hit' if cached[1] else 'stale')
+            if cached is not None:
+                text, fresh = cached
+                if not fresh:
+                    # Serve stale output now; refresh it at batch priority
+                    self._revalidate(cache_key, lambda: run('batch'))
+                return [TextContent(type="text", text=text)]
+        
+        if not self.coalesce or (skill and skill['manifest'].get('coalesce') is False):
+            return await run()
+        return await self.flights.do(self._flight_key(key or name, arguments), run)
+    
+    def _bounded(self, text: str, path: Optional[str], stream: str, source: str) -> Tuple[str, bool]:
+        """
+        (inline text, spilled) for one output stream: the text itself when it
+        fits the output limit, else its head and tail around a pointer to the
+        full output as a resource.
+        """
+        if path is None and len(text) <= self.output_limit:
+            return text, False
+        half = self.output_limit // 2
+        description = f"{stream} of {source}"
+        if path is None:
+            # Pooled runs on platforms without fork return their output in memory
+            uri = self.outputs.add_text(text, stream, description)
+            head, tail, size = text[:half], text[-half:], len(text.encode('utf-8'))
+        else:
+            uri = self.outputs.add(path, stream, description)
+            head, tail, size = OutputStore.head(path, half), OutputStore.tail(path, half), os.path.getsize(path)
+        notice = (f"[... {stream} truncated: {size:,} bytes in total, showing the first and last "
+                  f"{half:,} characters. Full {stream}: {uri} (read it in chunks with "
+                  f"?offset=<bytes>&length=<bytes>) ...]")
+        return f"{head}\n\n{notice}\n\n{tail}", True
+    
+    def _flight_key(self, key: str, arguments: dict) -> str:
+        """
+        Canonical identity of a call for coalescing: the command line a skill
+        would get (argument order matters), or the normalized arguments of a
+        built-in tool. Scheduling hints (_priority, _client) are ignored.
+        """
+        if key in self.skills:
+            argv = [str(v) for k, v in arguments.items() if not k.startswith('_')]
+            return json.dumps([key, argv, arguments.get('_profile')])
+        options = {k: v for k, v in arguments.items() if k not in ('_priority', '_client')}
+        return json.dumps([key, options], sort_keys=True, default=str)
+    
+    def _cache_key(self, key: str, arguments: dict) -> str:
+        """Result cache key: the call's flight key plus the skill's version."""
+        version = str(self.skills[key]['manifest'].get('version', ''))
+        return json.dumps([version, self._flight_key(key, arguments)])
+    
+    def _revalidate(self, cache_key: str, run):
+        """Re-run a stale cached call in the background, once per key at a time."""
+        if cache_key in self._revalidating:
+            return
+        task = asyncio.ensure_future(run())
+        self._revalidating[cache_key] = task
+        
+        def done(task):
+            del self._revalidating[cache_key]
+            if not task.cancelled() and task.exception():
+                print(f"Warning: background refresh failed: {task.exception()}", file=sys.stderr)
+        
+        task.add_done_callback(done)
+    
+    def _skill_limit(self, key: str) -> Optional[int]:
+        """A skill's own concurrency cap from its manifest's max_concurrency."""
+        skill = self.skills.get(key)
+        if skill is None:
+            return None
+        try:
+            return int(skill['manifest'].get('max_concurrency') or 0) or None
+        except (TypeError, ValueError):
+            return None
+    
+    def _client_id(self, arguments: dict) -> str:
+        """Fair-queuing identity: the _client argument, else the MCP client's name."""
+        if arguments.get('_client'):
+            return str(arguments['_client'])
+        try:
+            return self._session.client_params.clientInfo.name
+        except AttributeError:
+            return 'default'
+    
+    def _resolve(self, name: str) -> Optional[str]:
+        """Registry key for a tool name (folder name or the manifest's display name)."""
+        if name in self.skills:
+            return name
+        for key, skill in self.skills.items():
+            if skill['tool'].name == name:
+                return key
+        return None
+    
+    def _metric_tool(self, name: str, key: Optional[str]) -> str:
+        """Metrics label for a call: the registry key, 'pipeline', or 'unknown' for any other name."""
+        return key or (name if name == PIPELINE_TOOL.name else 'unknown')
+    
+    async def _execute(self, name: str, arguments: dict, cache_key: Optional[str] = None,
+                       policy: Optional[tuple] = None) -> list[TextContent]:
+        """
+        _call_tool(), counting runs that complete and runs cancelled midway
+        (client cancellation, disconnect or shutdown).
+        """
+        self.runs['running'] += 1
+        try:
+            if self.shards is not None:
+                contents, cacheable = await self._call_shard(name, arguments)
+            else:
+                contents, cacheable = await self._call_tool(name, arguments)
+        except asyncio.CancelledError:
+            self.runs['cancelled'] += 1
+            self.m_executions.inc(tool=self._metric_tool(name, self._resolve(name)), status='cancelled')
+            raise
+        finally:
+            self.runs['running'] -= 1
+        self.runs['completed'] += 1
+        
+        # With a cache_key, clean output is stored under the (ttl, stale) policy
+        if cache_key and cacheable:
+            self.results.put(cache_key, contents[0].text, *policy)
+        return contents
+    
+    async def _call_shard(self, name: str, arguments: dict) -> Tuple[list[TextContent], bool]:
+        """_call_tool() in the worker process owning the skill (sharded mode)."""
+        key = self._resolve(name)
+        shard_key = key or name
+        if key is None and name == PIPELINE_TOOL.name:
+            # Pipelines go where their first stage's skill is warm
+            stages = arguments.get('stages') or [{}]
+            shard_key = str(stages[0].get('skill', name)) if isinstance(stages[0], dict) else name
+        try:
+            reply = await self.shards.call(shard_key, name, arguments,
+                                           on_progress=self._progress_reporter(), on_observe=self._observe)
+        except RuntimeError as e:
+            self._observe(self._metric_tool(name, key), 'error')
+            return [TextContent(type="text", text=f"Error executing skill '{name}': {e}")], False
+        for uri, path, description in reply.get('outputs', []):
+            self.outputs.adopt(uri, path, description)
+        if 'error' in reply:
+            return [TextContent(type="text", text=f"Error executing skill '{name}': {reply['error']}")], False
+        return [TextContent(type="text", text=reply['text'])], bool(reply.get('cacheable'))
+    
+    async def _call_tool(self, name: str, arguments: dict) -> Tuple[list[TextContent], bool]:
+        """
+        Run one tool call; blocking work is awaited, never run on the loop.
+        
+        Returns the contents and whether they may be cached (clean exit,
+        nothing spilled to a resource).
+        """
+        key = self._resolve(name)
+        if key is None and name == PIPELINE_TOOL.name:
+            # The pipeline runs on a thread (in this call's context); a cancelled
+            # call tells it to kill its stages
+            cancel = threading.Event()
+            loop = asyncio.get_running_loop()
+            context = contextvars.copy_context()
+            try:
+                return await loop.run_in_executor(
+                    None, context.run, self._call_pipeline, arguments, cancel), False
+            except asyncio.CancelledError:
+                cancel.set()
+                raise
+        
+        if key is None:
+            self._observe('unknown', 'error')
+            return [TextContent(
+                type="text",
+                text=f"Error: Skill '{name}' not found"
+            )], False
+        
+        skill = self.skills[key]
+        script_path = skill['script']
+        
+        if not script_path.exists():
+            self._observe(key, 'error')
+            return [TextContent(
+                type="text",
+                text=f"Error: Script not found for skill '{name}'"
+            )], False
+        
+        profile = arguments.get('_profile')
+        args = [str(v) for k, v in arguments.items() if not k.startswith('_')]
+        
+        try:
+            report = None
+            if profile:
+                mode = profile if profile in PROFILE_MODES else 'all'
+                if execution_mode(skill) == 'subprocess':
+                    cmd, prefix = profile_command(skill, key, args, mode=mode)
+                    result = await arun_command(cmd, max_memory=self.output_limit)
+                    report = read_report(prefix)
+                else:
+                    loop = asyncio.get_running_loop()
+                    result, report = await loop.run_in_executor(
+                        None, lambda: run_profiled(skill, key, args, mode=mode))
+            else:
+                result = await arun_skill(skill, args, max_memory=self.output_limit,
+                                          on_output=self._progress_reporter())
+            record_result(key, 'mcp', result, mode=execution_mode(skill))
+            self._observe(key, self._status(result), result.output_size, result.spawn_time)
             
-            if not script_path.exists():
+            if result.timed_out:
+                result.discard_files()
                 return [TextContent(
                     type="text",
-                    text=f"Error: Script not found for skill '{name}'"
-                )]
+                    text=f"Error: Skill '{name}' execution timed out"
+                )], False
             
-            # Build command with arguments
-            cmd = [sys.executable, str(script_path)]
-            cmd.extend(str(v) for v in arguments.values())
+            output, spilled = self._bounded(result.stdout, result.stdout_file, 'stdout', key)
+            if result.stderr:
+                errors, stderr_spilled = self._bounded(result.stderr, result.stderr_file, 'stderr', key)
+                output += f"\n\nErrors:\n{errors}"
+                spilled = spilled or stderr_spilled
+            if profile:
+                output += f"\n\n{format_report(report)}"
+            output = output or "Skill executed successfully (no output)"
             
+            # Spilled outputs are not cached: their resources expire
+            return [TextContent(
+                type="text",
+                text=output
+            )], result.returncode == 0 and not spilled
+        
+        except Exception as e:
+            self._observe(key, 'error')
+            return [TextContent(
+                type="text",
+                text=f"Error executing skill '{name}': {str(e)}"
+            )], False
+    
+    @staticmethod
+    def _status(result) -> str:
+        return 'timeout' if result.timed_out else 'ok' if result.returncode == 0 else 'error'
+    
+    def _observe(self, tool: str, status: str, output_size: Optional[int] = None,
+                 spawn_time: Optional[float] = None):
+        """Record an execution's outcome, output size and process spawn time."""
+        self.m_executions.inc(tool=tool, status=status)
+        if output_size is not None:
+            self.m_output_chars.observe(output_size, tool=tool)
+        if spawn_time is not None:
+            self.m_spawn_seconds.observe(spawn_time, tool=tool)
+    
+    def _progress_reporter(self):
+        """
+        Output callback forwarding a skill's stdout as MCP progress notifications,
+        or None when the client did not ask for progress on this request.
+        
+        progress counts characters of stdout so far; message carries the new text.
+        Streaming stops once output_limit characters have been sent.
+        """
+        try:
+            context = self.server.request_context
+        except LookupError:
+            return None
+        token = context.meta.progressToken if context.meta else None
+        if token is None:
+            return None
+        sent = 0
+        
+        async def report(stream_name: str, text: str):
+            nonlocal sent
+            # Like the response, progress carries at most output_limit characters
+            if stream_name != 'stdout' or sent >= self.output_limit:
+                return
+            text = text[:self.output_limit - sent]
+            sent += len(text)
             try:
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=30,
-                    encoding='utf-8',
-                    errors='replace'
-                )
-                
-                output = result.stdout
-                if result.stderr:
-                    output += f"\n\nErrors:\n{result.stderr}"
-                
-                return [TextContent(
-                    type="text",
-                    text=output or "Skill executed successfully (no output)"
-                )]
-            
-            except subprocess.TimeoutExpired:
-                return [TextContent(
-                    type="text",
-                    text=f"Error: Skill '{name}' execution timed out"
-                )]
-            except Exception as e:
-                return [TextContent(
-                    type="text",
-                    text=f"Error executing skill '{name}': {str(e)}"
-                )]
+                await context.session.send_progress_notification(
+                    token, sent, message=text, related_request_id=str(context.request_id))
+            except Exception:
+                pass  # progress is best-effort; the full output is still returned
+        
+        return report
+    
+    def _remember_session(self):
+        """Keep a handle on the client session for server-initiated notifications."""
+        try:
+            self._session = self.server.request_context.session
+            self._loop = asyncio.get_running_loop()
+        except LookupError:
+            pass
+    
+    def _call_pipeline(self, arguments: dict, cancel: Optional[threading.Event] = None) -> list[TextContent]:
+        """Run the built-in pipeline tool; setting cancel kills every stage."""
+        try:
+            stages = [(str(stage['skill']), [str(a) for a in stage.get('args', [])])
+                      for stage in arguments.get('stages', [])]
+            if not stages:
+                raise ValueError("at least one stage is required")
+            # Like single skill calls, a pipeline never runs unbounded
+            timeout = float(arguments.get('timeout') or DEFAULT_TIMEOUT)
+            result = run_pipeline(self.skills, stages, timeout=timeout,
+                                  capture=True, input_text=arguments.get('input'),
+                                  max_memory=self.output_limit, cancel=cancel)
+        except (KeyError, FileNotFoundError, ValueError, TypeError) as e:
+            message = e.args[0] if isinstance(e, KeyError) else e
+            self._observe(PIPELINE_TOOL.name, 'error')
+            return [TextContent(type="text", text=f"Error: invalid pipeline: {message}")]
+        
+        for skill_name, stage_result in result.stages:
+            record_result(skill_name, 'mcp', stage_result, mode='subprocess')
+        if not result.cancelled:  # counted by _execute()
+            self._observe(PIPELINE_TOOL.name, self._status(result),
+                          result.output.output_size if result.output else 0)
+        
+        if result.timed_out:
+            for _, stage_result in result.stages:
+                stage_result.discard_files()
+            return [TextContent(type="text", text="Error: Pipeline execution timed out")]
+        
+        output, _ = self._bounded(result.output.stdout, result.output.stdout_file, 'stdout', 'pipeline')
+        errors = [f"[{name}] {self._bounded(r.stderr, r.stderr_file, 'stderr', name)[0].strip()}"
+                  for name, r in result.stages if r.stderr.strip()]
+        if errors:
+            output += "\n\nErrors:\n" + "\n".join(errors)
+        failed = result.failed_stage()
+        if failed:
+            index, skill_name, stage_result = failed
+            output += f"\n\nStage {index + 1} ({skill_name}) exited with code {stage_result.returncode}"
+        
+        return [TextContent(
+            type="text",
+            text=output or "Pipeline executed successfully (no output)"
+        )]
+    
+    def _save_metrics(self, path: str):
+        try:
+            self.metrics.write(path)
+        except OSError as e:
+            print(f"Warning: could not write metrics to {path}: {e}", file=sys.stderr)
+    
+    async def _write_metrics(self, path: str):
+        """Rewrite the metrics file every ASK_METRICS_INTERVAL seconds (for textfile scrapers)."""
+        interval = float(os.environ.get('ASK_METRICS_INTERVAL', 0) or DEFAULT_METRICS_INTERVAL)
+        loop = asyncio.get_running_loop()
+        while True:
+            await loop.run_in_executor(None, self._save_metrics, path)
+            await asyncio.sleep(max(0.1, interval))
     
     async def run(self):
-        """Run the MCP server."""
-        async with self.server:
-            # Server will run and accept JSON-RPC requests
-            print(f"MCP Server running with {len(self.skills)} skills available")
-            print("Skills:", list(self.skills.keys()))
-            await asyncio.Future()  # Run forever
+        """Run the MCP server over stdio, hot-reloading skills as they change."""
+        from mcp.server.lowlevel import NotificationOptions
+        from mcp.server.stdio import stdio_server
+        
+        # stdout carries the protocol; status goes to stderr
+        print(f"MCP Server running with {len(self.skills)} skills available", file=sys.stderr)
+        print("Skills:", list(self.skills.keys()), file=sys.stderr)
+        
+        watcher = None
+        if os.environ.get('ASK_WATCH') != '0':
+            try:
+                from core.watcher import SkillWatcher
+            except ImportError:
+                from watcher import SkillWatcher
+            watcher = SkillWatcher(self.skills_dir, self._on_skills_changed).start()
+        
+        # In-process, pooled and profiled runs and pipelines use the default
+        # executor; size it so they get the same concurrency as subprocess skills
+        from concurrent.futures import ThreadPoolExecutor
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='ask-mcp'))
+        
+        if self.workers:
+            shards = ShardPool(self.workers, self.skills_dir)
+            await shards.start()
+            self._shard_loop = asyncio.get_running_loop()
+            self.shards = shards
+            print(f"Executing calls in {self.workers} worker processes", file=sys.stderr)
+        
+        # SIGTERM cancels the server like a disconnect does: in-flight calls
+        # are cancelled and their skills' process groups killed
+        if sys.platform != 'win32':
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        
+        metrics_file = os.environ.get('ASK_METRICS_FILE')
+        metrics_task = asyncio.ensure_future(self._write_metrics(metrics_file)) if metrics_file else None
+        
+        options = self.server.create_initialization_options(
+            notification_options=NotificationOptions(tools_changed=True))
+        try:
+            async with stdio_server(stdin=await _loop_stdin()) as (read_stream, write_stream):
+                await self.server.run(read_stream, write_stream, options)
+        finally:
+            if self.shards is not None:
+                shards, self.shards = self.shards, None
+                await shards.close()
+            if metrics_task is not None:
+                metrics_task.cancel()
+                self._save_metrics(metrics_file)
+            if watcher is not None:
+                watcher.stop()
+            for task in list(self._revalidating.values()):
+                task.cancel()
+            self.results.save()
+            self.outputs.close()
 
 
 def main():
     """Main entry point for MCP gateway."""
-    server = SkillMCPServer()
+    server = SkillMCPServer(os.environ.get('ASK_SKILLS_DIR') or "skills")
     
     # Run the server
-    asyncio.run(server.run())
+    try:
+        asyncio.run(server.run())
+    except asyncio.CancelledError:
+        pass  # stopped by SIGTERM
 
 
 if __name__ == "__main__":
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+Gateway Metrics
+Counters and histograms for the MCP gateway, rendered in the Prometheus
+text exposition format. No client library is needed: the gateway serves the
+text through its `metrics` tool and can write it to a file periodically for
+a local agent to scrape (e.g. node_exporter's textfile collector).
+"""
+
+import os
+import math
+import threading
+from typing import Callable, Dict, List, Sequence, Tuple, Union
+
+# Seconds: from a cache hit to a skill hitting the 30 s timeout
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+# Characters of output per call (stdout plus stderr)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """Monotonic count per label set."""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in items]
+
+
+class Histogram:
+    """Cumulative bucket counts, sum and count per label set."""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[Labels, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [0] * (len(self.buckets) + 2)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, list(series)) for key, series in self._values.items())
+        lines = []
+        for key, series in items:
+            for bound, count in zip(self.buckets + (math.inf,), series[:-1]):
+                labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {count}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{labels} {series[-2]}")
+        return lines
+
+
+class Sampled:
+    """A gauge or counter whose value is read from a callback at render time."""
+
+    def __init__(self, name: str, help_text: str, kind: str,
+                 read: Callable[[], Union[float, Dict[str, float]]], labelname: str = ''):
+        self.name = name
+        self.help = help_text
+        self.kind = kind
+        self.read = read
+        # read() may return {label value: number} for one label
+        self.labelname = labelname
+
+    def render(self) -> List[str]:
+        value = self.read()
+        if isinstance(value, dict):
+            return [f"{self.name}{_format_labels((self.labelname,), (key,))} {_format_value(v)}"
+                    for key, v in sorted(value.items())]
+        return [f"{self.name} {_format_value(value)}"]
+
+
+class MetricsRegistry:
+    """Holds metrics in registration order and renders them together."""
+
+    def __init__(self):
+        self._metrics = []
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, help_text, labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help_text, labelnames, buckets))
+
+    def gauge_callback(self, name: str, help_text: str, read, labelname: str = '') -> Sampled:
+        return self._add(Sampled(name, help_text, 'gauge', read, labelname))
+
+    def counter_callback(self, name: str, help_text: str, read, labelname: str = '') -> Sampled:
+        return self._add(Sampled(name, help_text, 'counter', read, labelname))
+
+    def _add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: str):
+        """Write render() to path atomically, so a scraper never reads half a file."""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+Spilled Output Store
+Keeps the full output of tool calls too large to return inline, and serves
+it back as MCP resources that clients read in chunks:
+
+    ask-output://<id>/stdout?offset=0&length=1048576
+
+offset and length are in bytes of UTF-8 text; each chunk ends on a
+character boundary, so the next offset is offset + len(chunk.encode()).
+Only the most recent outputs are kept, and all are deleted on shutdown.
+"""
+
+import os
+import uuid
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+SCHEME = 'ask-output'
+DEFAULT_MAX_OUTPUTS = 64
+DEFAULT_CHUNK = 1024 * 1024
+MAX_CHUNK = 4 * 1024 * 1024
+
+
+def _char_start(data: bytes, index: int) -> int:
+    """Move index back to the start of the UTF-8 character it falls in."""
+    while 0 < index and (data[index] & 0xC0) == 0x80:
+        index -= 1
+    return index
+
+
+class OutputStore:
+    """Spill files of recent tool calls, addressed by resource URI."""
+
+    def __init__(self, max_outputs: int = DEFAULT_MAX_OUTPUTS):
+        self.max_outputs = max(1, max_outputs)
+        # uri -> (path, description), oldest first
+        self._files: 'OrderedDict[str, Tuple[str, str]]' = OrderedDict()
+        # Pipelines register outputs from executor threads
+        self._lock = threading.Lock()
+        # Outputs ever added, for the gateway's metrics
+        self.spilled = 0
+
+    def add(self, path: str, stream: str, description: str) -> str:
+        """Take ownership of a spill file and return the URI serving it."""
+        uri = f"{SCHEME}://{uuid.uuid4().hex[:12]}/{stream}"
+        self.adopt(uri, path, description)
+        return uri
+
+    def adopt(self, uri: str, path: str, description: str):
+        """Take ownership of a spill file under an existing URI (handed over by take())."""
+        with self._lock:
+            self.spilled += 1
+            self._files[uri] = (path, description)
+            while len(self._files) > self.max_outputs:
+                _, (old_path, _) = self._files.popitem(last=False)
+                self._delete(old_path)
+
+    def take(self) -> List[Tuple[str, str, str]]:
+        """Hand over every stored output as (uri, path, description), keeping the files."""
+        with self._lock:
+            entries = [(uri, path, description) for uri, (path, description) in self._files.items()]
+            self._files.clear()
+        return entries
+
+    def add_text(self, text: str, stream: str, description: str) -> str:
+        """Spill an in-memory output (in-process or pooled runs) and return its URI."""
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', prefix='ask-output-',
+                                         suffix='.txt', delete=False) as f:
+            f.write(text)
+        return self.add(f.name, stream, description)
+
+    @staticmethod
+    def head(path: str, chars: int) -> str:
+        """The first chars characters of a spill file."""
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                return f.read(chars)
+        except OSError:
+            return ''
+
+    @staticmethod
+    def tail(path: str, chars: int) -> str:
+        """The last chars characters of a spill file (read from the end, not the start)."""
+        try:
+            with open(path, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                f.seek(max(0, f.tell() - chars * 4))
+                data = f.read()
+        except OSError:
+            return ''
+        return data.decode('utf-8', errors='replace')[-chars:]
+
+    def resources(self) -> List[Dict]:
+        """uri, description and size in bytes of every stored output."""
+        entries = []
+        with self._lock:
+            files = list(self._files.items())
+        for uri, (path, description) in files:
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                continue
+            entries.append({'uri': uri, 'description': description, 'size': size})
+        return entries
+
+    def read(self, uri: str) -> Optional[str]:
+        """One chunk of a stored output, or None for an unknown URI."""
+        parts = urlsplit(str(uri))
+        key = f"{parts.scheme}://{parts.netloc}{parts.path}"
+        with self._lock:
+            entry = self._files.get(key)
+        if entry is None:
+            return None
+        query = parse_qs(parts.query)
+        try:
+            offset = max(0, int(query.get('offset', ['0'])[0]))
+            length = min(MAX_CHUNK, max(4, int(query.get('length', [str(DEFAULT_CHUNK)])[0])))
+        except ValueError:
+            offset, length = 0, DEFAULT_CHUNK
+
+        path, _ = entry
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            # One extra byte shows whether the cut falls inside a character
+            data = f.read(length + 1)
+        start = 0
+        while start < len(data) and (data[start] & 0xC0) == 0x80:
+            start += 1  # offset pointed into a character: begin at the next one
+        end = len(data) if len(data) <= length else _char_start(data, length)
+        return data[start:end].decode('utf-8', errors='replace')
+
+    def _delete(self, path: str):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+    def close(self):
+        """Delete every stored output."""
+        with self._lock:
+            for path, _ in self._files.values():
+                self._delete(path)
+            self._files.clear()
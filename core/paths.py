@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+Filesystem locations used by ASK for caches and runtime state.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+
+def get_cache_dir() -> Path:
+    """
+    Return the per-user ASK cache directory, creating it if needed.
+
+    Override with the ASK_CACHE_DIR environment variable.
+    """
+    override = os.environ.get('ASK_CACHE_DIR')
+    if override:
+        cache_dir = Path(override)
+    elif sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or str(Path.home() / "AppData" / "Local")
+        cache_dir = Path(base) / "agent-skill-kit" / "cache"
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or str(Path.home() / ".cache")
+        cache_dir = Path(base) / "agent-skill-kit"
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+
+def get_socket_path() -> Path:
+    """
+    Return the Unix socket path of the `ask serve` daemon.
+
+    Override with ASK_SOCKET; defaults to $XDG_RUNTIME_DIR when set, else
+    the cache directory.
+    """
+    override = os.environ.get('ASK_SOCKET')
+    if override:
+        return Path(override)
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return Path(runtime_dir) / "agent-skill-kit.sock"
+    return get_cache_dir() / "ask.sock"
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""
+Skill Pipelines
+Connects skills with OS pipes, like a shell pipeline: each stage's stdout is
+the next stage's stdin and all stages run concurrently. Intermediate output
+never passes through ASK, and a slow consumer naturally throttles its
+producer through the pipe buffer, so memory stays flat whatever the data size.
+
+Every stage runs as its own subprocess regardless of the skill's `execution`
+mode, since in-process and pooled runs have no stdin/stdout to connect.
+"""
+
+import time
+import threading
+import subprocess
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from core.execution import (
+        DEFAULT_MAX_MEMORY, OutputBuffer, SkillResult, SkillStream, build_command,
+        kill_process_group, process_group_kwargs, reap_process
+    )
+except ImportError:
+    from execution import (
+        DEFAULT_MAX_MEMORY, OutputBuffer, SkillResult, SkillStream, build_command,
+        kill_process_group, process_group_kwargs, reap_process
+    )
+
+Stage = Tuple[str, List[str]]
+
+_CHUNK_SIZE = 64 * 1024
+# How often a pipeline checks its cancel event (seconds)
+_CANCEL_POLL = 0.05
+
+
+def parse_pipeline(argv: List[str]) -> List[Stage]:
+    """Split `a args -- b args -- c` into [(skill, args), ...]."""
+    stages, current = [], []
+    for token in list(argv) + ['--']:
+        if token != '--':
+            current.append(token)
+            continue
+        if not current:
+            raise ValueError("Empty pipeline stage (expected: skill [args] -- skill [args] ...)")
+        stages.append((current[0], current[1:]))
+        current = []
+    return stages
+
+
+class PipelineResult:
+    """Outcome of a pipeline run."""
+
+    def __init__(self, stages: List[Tuple[str, SkillResult]], duration: float,
+                 timed_out: bool = False, output: Optional[SkillResult] = None,
+                 cancelled: bool = False):
+        # (skill name, result) per stage, in pipeline order
+        self.stages = stages
+        self.duration = duration
+        self.timed_out = timed_out
+        # Captured stdout/stderr of the last stage (capture mode only)
+        self.output = output
+        # Stopped through the cancel event before finishing
+        self.cancelled = cancelled
+
+    @property
+    def returncode(self) -> int:
+        """Exit code of the rightmost failing stage (like `set -o pipefail`)."""
+        if self.timed_out:
+            return 1
+        for _, result in reversed(self.stages):
+            if result.returncode != 0:
+                return result.returncode
+        return 0
+
+    def failed_stage(self) -> Optional[Tuple[int, str, SkillResult]]:
+        """(index, skill name, result) of the stage that set returncode, if any."""
+        for index in range(len(self.stages) - 1, -1, -1):
+            name, result = self.stages[index]
+            if result.returncode != 0:
+                return index, name, result
+        return None
+
+
+def _drain(pipe, buffer: OutputBuffer):
+    """Reader thread: copy a stage's stderr into a bounded buffer."""
+    try:
+        for data in iter(lambda: pipe.read1(_CHUNK_SIZE), b''):
+            buffer.write(data.decode('utf-8', errors='replace'))
+    finally:
+        pipe.close()
+
+
+def _feed(pipe, text: str):
+    """Writer thread: send input to the first stage, tolerating early exit."""
+    try:
+        pipe.write(text.encode('utf-8'))
+    except (BrokenPipeError, OSError):
+        pass
+    finally:
+        try:
+            pipe.close()
+        except OSError:
+            pass
+
+
+def run_pipeline(skills: Dict[str, Dict], stages: List[Stage], timeout: Optional[float] = None,
+                 capture: bool = False, input_text: Optional[str] = None,
+                 max_memory: int = DEFAULT_MAX_MEMORY,
+                 cancel: Optional[threading.Event] = None) -> PipelineResult:
+    """
+    Run stages connected by pipes and wait for all of them.
+
+    By default the first stage reads this process's stdin, the last writes to
+    its stdout and every stage's stderr passes straight through. With
+    capture=True the first stage reads input_text (or nothing), and the last
+    stage's output plus each stage's stderr are kept in bounded buffers that
+    spill to temp files. A timeout, or setting `cancel` from another
+    thread, kills every stage.
+    """
+    for name, _ in stages:
+        if name not in skills:
+            raise KeyError(f"Skill '{name}' not found")
+        if not skills[name]['script'].exists():
+            raise FileNotFoundError(f"Script not found for skill '{name}'")
+
+    start = time.perf_counter()
+    procs: List[subprocess.Popen] = []
+    stderr_buffers: List[Optional[OutputBuffer]] = []
+    threads: List[threading.Thread] = []
+    last_stream = None
+
+    if capture:
+        upstream = subprocess.PIPE if input_text else subprocess.DEVNULL
+    else:
+        upstream = None
+    # Captured (non-terminal) pipelines give each stage its own process group
+    # so a timeout or cancel also stops anything the stages spawned; terminal
+    # pipelines stay in the foreground group where Ctrl+C reaches them
+    group_kwargs = process_group_kwargs() if capture else {}
+
+    def kill(proc):
+        if group_kwargs:
+            kill_process_group(proc)
+        elif proc.poll() is None:
+            proc.kill()
+
+    try:
+        for index, (name, args) in enumerate(stages):
+            cmd = build_command(skills[name], args)
+            is_last = index == len(stages) - 1
+
+            if is_last and capture:
+                last_stream = SkillStream(cmd, timeout=None, max_memory=max_memory, stdin=upstream,
+                                          **group_kwargs)
+                proc = last_stream.proc
+                stderr_buffers.append(None)
+            else:
+                proc = subprocess.Popen(
+                    cmd,
+                    stdin=upstream,
+                    stdout=None if is_last else subprocess.PIPE,
+                    stderr=subprocess.PIPE if capture else None,
+                    **group_kwargs
+                )
+                buffer = None
+                if capture:
+                    buffer = OutputBuffer(max_memory)
+                    threads.append(threading.Thread(target=_drain, args=(proc.stderr, buffer), daemon=True))
+                stderr_buffers.append(buffer)
+
+            if index == 0 and input_text and capture:
+                threads.append(threading.Thread(target=_feed, args=(proc.stdin, input_text), daemon=True))
+            # Only the child keeps the read end of the previous pipe, so a
+            # consumer that exits early delivers EPIPE/SIGPIPE upstream
+            if procs and procs[-1].stdout is not None:
+                procs[-1].stdout.close()
+            procs.append(proc)
+            upstream = proc.stdout
+    except BaseException:
+        for proc in procs:
+            kill(proc)
+        raise
+
+    for thread in threads:
+        thread.start()
+
+    expired = threading.Event()
+
+    def kill_all():
+        expired.set()
+        for proc in procs:
+            kill(proc)
+
+    timer = threading.Timer(timeout, kill_all) if timeout else None
+    if timer:
+        timer.start()
+    finished = threading.Event()
+    cancelled = threading.Event()
+
+    def watch_cancel():
+        while not finished.wait(_CANCEL_POLL):
+            if cancel.is_set():
+                cancelled.set()
+                for proc in procs:
+                    kill(proc)
+                return
+
+    if cancel is not None:
+        threading.Thread(target=watch_cancel, daemon=True).start()
+    try:
+        if last_stream is not None:
+            for _ in last_stream:
+                pass
+        usage = [reap_process(proc) for proc in procs[:-1]]
+        if last_stream is None:
+            usage.append(reap_process(procs[-1]))
+        for thread in threads:
+            thread.join()
+    finally:
+        finished.set()
+        if timer:
+            timer.cancel()
+
+    duration = time.perf_counter() - start
+    results = []
+    for index, (name, _) in enumerate(stages):
+        if last_stream is not None and index == len(stages) - 1:
+            result = last_stream.result
+        else:
+            returncode, cpu_time, max_rss_kb = usage[index]
+            buffer = stderr_buffers[index]
+            if buffer is not None:
+                buffer.close()
+            result = SkillResult(
+                returncode=returncode,
+                stderr=buffer.getvalue() if buffer else "",
+                duration=duration,
+                timed_out=expired.is_set(),
+                stderr_file=buffer.path if buffer else None,
+                cpu_time=cpu_time,
+                max_rss_kb=max_rss_kb,
+                # stdout went to the next stage or the terminal, unseen: size unknown
+                captured=False,
+            )
+        result.timed_out = expired.is_set()
+        results.append((name, result))
+
+    return PipelineResult(results, duration, timed_out=expired.is_set(),
+                          output=last_stream.result if last_stream is not None else None,
+                          cancelled=cancelled.is_set())
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Skill Pool Worker
+Long-lived, pre-warmed Python process that executes skill scripts on request.
+Started and managed by core.worker_pool.WorkerPool; not meant to be run by hand.
+
+Protocol: one JSON request per line on stdin
+    {"script": "...", "args": [...], "cwd": "...", "timeout": 30}
+and one JSON response per line on the original stdout
+    {"returncode": 0, "stdout_file": "/tmp/ask-output-...", "stderr_file": "...",
+     "timed_out": false, "cpu_time": 0.01, "max_rss_kb": 23456, "rss_kb": 12345}
+
+Forked runs write their output to temp files whose paths are returned; the
+pool takes them over (reading them with bounded memory), so large output
+never passes through this process or the pipe. Runs without fork return
+"stdout"/"stderr" text instead. cpu_time and max_rss_kb describe the run
+itself and are only reported for forked runs; rss_kb is the worker's own peak.
+
+On POSIX every request runs in a fork of this process (a fork server), so runs
+stay isolated from each other while skipping interpreter start-up and the
+common imports below. Elsewhere scripts run directly in the worker, which the
+pool recycles after a bounded number of runs.
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import runpy
+import signal
+import tempfile
+import threading
+import traceback
+
+# Pre-import the modules skills commonly use so forks inherit them warm
+import pathlib
+import urllib.request
+import urllib.parse
+import urllib.error
+try:
+    import yaml
+except ImportError:
+    pass
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+def _rss_kb() -> int:
+    """Peak resident set size of this worker in KiB (0 if unknown)."""
+    if resource is None:
+        return 0
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux reports KiB
+    return usage // 1024 if sys.platform == 'darwin' else usage
+
+
+def _exit_code(code) -> int:
+    """Translate a SystemExit code into a process exit status."""
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+def _run_script(script: str, args: list) -> int:
+    """Execute script as __main__ with the given argv."""
+    sys.argv = [script] + list(args)
+    try:
+        runpy.run_path(script, run_name='__main__')
+        return 0
+    except SystemExit as e:
+        return _exit_code(e.code)
+    except BaseException:
+        traceback.print_exc()
+        return 1
+
+
+def _output_file(stream: str):
+    return tempfile.NamedTemporaryFile(prefix=f'ask-output-{stream}-', suffix='.txt', delete=False)
+
+
+def run_forked(script: str, args: list, cwd: str, timeout: float) -> dict:
+    """Run the script in a forked child with stdout/stderr captured to temp files, returned by path."""
+    out, err = _output_file('stdout'), _output_file('stderr')
+    try:
+        with out, err:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            pid = os.fork()
+            if pid == 0:
+                code = 1
+                try:
+                    # Own session and process group, so a timeout kills anything the skill spawned
+                    os.setsid()
+                    devnull = os.open(os.devnull, os.O_RDONLY)
+                    os.dup2(devnull, 0)
+                    os.dup2(out.fileno(), 1)
+                    os.dup2(err.fileno(), 2)
+                    sys.stdout = io.TextIOWrapper(os.fdopen(1, 'wb', closefd=False), encoding='utf-8', errors='replace')
+                    sys.stderr = io.TextIOWrapper(os.fdopen(2, 'wb', closefd=False), encoding='utf-8', errors='replace')
+                    if cwd:
+                        os.chdir(cwd)
+                    code = _run_script(script, args)
+                finally:
+                    try:
+                        sys.stdout.flush()
+                        sys.stderr.flush()
+                    finally:
+                        os._exit(code if 0 <= code < 256 else 1)
+
+            timed_out = threading.Event()
+
+            def kill_child():
+                timed_out.set()
+                try:
+                    os.killpg(pid, signal.SIGKILL)
+                except OSError:
+                    # The child has not reached setsid() yet
+                    try:
+                        os.kill(pid, signal.SIGKILL)
+                    except OSError:
+                        pass
+
+            timer = threading.Timer(timeout, kill_child) if timeout else None
+            if timer:
+                timer.start()
+            try:
+                _, status, usage = os.wait4(pid, 0)
+            finally:
+                if timer:
+                    timer.cancel()
+
+            if os.WIFSIGNALED(status):
+                returncode = -os.WTERMSIG(status)
+            else:
+                returncode = os.WEXITSTATUS(status)
+
+            return {
+                'returncode': 1 if timed_out.is_set() else returncode,
+                'stdout_file': out.name,
+                'stderr_file': err.name,
+                'timed_out': timed_out.is_set(),
+                'cpu_time': usage.ru_utime + usage.ru_stime,
+                'max_rss_kb': usage.ru_maxrss // 1024 if sys.platform == 'darwin' else usage.ru_maxrss,
+            }
+    except BaseException:
+        # No response will carry the paths: nobody else can delete the files
+        for f in (out, err):
+            try:
+                os.unlink(f.name)
+            except OSError:
+                pass
+        raise
+
+
+def run_inline(script: str, args: list, cwd: str) -> dict:
+    """Run the script in this process (platforms without fork)."""
+    stdout, stderr = io.StringIO(), io.StringIO()
+    saved = (sys.stdout, sys.stderr, sys.argv, os.getcwd())
+    sys.stdout, sys.stderr = stdout, stderr
+    try:
+        if cwd:
+            os.chdir(cwd)
+        code = _run_script(script, args)
+    finally:
+        sys.stdout, sys.stderr, sys.argv = saved[0], saved[1], saved[2]
+        os.chdir(saved[3])
+    return {
+        'returncode': code,
+        'stdout': stdout.getvalue(),
+        'stderr': stderr.getvalue(),
+        'timed_out': False,
+    }
+
+
+def main():
+    """Serve run requests until stdin closes."""
+    # Keep a private handle on the protocol channel and point fd 1 at stderr,
+    # so nothing a skill (or an import) prints can corrupt the responses.
+    protocol = io.open(os.dup(1), 'w', encoding='utf-8', newline='\n')
+    os.dup2(2, 1)
+    sys.stdout = sys.stderr
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+            script = request['script']
+            args = [str(a) for a in request.get('args', [])]
+            cwd = request.get('cwd')
+            timeout = request.get('timeout')
+            start = time.perf_counter()
+            if hasattr(os, 'fork'):
+                response = run_forked(script, args, cwd, timeout)
+            else:
+                response = run_inline(script, args, cwd)
+            response['duration'] = time.perf_counter() - start
+        except Exception as e:
+            response = {'returncode': 1, 'stdout': '', 'stderr': f"Worker error: {e}\n", 'timed_out': False}
+
+        response['rss_kb'] = _rss_kb()
+        protocol.write(json.dumps(response) + '\n')
+        protocol.flush()
+
+
+if __name__ == "__main__":
+    main()
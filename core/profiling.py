@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Skill Profiler
+Runs a skill under cProfile and/or tracemalloc, writes a .pstats file and a
+collapsed-stack file (for flamegraph.pl, speedscope, inferno, ...), and
+summarises the hottest functions and peak memory.
+
+Subprocess and pooled skills are profiled in a fresh interpreter started
+from this file; in-process skills are profiled where they run.
+"""
+
+import os
+import sys
+import json
+import time
+import runpy
+import pstats
+import cProfile
+import itertools
+import tracemalloc
+import traceback
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from core.execution import DEFAULT_TIMEOUT, execution_mode, run_subprocess
+except ImportError:
+    from execution import DEFAULT_TIMEOUT, execution_mode, run_subprocess
+
+PROFILER_SCRIPT = Path(__file__).resolve()
+
+PROFILE_MODES = {
+    'cpu': (True, False),
+    'memory': (False, True),
+    'all': (True, True),
+}
+
+TOP_FUNCTIONS = 10
+TOP_ALLOCATIONS = 5
+
+# Tells apart profiles this process starts within the same second
+_sequence = itertools.count(1)
+
+
+def _frame_label(func: Tuple[str, int, str]) -> str:
+    """Readable, collapsed-stack-safe name for a pstats function key."""
+    filename, line, name = func
+    if filename == '~':
+        label = name
+    else:
+        label = f"{os.path.basename(filename)}:{name}:{line}"
+    return label.replace(';', ',')
+
+
+def collapsed_stacks(stats: pstats.Stats) -> List[str]:
+    """
+    Approximate collapsed stacks ("a;b;c <microseconds>") from a pstats profile.
+
+    cProfile only records caller/callee edges, so each function's own time is
+    split across its callers and every caller is expanded along its most
+    expensive call path.
+    """
+    entries = stats.stats
+    paths: Dict[tuple, List[tuple]] = {}
+
+    def primary_path(func, seen=()) -> List[tuple]:
+        if func in paths:
+            return paths[func]
+        callers = entries.get(func, (0, 0, 0, 0, {}))[4]
+        candidates = [c for c in callers if c not in seen and c != func]
+        if not candidates:
+            path = [func]
+        else:
+            parent = max(candidates, key=lambda c: callers[c][3] if isinstance(callers[c], tuple) else 0)
+            path = primary_path(parent, seen + (func,)) + [func]
+        paths[func] = path
+        return path
+
+    lines = []
+    for func, (_, _, tottime, _, callers) in entries.items():
+        if tottime <= 0:
+            continue
+        if not callers:
+            lines.append((primary_path(func), tottime))
+            continue
+        edge_times = {c: (v[2] if isinstance(v, tuple) else 0.0) for c, v in callers.items()}
+        edge_total = sum(edge_times.values())
+        for caller, edge_time in edge_times.items():
+            share = edge_time / edge_total if edge_total > 0 else 1.0 / len(edge_times)
+            if caller == func:
+                continue
+            lines.append((primary_path(caller, (func,)) + [func], tottime * share))
+
+    collapsed = {}
+    for path, seconds in lines:
+        key = ';'.join(_frame_label(f) for f in path)
+        collapsed[key] = collapsed.get(key, 0) + seconds
+    return [f"{key} {max(1, int(seconds * 1e6))}" for key, seconds in sorted(collapsed.items())]
+
+
+def top_functions(stats: pstats.Stats, limit: int = TOP_FUNCTIONS) -> List[Dict]:
+    """Hottest functions by own time."""
+    rows = []
+    for func, (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+        rows.append({
+            'function': _frame_label(func),
+            'calls': ncalls,
+            'self_ms': round(tottime * 1000, 3),
+            'cumulative_ms': round(cumtime * 1000, 3),
+        })
+    rows.sort(key=lambda r: r['self_ms'], reverse=True)
+    return rows[:limit]
+
+
+def profile_call(func, out_prefix: str, cpu: bool = True, memory: bool = True):
+    """
+    Call func() under the requested profilers and write <out_prefix>.pstats,
+    <out_prefix>.collapsed and <out_prefix>.json. Returns (value, report).
+    """
+    profiler = cProfile.Profile() if cpu else None
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    try:
+        value = func()
+    finally:
+        if profiler:
+            profiler.disable()
+        wall = time.perf_counter() - start
+        report = {'wall_ms': round(wall * 1000, 3), 'files': {}}
+
+        if memory:
+            _, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            report['peak_memory_bytes'] = peak
+            report['top_allocations'] = [
+                {'site': str(stat.traceback[0]), 'size_bytes': stat.size, 'count': stat.count}
+                for stat in snapshot.statistics('lineno')[:TOP_ALLOCATIONS]
+            ]
+
+        if profiler:
+            stats = pstats.Stats(profiler)
+            pstats_path = f"{out_prefix}.pstats"
+            collapsed_path = f"{out_prefix}.collapsed"
+            stats.dump_stats(pstats_path)
+            with open(collapsed_path, 'w', encoding='utf-8') as f:
+                f.write('\n'.join(collapsed_stacks(stats)) + '\n')
+            report['files']['pstats'] = pstats_path
+            report['files']['collapsed'] = collapsed_path
+            report['top_functions'] = top_functions(stats)
+
+        summary_path = f"{out_prefix}.json"
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        report['files']['summary'] = summary_path
+
+    return value, report
+
+
+def profile_prefix(skill_name: str, out_dir: Optional[str] = None) -> str:
+    """Output path prefix for a new profile of skill_name."""
+    directory = Path(out_dir or os.environ.get('ASK_PROFILE_DIR', 'ask-profiles'))
+    directory.mkdir(parents=True, exist_ok=True)
+    stamp = time.strftime('%Y%m%d-%H%M%S')
+    return str(directory / f"{skill_name}-{stamp}-{os.getpid()}-{next(_sequence)}")
+
+
+def run_profiled(skill: Dict, skill_name: str, args: List[str] = None, mode: str = 'all',
+                 out_dir: Optional[str] = None, timeout: float = None):
+    """
+    Run a skill under the profiler. Returns (SkillResult, report); report is
+    None if the profiled process did not produce one (e.g. it timed out).
+    """
+    args = list(args or [])
+
+    if execution_mode(skill) == 'inprocess':
+        try:
+            from core.inprocess import get_executor
+        except ImportError:
+            from inprocess import get_executor
+        cpu, memory = PROFILE_MODES.get(mode, PROFILE_MODES['all'])
+        result, report = profile_call(
+            lambda: get_executor().run(Path(skill['script']), args),
+            profile_prefix(skill_name, out_dir), cpu, memory)
+        return result, report
+
+    cmd, prefix = profile_command(skill, skill_name, args, mode, out_dir)
+    result = run_subprocess(cmd, timeout if timeout is not None else DEFAULT_TIMEOUT)
+    return result, read_report(prefix)
+
+
+def profile_command(skill: Dict, skill_name: str, args: List[str] = None, mode: str = 'all',
+                    out_dir: Optional[str] = None) -> Tuple[List[str], str]:
+    """
+    (command, report prefix) running a subprocess skill under the profiler,
+    for callers that run the command themselves; read_report(prefix) afterwards.
+    """
+    cpu, memory = PROFILE_MODES.get(mode, PROFILE_MODES['all'])
+    prefix = profile_prefix(skill_name, out_dir)
+    cmd = [sys.executable, str(PROFILER_SCRIPT), '--prefix', prefix]
+    if cpu:
+        cmd.append('--cpu')
+    if memory:
+        cmd.append('--memory')
+    cmd += ['--', str(skill['script'])] + list(args or [])
+    return cmd, prefix
+
+
+def read_report(prefix: str) -> Optional[Dict]:
+    """Load the report a profiled run wrote under prefix, or None."""
+    try:
+        with open(f"{prefix}.json", 'r', encoding='utf-8') as f:
+            report = json.load(f)
+        report['files']['summary'] = f"{prefix}.json"
+    except (OSError, ValueError):
+        report = None
+    return report
+
+
+def format_report(report: Optional[Dict]) -> str:
+    """Plain-text summary of a profile report."""
+    if not report:
+        return "Profile: no report was produced (the run may have timed out or crashed)."
+    lines = [f"Profile: wall {report['wall_ms']:.1f} ms"]
+    if 'peak_memory_bytes' in report:
+        lines.append(f"Peak traced memory: {report['peak_memory_bytes'] / 1024:.1f} KiB")
+    if report.get('top_functions'):
+        lines.append("Top functions by self time:")
+        lines.append(f"  {'self ms':>10} {'cum ms':>10} {'calls':>8}  function")
+        for row in report['top_functions']:
+            lines.append(f"  {row['self_ms']:10.2f} {row['cumulative_ms']:10.2f} {row['calls']:8}  {row['function']}")
+    if report.get('top_allocations'):
+        lines.append("Top allocation sites:")
+        for row in report['top_allocations']:
+            lines.append(f"  {row['size_bytes'] / 1024:10.1f} KiB  {row['site']}")
+    for kind, path in report.get('files', {}).items():
+        lines.append(f"{kind}: {path}")
+    return '\n'.join(lines)
+
+
+def _exit_code(code) -> int:
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+def main(argv: List[str]) -> int:
+    """Script entry: profiling.py --prefix P [--cpu] [--memory] -- script.py [args...]"""
+    split = argv.index('--')
+    options, target = argv[:split], argv[split + 1:]
+    prefix = options[options.index('--prefix') + 1]
+    script = target[0]
+
+    def run():
+        sys.argv = list(target)
+        sys.path.insert(0, os.path.dirname(os.path.abspath(script)))
+        try:
+            runpy.run_path(script, run_name='__main__')
+            return 0
+        except SystemExit as e:
+            return _exit_code(e.code)
+        except Exception:
+            traceback.print_exc()
+            return 1
+
+    code, _ = profile_call(run, prefix, cpu='--cpu' in options, memory='--memory' in options)
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+Result Cache
+Content-addressed, size-bounded on-disk cache of skill results for skills
+whose manifest declares `cacheable: true`. A result is keyed by the script's
+contents, the manifest version, the arguments and the contents of any
+arguments that name existing files or directories.
+"""
+
+import os
+import json
+import time
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from core.paths import get_cache_dir
+    from core.execution import DEFAULT_TIMEOUT, SkillResult, execute_skill
+except ImportError:
+    from paths import get_cache_dir
+    from execution import DEFAULT_TIMEOUT, SkillResult, execute_skill
+
+# Bump to invalidate every stored result
+CACHE_VERSION = 1
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_HASH_CHUNK = 1024 * 1024
+
+
+def reads_stdin(args: List[str] = None) -> bool:
+    """True when a `-` argument makes the run read stdin."""
+    return '-' in [str(a) for a in (args or [])]
+
+
+def is_cacheable(skill: Dict, args: List[str] = None) -> bool:
+    """
+    True when the skill's manifest opts into result caching and the run does
+    not read stdin, which the cache key cannot see.
+    """
+    return (skill.get('manifest') or {}).get('cacheable') is True and not reads_stdin(args)
+
+
+def _hash_file(path: str, digest) -> None:
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(_HASH_CHUNK), b''):
+            digest.update(block)
+
+
+def hash_path(path: str) -> Optional[str]:
+    """
+    Hash an input path: file contents, or for directories every entry's
+    relative path, size and mtime. Returns None if path does not exist.
+    """
+    digest = hashlib.sha256()
+    try:
+        if os.path.isfile(path):
+            _hash_file(path, digest)
+        elif os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    full = os.path.join(root, name)
+                    try:
+                        st = os.stat(full)
+                    except OSError:
+                        continue
+                    rel = os.path.relpath(full, path)
+                    digest.update(f"{rel}\0{st.st_size}\0{st.st_mtime_ns}\n".encode('utf-8', 'surrogateescape'))
+                for name in dirs:
+                    rel = os.path.relpath(os.path.join(root, name), path)
+                    digest.update(f"{rel}/\n".encode('utf-8', 'surrogateescape'))
+        else:
+            return None
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """On-disk result store with LRU eviction by total size."""
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: Optional[int] = None):
+        if cache_dir is None:
+            cache_dir = get_cache_dir() / "results"
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        if max_bytes is None:
+            max_bytes = int(os.environ.get('ASK_RESULT_CACHE_MB', 0)) * 1024 * 1024 or DEFAULT_MAX_BYTES
+        self.max_bytes = max_bytes
+
+    def key(self, skill: Dict, args: List[str] = None, cwd: Optional[str] = None) -> str:
+        """Content address for running skill with args from cwd (default: the current directory)."""
+        args = [str(a) for a in (args or [])]
+        cwd = cwd or os.getcwd()
+        script_digest = hashlib.sha256()
+        _hash_file(str(skill['script']), script_digest)
+        material = {
+            'version': CACHE_VERSION,
+            'script': script_digest.hexdigest(),
+            'manifest_version': str((skill.get('manifest') or {}).get('version', '')),
+            'args': args,
+            'inputs': {arg: hash_path(os.path.join(cwd, arg)) for arg in args
+                       if os.path.exists(os.path.join(cwd, arg))},
+            'cwd': cwd,
+        }
+        encoded = json.dumps(material, sort_keys=True).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[SkillResult]:
+        """Return the stored result for key, marking it recently used."""
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            os.utime(path, None)
+        except (OSError, ValueError):
+            return None
+        return SkillResult(
+            returncode=data.get('returncode', 0),
+            stdout=data.get('stdout', ''),
+            stderr=data.get('stderr', ''),
+        )
+
+    def put(self, key: str, result: SkillResult):
+        """Store a result and evict least recently used entries past the size bound."""
+        path = self._entry_path(key)
+        data = {
+            'returncode': result.returncode,
+            'stdout': result.stdout,
+            'stderr': result.stderr,
+            'created': time.time(),
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+        self.evict()
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+
+        if total <= self.max_bytes:
+            return
+        for _, size, path in sorted(entries):
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+
+_cache = None
+
+
+def get_result_cache() -> Optional[ResultCache]:
+    """Shared result cache, or None when disabled (ASK_NO_CACHE) or unavailable."""
+    global _cache
+    if os.environ.get('ASK_NO_CACHE'):
+        return None
+    if _cache is None:
+        try:
+            _cache = ResultCache()
+        except OSError:
+            return None
+    return _cache
+
+
+def execute_cached(skill: Dict, args: List[str] = None, timeout: float = DEFAULT_TIMEOUT,
+                   use_cache: bool = True, cwd: Optional[str] = None) -> Tuple[SkillResult, bool]:
+    """
+    Execute a skill, serving cacheable skills from the result cache.
+
+    Returns (result, cache_hit). Only clean runs (exit code 0, no timeout) are stored.
+    """
+    cache = get_result_cache() if use_cache and is_cacheable(skill, args) else None
+    if cache is None:
+        return execute_skill(skill, args, timeout, cwd), False
+
+    start = time.perf_counter()
+    key = cache.key(skill, args, cwd)
+    result = cache.get(key)
+    if result is not None:
+        result.duration = time.perf_counter() - start
+        return result, True
+
+    result = execute_skill(skill, args, timeout, cwd)
+    if result.returncode == 0 and not result.timed_out:
+        cache.put(key, result)
+    return result, False
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+Gateway Scheduler
+Decides which queued tool call runs next when the gateway is busy.
+
+- A global budget caps calls running at once.
+- A skill may cap its own concurrency (`max_concurrency` in manifest.yaml);
+  calls beyond the cap wait without holding up calls to other skills.
+- Priority classes (`interactive` > `normal` > `batch`) are served strictly
+  in order, so interactive agents are not queued behind batch work.
+- Within a class, clients share the budget by weighted fair queuing
+  (start-time fair queuing), with each call costed at its skill's recent
+  mean duration, so a client hammering a heavy skill cannot starve others.
+
+Queue depth and wait times are available from Scheduler.stats().
+"""
+
+import time
+import asyncio
+import bisect
+import itertools
+from collections import defaultdict, deque
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, List, Optional
+
+try:
+    from core.timing import percentile
+except ImportError:
+    from timing import percentile
+
+PRIORITIES = ('interactive', 'normal', 'batch')
+DEFAULT_PRIORITY = 'normal'
+
+# Cost assumed for a skill before it has completed a run (seconds)
+_DEFAULT_COST = 1.0
+# Weight of the latest run in a skill's moving average duration
+_COST_ALPHA = 0.3
+# Wait times kept per priority class for the percentiles in stats()
+_WAIT_SAMPLES = 1000
+
+
+def normalize_priority(value) -> str:
+    """Map a manifest or per-call priority to a known class."""
+    value = str(value or DEFAULT_PRIORITY).strip().lower()
+    return value if value in PRIORITIES else DEFAULT_PRIORITY
+
+
+def parse_weights(spec: str) -> Dict[str, float]:
+    """Parse ASK_MCP_WEIGHTS-style 'client=2,other=0.5' into a dict."""
+    weights = {}
+    for item in (spec or '').split(','):
+        name, _, weight = item.partition('=')
+        try:
+            if name.strip() and float(weight) > 0:
+                weights[name.strip()] = float(weight)
+        except ValueError:
+            continue
+    return weights
+
+
+class _Entry:
+    """A call waiting for a slot."""
+
+    __slots__ = ('skill', 'client', 'priority', 'start_tag', 'seq', 'enqueued', 'future')
+
+    def __init__(self, skill, client, priority, start_tag, seq, future):
+        self.skill = skill
+        self.client = client
+        self.priority = priority
+        self.start_tag = start_tag
+        self.seq = seq
+        self.enqueued = time.perf_counter()
+        self.future = future
+
+    def __lt__(self, other):
+        return (self.start_tag, self.seq) < (other.start_tag, other.seq)
+
+
+class Scheduler:
+    """
+    Admission control for tool calls on one event loop.
+
+    budget: calls allowed to run at once.
+    limit_for(skill): the skill's own concurrency cap, or None for no cap.
+    weights: per-client share within a priority class (default 1.0).
+    """
+
+    def __init__(self, budget: int, limit_for: Callable[[str], Optional[int]] = lambda skill: None,
+                 weights: Optional[Dict[str, float]] = None):
+        self.budget = max(1, budget)
+        self.limit_for = limit_for
+        self.weights = weights or {}
+        self.running = 0
+        self._running_by_skill: Dict[str, int] = defaultdict(int)
+        self._queues: Dict[str, List[_Entry]] = {priority: [] for priority in PRIORITIES}
+        # Fair queuing state per class: virtual time and each client's last finish tag
+        self._virtual_time: Dict[str, float] = {priority: 0.0 for priority in PRIORITIES}
+        self._finish_tags: Dict[str, Dict[str, float]] = {priority: {} for priority in PRIORITIES}
+        self._cost: Dict[str, float] = {}
+        self._seq = itertools.count()
+        self._waits: Dict[str, deque] = {priority: deque(maxlen=_WAIT_SAMPLES) for priority in PRIORITIES}
+        self._completed: Dict[str, int] = defaultdict(int)
+        # Calls cancelled (client gave up) while still queued
+        self._abandoned: Dict[str, int] = defaultdict(int)
+
+    @asynccontextmanager
+    async def slot(self, skill: str, client: str = 'default', priority: str = DEFAULT_PRIORITY):
+        """Wait for permission to run `skill`, holding the slot for the block's duration."""
+        priority = normalize_priority(priority)
+        entry = self._enqueue(skill, client, priority)
+        self._dispatch()
+        try:
+            await entry.future
+        except BaseException:
+            if entry.future.done() and not entry.future.cancelled():
+                self._release(skill, None)  # granted just as the caller gave up
+            else:
+                self._queues[priority].remove(entry)
+                self._abandoned[priority] += 1
+            raise
+
+        self._waits[priority].append(time.perf_counter() - entry.enqueued)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._completed[priority] += 1
+            self._release(skill, time.perf_counter() - start)
+
+    def _enqueue(self, skill: str, client: str, priority: str) -> _Entry:
+        cost = self._cost.get(skill, _DEFAULT_COST)
+        finish_tags = self._finish_tags[priority]
+        start_tag = max(self._virtual_time[priority], finish_tags.get(client, 0.0))
+        finish_tags[client] = start_tag + cost / self.weights.get(client, 1.0)
+        entry = _Entry(skill, client, priority, start_tag, next(self._seq),
+                       asyncio.get_running_loop().create_future())
+        bisect.insort(self._queues[priority], entry)
+        return entry
+
+    def _has_room(self, skill: str) -> bool:
+        limit = self.limit_for(skill)
+        return not limit or self._running_by_skill[skill] < limit
+
+    def _dispatch(self):
+        """Grant slots to waiting calls while the budget allows."""
+        while self.running < self.budget:
+            entry = self._next_runnable()
+            if entry is None:
+                return
+            self._queues[entry.priority].remove(entry)
+            self._virtual_time[entry.priority] = entry.start_tag
+            self.running += 1
+            self._running_by_skill[entry.skill] += 1
+            entry.future.set_result(None)
+
+    def _next_runnable(self) -> Optional[_Entry]:
+        for priority in PRIORITIES:
+            for entry in self._queues[priority]:
+                if not entry.future.done() and self._has_room(entry.skill):
+                    return entry
+        return None
+
+    def _release(self, skill: str, duration: Optional[float]):
+        self.running -= 1
+        self._running_by_skill[skill] -= 1
+        if not self._running_by_skill[skill]:
+            del self._running_by_skill[skill]
+        if duration is not None:
+            previous = self._cost.get(skill)
+            self._cost[skill] = duration if previous is None else (
+                _COST_ALPHA * duration + (1 - _COST_ALPHA) * previous)
+        self._dispatch()
+
+    def stats(self) -> Dict:
+        """Running calls, queue depth and wait-time percentiles (ms) per priority class."""
+        queued_by_skill: Dict[str, int] = defaultdict(int)
+        for queue in self._queues.values():
+            for entry in queue:
+                queued_by_skill[entry.skill] += 1
+
+        classes = {}
+        for priority in PRIORITIES:
+            waits = list(self._waits[priority])
+            classes[priority] = {
+                'queued': len(self._queues[priority]),
+                'completed': self._completed[priority],
+                'abandoned': self._abandoned[priority],
+                'wait_p50_ms': round(percentile(waits, 50) * 1000, 1),
+                'wait_p95_ms': round(percentile(waits, 95) * 1000, 1),
+                'wait_max_ms': round(max(waits) * 1000, 1) if waits else 0.0,
+            }
+        return {
+            'budget': self.budget,
+            'running': self.running,
+            'queued': sum(len(queue) for queue in self._queues.values()),
+            'running_by_skill': dict(self._running_by_skill),
+            'queued_by_skill': dict(queued_by_skill),
+            'classes': classes,
+        }
@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""
+Gateway Shards
+Front-process side of the sharded MCP gateway (ASK_MCP_WORKERS): starts
+worker processes (core/shard_worker.py) that execute tool calls, while the
+front process keeps MCP framing, scheduling, coalescing and the result cache.
+
+Calls are routed by consistent hashing on the skill, so a skill keeps landing
+on the same worker and its loaded in-process modules, pool workers and caches
+stay warm there. Hashing uses bounded loads: a worker already holding more
+than its share of in-flight calls passes new ones on to the next worker on
+the ring, so one hot skill still spreads over every core.
+
+Protocol: one JSON message per line over each worker's stdin/stdout.
+    front -> worker  {"op": "call", "id": 1, "name": "...", "arguments": {...}, "progress": true}
+                     {"op": "cancel", "id": 1}
+                     {"op": "refresh"}
+    worker -> front  {"id": 1, "progress": "new stdout text"}
+                     {"id": 1, "observe": ["skill", "ok", 1234, 0.004]}
+                     {"id": 1, "text": "...", "cacheable": true, "outputs": [[uri, path, description]]}
+                     {"id": 1, "error": "..."}
+"""
+
+import os
+import sys
+import json
+import math
+import bisect
+import asyncio
+import hashlib
+import itertools
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+WORKER_SCRIPT = Path(__file__).resolve().parent / "shard_worker.py"
+
+# Ring points per worker; more points even out the share of keys per worker
+_REPLICAS = 64
+# A worker may hold this much more than the mean in-flight load before
+# calls hashed to it move on along the ring
+_LOAD_FACTOR = 1.25
+# Longest message line accepted from a worker (outputs are bounded well below)
+_MAX_MESSAGE_BYTES = 64 * 1024 * 1024
+# Seconds a worker gets to cancel its runs and exit after stdin closes
+_EXIT_GRACE = 5.0
+
+
+def worker_count(value) -> int:
+    """Workers for an ASK_MCP_WORKERS value: 'auto' means one per core, unset or 0 means none."""
+    value = str(value or '').strip().lower()
+    if value == 'auto':
+        return os.cpu_count() or 1
+    try:
+        return max(0, int(value))
+    except ValueError:
+        return 0
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.md5(key.encode('utf-8')).digest()[:8], 'big')
+
+
+class HashRing:
+    """Consistent hash ring over worker indexes, with bounded loads."""
+
+    def __init__(self, nodes: int, replicas: int = _REPLICAS):
+        self.nodes = max(1, nodes)
+        points = sorted((_hash(f"worker-{node}#{replica}"), node)
+                        for node in range(self.nodes) for replica in range(replicas))
+        self._hashes = [point for point, _ in points]
+        self._owners = [node for _, node in points]
+
+    def lookup(self, key: str, loads: Optional[List[int]] = None) -> int:
+        """
+        The worker owning key. With loads (in-flight calls per worker), the
+        first worker clockwise from the key whose load is under the cap.
+        """
+        start = bisect.bisect(self._hashes, _hash(key))
+        if not loads:
+            return self._owners[start % len(self._owners)]
+        cap = math.ceil((sum(loads) + 1) * _LOAD_FACTOR / self.nodes)
+        for offset in range(len(self._owners)):
+            node = self._owners[(start + offset) % len(self._owners)]
+            if loads[node] < cap:
+                return node
+        return self._owners[start % len(self._owners)]
+
+
+class _Call:
+    """A call waiting for its worker's reply."""
+
+    __slots__ = ('future', 'on_progress', 'on_observe')
+
+    def __init__(self, future, on_progress, on_observe):
+        self.future = future
+        self.on_progress = on_progress
+        self.on_observe = on_observe
+
+
+class _Shard:
+    """Handle on one worker process."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.proc = None
+        self.reader = None
+        self.calls: Dict[int, _Call] = {}
+        self.completed = 0
+
+    def alive(self) -> bool:
+        return self.proc is not None and self.proc.returncode is None
+
+
+class ShardPool:
+    """Worker processes executing tool calls for the front gateway process."""
+
+    def __init__(self, workers: int, skills_dir: Path, env: Optional[Dict[str, str]] = None):
+        self.ring = HashRing(workers)
+        self.skills_dir = Path(skills_dir)
+        self.env = dict(env if env is not None else os.environ)
+        self.env.pop('ASK_MCP_WORKERS', None)
+        self.env['PYTHONIOENCODING'] = 'utf-8'
+        self.shards = [_Shard(index) for index in range(workers)]
+        self.restarts = 0
+        self._ids = itertools.count(1)
+
+    async def start(self):
+        """Start every worker (each loads the skills and warms its own pool)."""
+        for shard in self.shards:
+            await self._spawn(shard)
+
+    async def _spawn(self, shard: _Shard):
+        shard.proc = await asyncio.create_subprocess_exec(
+            sys.executable, str(WORKER_SCRIPT), str(self.skills_dir),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            env=self.env,
+            limit=_MAX_MESSAGE_BYTES,
+        )
+        shard.reader = asyncio.ensure_future(self._read(shard, shard.proc))
+
+    async def _read(self, shard: _Shard, proc):
+        """Dispatch one worker's messages until it exits, then fail its pending calls."""
+        while True:
+            line = await proc.stdout.readline()
+            if not line:
+                break
+            try:
+                message = json.loads(line)
+            except ValueError:
+                continue
+            call = shard.calls.get(message.get('id'))
+            if call is None:
+                continue  # reply to a call the front already gave up on
+            if 'progress' in message:
+                if call.on_progress is not None:
+                    await call.on_progress('stdout', message['progress'])
+            elif 'observe' in message:
+                if call.on_observe is not None:
+                    call.on_observe(*message['observe'])
+            else:
+                del shard.calls[message['id']]
+                shard.completed += 1
+                if not call.future.done():
+                    call.future.set_result(message)
+
+        await proc.wait()
+        for call in shard.calls.values():
+            if not call.future.done():
+                call.future.set_exception(RuntimeError(
+                    f"gateway worker {shard.index} exited with code {proc.returncode}"))
+        shard.calls.clear()
+
+    async def call(self, key: str, name: str, arguments: dict,
+                   on_progress: Optional[Callable[[str, str], Awaitable[None]]] = None,
+                   on_observe: Optional[Callable] = None) -> Dict:
+        """
+        Run a tool call on the worker owning key and return its reply message.
+        Cancelling the awaiting task cancels the call in the worker.
+        """
+        shard = self.shards[self.ring.lookup(key, [len(s.calls) for s in self.shards])]
+        if not shard.alive():
+            self.restarts += 1
+            print(f"Warning: restarting gateway worker {shard.index}", file=sys.stderr)
+            await self._spawn(shard)
+
+        call_id = next(self._ids)
+        call = _Call(asyncio.get_running_loop().create_future(), on_progress, on_observe)
+        shard.calls[call_id] = call
+        try:
+            await self._send(shard, {'op': 'call', 'id': call_id, 'name': name, 'arguments': arguments,
+                                     'progress': on_progress is not None})
+            return await call.future
+        except asyncio.CancelledError:
+            if shard.calls.pop(call_id, None) is not None:
+                await asyncio.shield(self._send(shard, {'op': 'cancel', 'id': call_id}))
+            raise
+        finally:
+            shard.calls.pop(call_id, None)
+
+    async def _send(self, shard: _Shard, message: dict):
+        if not shard.alive():
+            return
+        try:
+            shard.proc.stdin.write(json.dumps(message).encode('utf-8') + b'\n')
+            await shard.proc.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the reader reports the exit to pending calls
+
+    def refresh(self):
+        """Tell every worker to reload changed skills (call on the event loop)."""
+        for shard in self.shards:
+            asyncio.ensure_future(self._send(shard, {'op': 'refresh'}))
+
+    def stats(self) -> Dict:
+        return {
+            'workers': len(self.shards),
+            'in_flight': [len(shard.calls) for shard in self.shards],
+            'completed': [shard.completed for shard in self.shards],
+            'restarts': self.restarts,
+        }
+
+    async def close(self):
+        """Close the workers' stdin (they cancel their runs and exit); kill stragglers."""
+        for shard in self.shards:
+            if shard.alive():
+                shard.proc.stdin.close()
+        for shard in self.shards:
+            if shard.proc is None:
+                continue
+            try:
+                await asyncio.wait_for(shard.proc.wait(), _EXIT_GRACE)
+            except asyncio.TimeoutError:
+                shard.proc.kill()
+                await shard.proc.wait()
+            if shard.reader is not None:
+                await asyncio.gather(shard.reader, return_exceptions=True)
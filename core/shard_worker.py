@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gateway Shard Worker
+Executes tool calls for the front process of a sharded MCP gateway (see
+core/shard_pool.py for the protocol). Started by ShardPool with the skills
+directory as its only argument; not meant to be run by hand.
+
+Each worker has its own interpreter, so in-process skills, pipelines and
+output handling run in parallel across workers instead of sharing one GIL.
+"""
+
+import io
+import os
+import sys
+import json
+import signal
+import asyncio
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from core.mcp_gateway import SkillMCPServer, _loop_stdin
+except ImportError:
+    from mcp_gateway import SkillMCPServer, _loop_stdin
+
+# The front-process request being executed by the current task
+_request = contextvars.ContextVar('shard_request', default=None)
+
+
+class ShardServer(SkillMCPServer):
+    """
+    The gateway's execution path without an MCP session: progress and
+    metrics observations are forwarded to the front process instead.
+    """
+
+    def __init__(self, skills_dir: str, protocol):
+        self.protocol = protocol
+        # Pipelines report from executor threads
+        self._send_lock = threading.Lock()
+        super().__init__(skills_dir, workers=0)
+
+    def send(self, message: dict):
+        line = json.dumps(message) + '\n'
+        with self._send_lock:
+            self.protocol.write(line)
+            self.protocol.flush()
+
+    def _progress_reporter(self):
+        request = _request.get()
+        if request is None or not request.get('progress'):
+            return None
+        sent = 0
+
+        async def report(stream_name: str, text: str):
+            nonlocal sent
+            # The front process applies the same cap; stop sending early
+            if stream_name != 'stdout' or sent >= self.output_limit:
+                return
+            text = text[:self.output_limit - sent]
+            sent += len(text)
+            self.send({'id': request['id'], 'progress': text})
+
+        return report
+
+    def _observe(self, tool: str, status: str, output_size: int = None, spawn_time: float = None):
+        request = _request.get()
+        if request is None:
+            return super()._observe(tool, status, output_size, spawn_time)
+        self.send({'id': request['id'], 'observe': [tool, status, output_size, spawn_time]})
+
+
+async def _handle(server: ShardServer, request: dict):
+    _request.set(request)
+    try:
+        contents, cacheable = await server._call_tool(request['name'], request.get('arguments') or {})
+        reply = {'text': contents[0].text, 'cacheable': cacheable}
+    except asyncio.CancelledError:
+        return  # cancelled by the front process, which no longer waits for a reply
+    except Exception as e:
+        reply = {'error': str(e)}
+    # Spill files of this and any other finished call move to the front process
+    reply.update(id=request['id'], outputs=server.outputs.take())
+    server.send(reply)
+
+
+async def _lines():
+    """stdin lines, read on the loop where possible."""
+    stdin = await _loop_stdin()
+    if stdin is not None:
+        async for line in stdin:
+            yield line
+        return
+    loop = asyncio.get_running_loop()
+    while True:
+        line = await loop.run_in_executor(None, sys.stdin.readline)
+        if not line:
+            return
+        yield line
+
+
+async def serve(server: ShardServer):
+    """Serve requests until the front process closes stdin, then cancel what is left."""
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=server.max_concurrency,
+                                                 thread_name_prefix='ask-shard'))
+    tasks = {}
+    async for line in _lines():
+        try:
+            request = json.loads(line)
+        except ValueError:
+            continue
+        op = request.get('op')
+        if op == 'call':
+            task = asyncio.ensure_future(_handle(server, request))
+            tasks[request['id']] = task
+            task.add_done_callback(lambda _, call_id=request['id']: tasks.pop(call_id, None))
+        elif op == 'cancel':
+            task = tasks.get(request.get('id'))
+            if task is not None:
+                task.cancel()
+        elif op == 'refresh':
+            await loop.run_in_executor(None, server.refresh)
+
+    # Cancelling kills the skills' process groups
+    for task in list(tasks.values()):
+        task.cancel()
+    await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+
+def main():
+    """Serve the front process until it closes stdin."""
+    # Keep a private handle on the protocol channel and point fd 1 at stderr,
+    # so nothing a skill (or an import) prints can corrupt the messages.
+    protocol = io.open(os.dup(1), 'w', encoding='utf-8', newline='\n')
+    os.dup2(2, 1)
+    sys.stdout = sys.stderr
+    # Ctrl-C reaches the whole process group; the front process decides when to stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    server = ShardServer(sys.argv[1] if len(sys.argv) > 1 else "skills", protocol)
+    try:
+        asyncio.run(serve(server))
+    finally:
+        server.outputs.close()
+
+
+if __name__ == "__main__":
+    main()
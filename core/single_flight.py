@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Single-Flight Call Coalescing
+When several callers ask for the same work at the same moment, run it once
+and hand every caller the same result. Used by the MCP gateway so a burst of
+identical tool calls (same skill, same arguments) spawns one skill process.
+
+Only calls that overlap in time are merged; nothing is cached afterwards.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key on one event loop."""
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        # Callers awaiting each execution
+        self._waiters: Dict[asyncio.Future, int] = {}
+        self.calls = 0
+        self.executions = 0
+
+    async def do(self, key: Hashable, run: Callable[[], Awaitable]):
+        """
+        Await run() for key, or join an identical call already in flight.
+
+        A waiter that is cancelled leaves the shared execution running for
+        the others; the execution is only cancelled when no waiters remain.
+        """
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(run())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._forget(key, task))
+
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters[task] == 1 and not task.done():
+                task.cancel()
+            raise
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+
+    def _forget(self, key: Hashable, task: asyncio.Future):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    def stats(self) -> Dict:
+        """Calls seen, executions actually run and the share of calls coalesced."""
+        coalesced = self.calls - self.executions
+        return {
+            'calls': self.calls,
+            'executions': self.executions,
+            'coalesced': coalesced,
+            'in_flight': len(self._inflight),
+            'dedup_ratio': round(coalesced / self.calls, 4) if self.calls else 0.0,
+        }
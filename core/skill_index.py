@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""
+Compiled Skill Index
+Caches parsed skill manifests on disk so startup only re-parses the
+manifests that changed since the last run. Manifests that do need parsing
+are read with libyaml's C loader when PyYAML was built with it, and large
+batches are parsed concurrently.
+"""
+
+import os
+import time
+import pickle
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    from core.paths import get_cache_dir
+except ImportError:
+    from paths import get_cache_dir
+
+# Bump whenever the on-disk layout of the index changes
+INDEX_VERSION = 1
+
+# Manifests modified this recently are not cached: a second write within the
+# same filesystem timestamp tick would otherwise go unnoticed.
+_RACY_WINDOW_NS = 2_000_000_000
+
+# Batches smaller than this are parsed serially; pool start-up would dominate
+PARALLEL_THRESHOLD = 64
+# Batches at least this large go to a process pool, since YAML construction
+# holds the GIL; override with ASK_PARSE_PROCESSES (0 disables processes)
+PROCESS_THRESHOLD = 2000
+
+_loader = None
+
+
+def yaml_loader():
+    """yaml.CSafeLoader when libyaml is available, else the pure-Python SafeLoader."""
+    global _loader
+    if _loader is None:
+        import yaml
+        _loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    return _loader
+
+
+def parse_manifest(manifest_path: Path) -> Dict:
+    """Parse a single manifest.yaml file."""
+    import yaml
+
+    with open(manifest_path, 'rb') as f:
+        data = f.read()
+    return yaml.load(data.decode('utf-8'), Loader=yaml_loader())
+
+
+def _parse_for_pool(manifest_path: Path) -> Tuple[Optional[Dict], Optional[str]]:
+    """Process-pool worker: exceptions are returned as text so they always pickle."""
+    try:
+        return parse_manifest(manifest_path), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def _process_threshold() -> int:
+    """PROCESS_THRESHOLD, or ASK_PARSE_PROCESSES when that is a valid integer."""
+    try:
+        return max(0, int(os.environ['ASK_PARSE_PROCESSES']))
+    except (KeyError, ValueError):
+        return PROCESS_THRESHOLD
+
+
+def parse_manifests(paths: Sequence[Path], strategy: str = 'auto') -> List[Tuple[Optional[Dict], Optional[Exception]]]:
+    """
+    Parse many manifests, returning (manifest, error) per path in order.
+
+    strategy is 'serial', 'threads', 'processes' or 'auto', which picks by
+    batch size: serial below PARALLEL_THRESHOLD, a process pool from
+    PROCESS_THRESHOLD on (when more than one CPU is available), threads
+    in between.
+    """
+    paths = list(paths)
+    cpus = os.cpu_count() or 1
+    if strategy == 'auto':
+        process_threshold = _process_threshold()
+        if len(paths) < PARALLEL_THRESHOLD:
+            strategy = 'serial'
+        elif process_threshold and len(paths) >= process_threshold and cpus > 1:
+            strategy = 'processes'
+        else:
+            strategy = 'threads'
+
+    if strategy == 'processes':
+        from concurrent.futures import ProcessPoolExecutor
+        try:
+            with ProcessPoolExecutor(max_workers=min(cpus, 8)) as pool:
+                chunksize = max(1, len(paths) // (min(cpus, 8) * 4))
+                return [(manifest, ValueError(error) if error else None)
+                        for manifest, error in pool.map(_parse_for_pool, paths, chunksize=chunksize)]
+        except (OSError, RuntimeError):
+            # No process support (e.g. restricted sandbox): fall back to threads
+            strategy = 'threads'
+
+    def parse(path: Path):
+        try:
+            return parse_manifest(path), None
+        except Exception as e:
+            return None, e
+
+    if strategy == 'threads':
+        from concurrent.futures import ThreadPoolExecutor
+        yaml_loader()  # import yaml once up front, not in every worker
+        with ThreadPoolExecutor(max_workers=min(32, cpus + 4)) as pool:
+            return list(pool.map(parse, paths))
+    return [parse(path) for path in paths]
+
+
+class SkillIndex:
+    """On-disk index of skill manifests keyed by manifest mtime and size."""
+
+    def __init__(self, skills_dir: Path, index_path: Optional[Path] = None):
+        self.skills_dir = Path(skills_dir)
+        self.index_path = index_path or self._default_index_path()
+
+    def _default_index_path(self) -> Optional[Path]:
+        """One index file per skills directory inside the user cache."""
+        if os.environ.get('ASK_NO_INDEX'):
+            return None
+        try:
+            index_dir = get_cache_dir() / "index"
+            index_dir.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            return None
+        key = hashlib.sha1(str(self.skills_dir.resolve()).encode('utf-8')).hexdigest()[:16]
+        return index_dir / f"skills-{key}.pickle"
+
+    def _read(self) -> Dict[str, Dict]:
+        """Read cached entries, discarding unreadable or outdated indexes."""
+        if self.index_path is None:
+            return {}
+        try:
+            with open(self.index_path, 'rb') as f:
+                data = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get('version') != INDEX_VERSION:
+            return {}
+        if data.get('skills_dir') != str(self.skills_dir.resolve()):
+            return {}
+        return data.get('entries', {})
+
+    def _write(self, entries: Dict[str, Dict]):
+        """Atomically replace the index file; failures are not fatal."""
+        if self.index_path is None:
+            return
+        data = {
+            'version': INDEX_VERSION,
+            'skills_dir': str(self.skills_dir.resolve()),
+            'entries': entries,
+        }
+        tmp_path = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.index_path)
+        except OSError:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+
+    def scan(self) -> List[Tuple[str, Path, os.stat_result]]:
+        """Cheap stat pass: (folder name, manifest path, manifest stat) per skill."""
+        found = []
+        try:
+            entries = list(os.scandir(self.skills_dir))
+        except OSError:
+            return found
+
+        for entry in entries:
+            try:
+                if not entry.is_dir():
+                    continue
+            except OSError:
+                continue
+            manifest_path = Path(entry.path) / "manifest.yaml"
+            try:
+                st = manifest_path.stat()
+            except OSError:
+                continue
+            found.append((entry.name, manifest_path, st))
+        found.sort(key=lambda item: item[0])
+        return found
+
+    def load(self, strategy: str = 'auto') -> Tuple[Dict[str, Dict], List[Tuple[str, Exception]]]:
+        """
+        Return ({folder name: manifest}, [(folder name, error), ...]).
+
+        Only manifests whose mtime or size changed since the last run are
+        parsed (see parse_manifests for strategy); the index is rewritten
+        only when something changed.
+        """
+        cached = self._read()
+        entries = {}
+        manifests = {}
+        errors = []
+        dirty = False
+        now_ns = time.time_ns()
+        stale = []
+        found = self.scan()
+
+        for name, manifest_path, st in found:
+            entry = cached.get(name)
+            if entry and entry['mtime_ns'] == st.st_mtime_ns and entry['size'] == st.st_size:
+                entries[name] = entry
+                manifests[name] = entry['manifest']
+            else:
+                stale.append((name, manifest_path, st))
+
+        parsed = parse_manifests([path for _, path, _ in stale], strategy)
+        for (name, manifest_path, st), (manifest, error) in zip(stale, parsed):
+            if error is not None:
+                errors.append((name, error))
+                dirty = dirty or name in cached
+                continue
+
+            manifests[name] = manifest
+            if now_ns - st.st_mtime_ns > _RACY_WINDOW_NS:
+                entries[name] = {
+                    'mtime_ns': st.st_mtime_ns,
+                    'size': st.st_size,
+                    'manifest': manifest,
+                }
+                dirty = True
+
+        if dirty or set(cached) != set(entries):
+            self._write(entries)
+
+        # Keep discovery order stable (sorted by folder name)
+        manifests = {name: manifests[name] for name, _, _ in found if name in manifests}
+        return manifests, errors
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+Startup Profiler
+Runs an ask command under `python -X importtime` and summarises where
+interpreter start-up and import time is spent.
+"""
+
+import os
+import sys
+import time
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ASK_SCRIPT = Path(__file__).resolve().parent / "ask.py"
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """Parse -X importtime output into (module, self_us, cumulative_us, depth)."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        try:
+            self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+            self_us = int(self_us.strip())
+            cumulative_us = int(cumulative_us.strip())
+        except ValueError:
+            # Header line ("self [us] | cumulative | imported package")
+            continue
+        depth = (len(name) - len(name.lstrip(' '))) // 2
+        rows.append((name.strip(), self_us, cumulative_us, depth))
+    return rows
+
+
+def package_totals(rows: List[Tuple[str, int, int, int]]) -> Dict[str, int]:
+    """Sum self time per top-level package."""
+    totals = {}
+    for name, self_us, _, _ in rows:
+        package = name.split('.')[0]
+        totals[package] = totals.get(package, 0) + self_us
+    return totals
+
+
+def profile_startup(argv: List[str], top: int = 15) -> int:
+    """
+    Profile `ask <argv...>` start-up; with no argv only `import core.ask` is profiled.
+    """
+    if getattr(sys, 'frozen', False):
+        print("Startup profiling is not available in the standalone executable.")
+        return 1
+
+    if argv:
+        cmd = [sys.executable, '-X', 'importtime', str(ASK_SCRIPT)] + list(argv)
+        label = "ask " + " ".join(argv)
+    else:
+        cmd = [sys.executable, '-X', 'importtime', '-c',
+               f"import sys; sys.path.insert(0, {str(PROJECT_ROOT)!r}); import core.ask"]
+        label = "import core.ask"
+
+    start = time.perf_counter()
+    result = subprocess.run(
+        cmd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        encoding='utf-8',
+        errors='replace',
+        env=dict(os.environ, PYTHONUTF8='1'),
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    rows = parse_importtime(result.stderr)
+    import_ms = sum(self_us for _, self_us, _, _ in rows) / 1000
+
+    print(f"Startup profile: {label}")
+    print(f"  wall time      {wall_ms:8.1f} ms  (exit code {result.returncode})")
+    print(f"  import time    {import_ms:8.1f} ms  ({len(rows)} modules)")
+    print(f"  other          {max(wall_ms - import_ms, 0.0):8.1f} ms  (interpreter start-up and command work)")
+
+    print(f"\nTop {top} top-level imports by cumulative time:")
+    print(f"  {'cumulative ms':>13}  {'self ms':>8}  module")
+    top_level = sorted((r for r in rows if r[3] == 0), key=lambda r: r[2], reverse=True)
+    for name, self_us, cumulative_us, _ in top_level[:top]:
+        print(f"  {cumulative_us / 1000:13.1f}  {self_us / 1000:8.1f}  {name}")
+
+    print(f"\nTop {top} packages by self time:")
+    totals = sorted(package_totals(rows).items(), key=lambda item: item[1], reverse=True)
+    for package, self_us in totals[:top]:
+        print(f"  {self_us / 1000:13.1f}  {package}")
+
+    errors = [line for line in result.stderr.splitlines() if not line.startswith('import time:')]
+    if result.returncode != 0 and errors:
+        print("\nCommand stderr:")
+        print("\n".join(errors[-20:]))
+
+    return 0
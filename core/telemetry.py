@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+Execution Telemetry
+Records one row per skill run (wall time, CPU time, peak RSS, exit code,
+output size) in a SQLite database shared by the CLI, GUI and MCP gateway,
+and answers the latency/throughput queries behind `ask stats`.
+
+The database uses WAL journaling so concurrent writers from several
+front-ends do not block readers. Set ASK_TELEMETRY=0 to disable recording.
+"""
+
+import os
+import re
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    from core.paths import get_cache_dir
+    from core.timing import summarize
+except ImportError:
+    from paths import get_cache_dir
+    from timing import summarize
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    skill TEXT NOT NULL,
+    source TEXT NOT NULL,
+    mode TEXT,
+    wall_ms REAL NOT NULL,
+    cpu_ms REAL,
+    max_rss_kb INTEGER,
+    exit_code INTEGER NOT NULL,
+    timed_out INTEGER NOT NULL DEFAULT 0,
+    cached INTEGER NOT NULL DEFAULT 0,
+    output_size INTEGER
+);
+CREATE INDEX IF NOT EXISTS runs_skill_ts ON runs (skill, ts);
+CREATE INDEX IF NOT EXISTS runs_ts ON runs (ts);
+"""
+
+_DURATION_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+
+
+def parse_window(text: str) -> float:
+    """Parse a time window such as '90s', '15m', '24h' or '7d' into seconds."""
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([smhdw]?)\s*', text or '')
+    if not match:
+        raise ValueError(f"Invalid time window: {text!r} (expected e.g. 30m, 24h, 7d)")
+    return float(match.group(1)) * _DURATION_UNITS[match.group(2) or 's']
+
+
+class TelemetryStore:
+    """SQLite-backed store of per-run execution records."""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = Path(db_path) if db_path else get_cache_dir() / "telemetry.sqlite3"
+        self._local = threading.local()
+        self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Per-thread connection (sqlite3 connections are not shared across threads)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def record(self, skill: str, source: str, wall_ms: float, exit_code: int,
+               cpu_ms: Optional[float] = None, max_rss_kb: Optional[int] = None,
+               output_size: Optional[int] = None, timed_out: bool = False,
+               cached: bool = False, mode: Optional[str] = None, ts: Optional[float] = None):
+        """Append one run record."""
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT INTO runs (ts, skill, source, mode, wall_ms, cpu_ms, max_rss_kb,"
+                " exit_code, timed_out, cached, output_size) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (ts if ts is not None else time.time(), skill, source, mode, wall_ms, cpu_ms,
+                 max_rss_kb, exit_code, int(timed_out), int(cached), output_size),
+            )
+
+    def query_stats(self, since: float, skill: Optional[str] = None,
+                    source: Optional[str] = None) -> List[Dict]:
+        """
+        Per-skill statistics for runs recorded in the last `since` seconds.
+
+        Each row has run/failure/timeout/cache-hit counts, wall-time
+        percentiles (ms), mean CPU time, peak RSS, mean output size and
+        throughput in runs per minute over the window. Runs without a measured
+        value (e.g. passthrough runs, whose output size is NULL) are left out
+        of that column's aggregate.
+        """
+        now = time.time()
+        query = "SELECT skill, wall_ms, cpu_ms, max_rss_kb, exit_code, timed_out, cached, output_size FROM runs WHERE ts >= ?"
+        params = [now - since]
+        if skill:
+            query += " AND skill = ?"
+            params.append(skill)
+        if source:
+            query += " AND source = ?"
+            params.append(source)
+
+        grouped: Dict[str, List[tuple]] = {}
+        for row in self._connect().execute(query, params):
+            grouped.setdefault(row[0], []).append(row)
+
+        minutes = since / 60.0
+        stats = []
+        for name in sorted(grouped):
+            rows = grouped[name]
+            latency = summarize([r[1] for r in rows])
+            cpu = [r[2] for r in rows if r[2] is not None]
+            rss = [r[3] for r in rows if r[3] is not None]
+            output = [r[7] for r in rows if r[7] is not None]
+            stats.append({
+                'skill': name,
+                'runs': len(rows),
+                'failures': sum(1 for r in rows if r[4] != 0),
+                'timeouts': sum(1 for r in rows if r[5]),
+                'cache_hits': sum(1 for r in rows if r[6]),
+                'p50_ms': round(latency['p50'], 3),
+                'p95_ms': round(latency['p95'], 3),
+                'p99_ms': round(latency['p99'], 3),
+                'mean_cpu_ms': round(sum(cpu) / len(cpu), 3) if cpu else None,
+                'max_rss_kb': max(rss) if rss else None,
+                'mean_output_size': round(sum(output) / len(output)) if output else None,
+                'runs_per_min': round(len(rows) / minutes, 3) if minutes > 0 else 0.0,
+            })
+        return stats
+
+    def prune(self, older_than: float):
+        """Delete records older than `older_than` seconds."""
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM runs WHERE ts < ?", (time.time() - older_than,))
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_telemetry() -> Optional[TelemetryStore]:
+    """Shared telemetry store, or None when disabled (ASK_TELEMETRY=0) or unavailable."""
+    global _store
+    if os.environ.get('ASK_TELEMETRY', '1').lower() in ('0', 'false', 'no', 'off'):
+        return None
+    with _store_lock:
+        if _store is None:
+            try:
+                _store = TelemetryStore()
+            except (OSError, sqlite3.Error):
+                return None
+    return _store
+
+
+def record_result(skill_name: str, source: str, result, cached: bool = False,
+                  mode: Optional[str] = None):
+    """
+    Record a SkillResult. Telemetry is best-effort: a locked or unwritable
+    database never fails the run being measured.
+    """
+    store = get_telemetry()
+    if store is None:
+        return
+    try:
+        store.record(
+            skill=skill_name,
+            source=source,
+            mode=mode,
+            wall_ms=result.duration * 1000,
+            cpu_ms=result.cpu_time * 1000 if result.cpu_time is not None else None,
+            max_rss_kb=result.max_rss_kb,
+            exit_code=result.returncode,
+            timed_out=result.timed_out,
+            cached=cached,
+            output_size=result.output_size,
+        )
+    except sqlite3.Error:
+        pass
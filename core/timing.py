@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""
+Latency statistics helpers shared by batch runs, benchmarks and stats.
+"""
+
+import math
+from typing import Dict, Sequence
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of values (0.0 for an empty sequence)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize(values: Sequence[float]) -> Dict[str, float]:
+    """Count, mean and p50/p95/p99/max of a list of latencies."""
+    if not values:
+        return {'count': 0, 'mean': 0.0, 'p50': 0.0, 'p95': 0.0, 'p99': 0.0, 'max': 0.0}
+    ordered = sorted(values)
+    return {
+        'count': len(ordered),
+        'mean': sum(ordered) / len(ordered),
+        'p50': percentile(ordered, 50),
+        'p95': percentile(ordered, 95),
+        'p99': percentile(ordered, 99),
+        'max': ordered[-1],
+    }
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+TTL Cache
+In-memory cache of tool output for skills that declare `cache_ttl` (seconds)
+in manifest.yaml, typically skills backed by remote APIs. Used by the MCP
+gateway so bursts of agent calls are answered from memory.
+
+- An entry is fresh for cache_ttl seconds, then stale for up to another
+  `cache_stale` seconds (default: cache_ttl): stale entries are still
+  served while the caller refreshes them in the background.
+- Bounded by entry count and total size, evicting least recently used.
+- Optionally saved to disk on shutdown and reloaded on start.
+"""
+
+import os
+import json
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Bump to ignore caches persisted by older versions
+CACHE_VERSION = 1
+
+
+def cache_policy(manifest: Dict) -> Optional[Tuple[float, float]]:
+    """(ttl, stale window) from a manifest, or None when the skill is not TTL-cached."""
+    try:
+        ttl = float(manifest.get('cache_ttl') or 0)
+        stale = float(manifest.get('cache_stale', ttl) or 0)
+    except (TypeError, ValueError):
+        return None
+    if ttl <= 0:
+        return None
+    return ttl, max(0.0, stale)
+
+
+class _Entry:
+    __slots__ = ('value', 'size', 'created', 'ttl', 'stale')
+
+    def __init__(self, value: str, created: float, ttl: float, stale: float):
+        self.value = value
+        self.size = len(value.encode('utf-8'))
+        self.created = created
+        self.ttl = ttl
+        self.stale = stale
+
+
+class TTLCache:
+    """Size- and count-bounded LRU map of key -> text with per-entry TTLs."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES,
+                 path: Optional[Path] = None):
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max_bytes
+        self.path = Path(path) if path else None
+        self._entries: 'OrderedDict[str, _Entry]' = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Tuple[str, bool]]:
+        """(value, fresh) for a usable entry, else None. Expired entries are dropped."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = time.time() - entry.created
+            if age < entry.ttl + entry.stale:
+                self._entries.move_to_end(key)
+                fresh = age < entry.ttl
+                if fresh:
+                    self.hits += 1
+                else:
+                    self.stale_hits += 1
+                return entry.value, fresh
+            self._remove(key)
+        self.misses += 1
+        return None
+
+    def put(self, key: str, value: str, ttl: float, stale: float = 0.0, created: Optional[float] = None):
+        """Store value for ttl seconds (+ stale window), evicting LRU entries past the bounds."""
+        entry = _Entry(value, time.time() if created is None else created, ttl, stale)
+        if entry.size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = entry
+        self.bytes += entry.size
+        while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _remove(self, key: str):
+        self.bytes -= self._entries.pop(key).size
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self.bytes,
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_ratio': round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+    def load(self):
+        """Restore entries saved by save(), skipping any that expired meanwhile."""
+        if self.path is None:
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != CACHE_VERSION:
+            return
+        now = time.time()
+        for key, value, created, ttl, stale in data.get('entries', []):
+            if now - created < ttl + stale:
+                self.put(key, value, ttl, stale, created=created)
+
+    def save(self):
+        """Write unexpired entries to disk (atomically), oldest use first."""
+        if self.path is None:
+            return
+        now = time.time()
+        entries = [[key, e.value, e.created, e.ttl, e.stale] for key, e in self._entries.items()
+                   if now - e.created < e.ttl + e.stale]
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': CACHE_VERSION, 'entries': entries}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
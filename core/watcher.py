@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+Skill Directory Watcher
+Notices skills being added, edited or removed so long-running processes
+(`ask serve`, the MCP gateway) can refresh their registry without a
+restart. Uses inotify on Linux and falls back to polling manifest stats
+elsewhere, or when ASK_WATCH=poll.
+"""
+
+import os
+import sys
+import time
+import select
+import struct
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+try:
+    from core.skill_index import SkillIndex
+except ImportError:
+    from skill_index import SkillIndex
+
+# Changes arriving within this window are reported as one
+DEBOUNCE_SECONDS = 0.2
+DEFAULT_POLL_INTERVAL = 2.0
+
+_IN_MODIFY = 0x002
+_IN_ATTRIB = 0x004
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_DELETE_SELF = 0x400
+_IN_Q_OVERFLOW = 0x4000
+_IN_ISDIR = 0x40000000
+_WATCH_MASK = (_IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO
+               | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF)
+_EVENT = struct.Struct('iIII')
+
+
+class _Inotify:
+    """Minimal ctypes binding for the inotify calls the watcher needs."""
+
+    def __init__(self):
+        import ctypes
+        import ctypes.util
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.paths: Dict[int, Path] = {}
+
+    def add_watch(self, path: Path):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(str(path)), _WATCH_MASK)
+        if wd >= 0:
+            self.paths[wd] = path
+
+    def read_events(self):
+        """Yield (directory, mask, name) for every queued event."""
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset:offset + length].rstrip(b'\0').decode('utf-8', 'surrogateescape')
+            offset += length
+            yield self.paths.get(wd), mask, name
+
+    def close(self):
+        os.close(self.fd)
+
+
+class SkillWatcher:
+    """
+    Background thread calling on_change() after skills_dir changes.
+
+    The callback receives no arguments: consumers re-run their (cheap,
+    stat-based) SkillIndex load and diff the result against their registry.
+    """
+
+    def __init__(self, skills_dir: Path, on_change: Callable[[], None],
+                 poll_interval: float = DEFAULT_POLL_INTERVAL):
+        self.skills_dir = Path(skills_dir)
+        self.on_change = on_change
+        self.poll_interval = poll_interval
+        self.backend: Optional[str] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'SkillWatcher':
+        inotify = None
+        if sys.platform.startswith('linux') and os.environ.get('ASK_WATCH') != 'poll':
+            try:
+                inotify = _Inotify()
+            except (OSError, AttributeError):
+                inotify = None
+        self.backend = 'inotify' if inotify else 'poll'
+        target = (lambda: self._run_inotify(inotify)) if inotify else self._run_polling
+        self._thread = threading.Thread(target=target, name='ask-skill-watcher', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _notify(self):
+        try:
+            self.on_change()
+        except Exception as e:
+            print(f"Warning: skill reload failed: {e}", file=sys.stderr)
+
+    def _watch_tree(self, inotify: _Inotify):
+        inotify.add_watch(self.skills_dir)
+        try:
+            for entry in os.scandir(self.skills_dir):
+                if entry.is_dir():
+                    inotify.add_watch(Path(entry.path))
+        except OSError:
+            pass
+
+    def _run_inotify(self, inotify: _Inotify):
+        try:
+            self._watch_tree(inotify)
+            while not self._stop.is_set():
+                ready, _, _ = select.select([inotify.fd], [], [], 0.5)
+                if not ready:
+                    continue
+                # Collect the burst an editor or `git checkout` produces
+                deadline = time.monotonic() + DEBOUNCE_SECONDS
+                while True:
+                    for directory, mask, name in inotify.read_events():
+                        if mask & _IN_Q_OVERFLOW:
+                            self._watch_tree(inotify)
+                        elif directory == self.skills_dir and mask & _IN_ISDIR and mask & (_IN_CREATE | _IN_MOVED_TO):
+                            inotify.add_watch(self.skills_dir / name)
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not select.select([inotify.fd], [], [], remaining)[0]:
+                        break
+                self._notify()
+        finally:
+            inotify.close()
+
+    def _signature(self):
+        return {name: (st.st_mtime_ns, st.st_size)
+                for name, _, st in SkillIndex(self.skills_dir, index_path=None).scan()}
+
+    def _run_polling(self):
+        previous = self._signature()
+        while not self._stop.wait(self.poll_interval):
+            current = self._signature()
+            if current != previous:
+                previous = current
+                self._notify()
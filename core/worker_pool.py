@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""
+Pre-warmed Worker Pool
+Keeps a small set of started Python workers (see core/pool_worker.py) that
+execute skills on request over a pipe, so isolated skills no longer pay
+interpreter start-up on every run. Used for skills with `execution: pool`.
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import atexit
+import threading
+import subprocess
+from pathlib import Path
+from typing import List, Optional
+
+try:
+    from core.execution import OutputBuffer, SkillResult
+except ImportError:
+    from execution import OutputBuffer, SkillResult
+
+WORKER_SCRIPT = Path(__file__).resolve().parent / "pool_worker.py"
+
+# Extra seconds to wait for a worker beyond the skill timeout before killing it
+_RESPONSE_GRACE = 5.0
+
+
+class PoolWorker:
+    """Handle on a single worker process."""
+
+    def __init__(self):
+        self.proc = subprocess.Popen(
+            [sys.executable, str(WORKER_SCRIPT)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            encoding='utf-8',
+            errors='replace',
+            bufsize=1,
+            env=dict(os.environ, PYTHONIOENCODING='utf-8'),
+        )
+        self.runs = 0
+        self.rss_kb = 0
+        self._responses = queue.Queue()
+        self._reader = threading.Thread(target=self._read_responses, daemon=True)
+        self._reader.start()
+
+    def _read_responses(self):
+        for line in self.proc.stdout:
+            self._responses.put(line)
+        self._responses.put(None)
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def request(self, payload: dict, timeout: Optional[float]) -> dict:
+        """Send one run request and wait for its response."""
+        self.proc.stdin.write(json.dumps(payload) + '\n')
+        self.proc.stdin.flush()
+        wait = None if timeout is None else timeout + _RESPONSE_GRACE
+        try:
+            line = self._responses.get(timeout=wait)
+        except queue.Empty:
+            raise TimeoutError("worker did not respond")
+        if line is None:
+            raise RuntimeError("worker exited unexpectedly")
+        self.runs += 1
+        response = json.loads(line)
+        self.rss_kb = response.get('rss_kb', 0)
+        return response
+
+    def stop(self):
+        """Terminate the worker process."""
+        try:
+            self.proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.proc.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+
+
+class WorkerPool:
+    """
+    Bounded pool of pre-started workers.
+
+    Workers are recycled after max_runs requests or once their resident
+    memory exceeds max_rss_mb.
+    """
+
+    def __init__(self, size: Optional[int] = None, max_runs: int = 200, max_rss_mb: int = 512):
+        self.size = size or int(os.environ.get('ASK_POOL_SIZE', 0)) or min(4, os.cpu_count() or 1)
+        self.max_runs = max_runs
+        self.max_rss_mb = max_rss_mb
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._workers: List[PoolWorker] = []
+        self._closed = False
+
+    def start(self):
+        """Pre-start every worker so the first runs are already warm."""
+        with self._lock:
+            missing = self.size - len(self._workers)
+            for _ in range(missing):
+                self._idle.put(self._spawn())
+
+    def _spawn(self) -> PoolWorker:
+        worker = PoolWorker()
+        self._workers.append(worker)
+        return worker
+
+    def _retire(self, worker: PoolWorker):
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+        worker.stop()
+
+    def _acquire(self) -> PoolWorker:
+        """Take an idle worker, starting one if none is warm."""
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    return self._spawn()
+            if worker.alive():
+                return worker
+            self._retire(worker)
+
+    def _release(self, worker: PoolWorker):
+        """Return a worker to the pool, replacing it if it is due for recycling."""
+        worn_out = worker.runs >= self.max_runs or worker.rss_kb > self.max_rss_mb * 1024
+        if self._closed or worn_out or not worker.alive():
+            self._retire(worker)
+            if not self._closed:
+                with self._lock:
+                    self._idle.put(self._spawn())
+        else:
+            self._idle.put(worker)
+
+    def run(self, script_path: Path, args: List[str] = None, timeout: Optional[float] = 30,
+            cwd: Optional[str] = None, max_memory: int = sys.maxsize) -> SkillResult:
+        """
+        Execute a skill script on a pooled worker (in cwd, default: ours).
+        Output beyond max_memory characters per stream stays in the worker's
+        temp file, returned as the result's stdout_file/stderr_file.
+        """
+        if self._closed:
+            raise RuntimeError("worker pool is closed")
+
+        payload = {
+            'script': str(script_path),
+            'args': list(args or []),
+            'cwd': cwd or os.getcwd(),
+            'timeout': timeout,
+        }
+        start = time.perf_counter()
+
+        with self._slots:
+            worker = self._acquire()
+            try:
+                response = worker.request(payload, timeout)
+            except TimeoutError:
+                self._retire(worker)
+                return SkillResult(returncode=1, duration=time.perf_counter() - start, timed_out=True)
+            except Exception:
+                self._retire(worker)
+                raise
+            self._release(worker)
+
+        streams = {}
+        for name in ('stdout', 'stderr'):
+            if response.get(f'{name}_file'):
+                streams[name] = OutputBuffer.from_file(response[f'{name}_file'], max_memory)
+            else:
+                streams[name] = OutputBuffer(sys.maxsize)
+                streams[name].write(response.get(name, ''))
+        return SkillResult(
+            returncode=response.get('returncode', 1),
+            stdout=streams['stdout'].getvalue(),
+            stderr=streams['stderr'].getvalue(),
+            duration=time.perf_counter() - start,
+            timed_out=response.get('timed_out', False),
+            stdout_file=streams['stdout'].path,
+            stderr_file=streams['stderr'].path,
+            cpu_time=response.get('cpu_time'),
+            max_rss_kb=response.get('max_rss_kb'),
+            output_size=streams['stdout'].size + streams['stderr'].size,
+        )
+
+    def close(self):
+        """Stop all workers."""
+        self._closed = True
+        with self._lock:
+            workers = list(self._workers)
+            self._workers.clear()
+        for worker in workers:
+            worker.stop()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> WorkerPool:
+    """Return the process-wide worker pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = WorkerPool()
+            atexit.register(_pool.close)
+        return _pool
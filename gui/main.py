@@ -6,6 +6,7 @@ Modern PyQt6 interface for discovering and executing skills
 
 import sys
 import json
+import time
 import subprocess
 from pathlib import Path
 from datetime import datetime
@@ -28,6 +29,7 @@ class SkillExecutorThread(QThread):
     
     output_signal = pyqtSignal(str)
     error_signal = pyqtSignal(str)
+    completed_signal = pyqtSignal(int, float)  # exit code, duration in seconds
     finished_signal = pyqtSignal()
     
     def __init__(self, skill_name: str, args: List[str] = None):
@@ -37,9 +39,11 @@ class SkillExecutorThread(QThread):
     
     def run(self):
         """Execute the skill in a background thread."""
+        start = time.perf_counter()
         try:
             manager = SkillManager()
-            result = manager.run_skill(self.skill_name, self.args)
+            result = manager.run_skill(self.skill_name, self.args, source='gui')
+            self.completed_signal.emit(result, time.perf_counter() - start)
             
             if result == 0:
                 self.output_signal.emit(f"\n✅ Skill '{self.skill_name}' completed successfully!")
@@ -56,6 +60,9 @@ class SkillExecutorThread(QThread):
 class SkillDetailDialog(QDialog):
     """Dialog showing detailed skill information and execution form."""
     
+    # skill name, arguments, status, duration in seconds
+    run_completed = pyqtSignal(str, str, str, float)
+    
     def __init__(self, skill_name: str, skill_data: Dict, parent=None):
         super().__init__(parent)
         self.skill_name = skill_name
@@ -168,9 +175,11 @@ class SkillDetailDialog(QDialog):
         self.output_text.setText("🚀 Executing skill...\n")
         self.run_button.setEnabled(False)
         
+        self.current_args = args
         self.executor_thread = SkillExecutorThread(self.skill_name, args)
         self.executor_thread.output_signal.connect(self.on_output)
         self.executor_thread.error_signal.connect(self.on_error)
+        self.executor_thread.completed_signal.connect(self.on_completed)
         self.executor_thread.finished_signal.connect(self.on_finished)
         self.executor_thread.start()
     
@@ -182,6 +191,11 @@ class SkillDetailDialog(QDialog):
         """Handle error from skill execution."""
         self.output_text.append(f"\n{message}")
     
+    def on_completed(self, exit_code: int, duration: float):
+        """Report a finished run so it can be added to the history."""
+        status = "Success" if exit_code == 0 else f"Failed ({exit_code})"
+        self.run_completed.emit(self.skill_name, " ".join(self.current_args), status, duration)
+    
     def on_finished(self):
         """Handle skill execution completion."""
         self.run_button.setEnabled(True)
@@ -280,8 +294,8 @@ class ASKDesktopGUI(QMainWindow):
         history_layout = QVBoxLayout()
         
         self.history_table = QTableWidget()
-        self.history_table.setColumnCount(4)
-        self.history_table.setHorizontalHeaderLabels(["Skill", "Arguments", "Status", "Time"])
+        self.history_table.setColumnCount(5)
+        self.history_table.setHorizontalHeaderLabels(["Skill", "Arguments", "Status", "Duration", "Time"])
         self.history_table.horizontalHeader().setStretchLastSection(False)
         history_layout.addWidget(self.history_table)
         
@@ -404,19 +418,20 @@ class ASKDesktopGUI(QMainWindow):
         
         if skill_data:
             dialog = SkillDetailDialog(skill_name, skill_data, self)
-            if dialog.exec() == QDialog.DialogCode.Accepted:
-                # Add to history
-                self.add_to_history(skill_name, "Success")
+            # Every run from the dialog lands in the history
+            dialog.run_completed.connect(self.add_to_history)
+            dialog.exec()
     
-    def add_to_history(self, skill_name: str, status: str):
+    def add_to_history(self, skill_name: str, arguments: str, status: str, duration: float):
         """Add execution to history."""
         row = self.history_table.rowCount()
         self.history_table.insertRow(row)
         
         self.history_table.setItem(row, 0, QTableWidgetItem(skill_name))
-        self.history_table.setItem(row, 1, QTableWidgetItem(""))
+        self.history_table.setItem(row, 1, QTableWidgetItem(arguments))
         self.history_table.setItem(row, 2, QTableWidgetItem(status))
-        self.history_table.setItem(row, 3, QTableWidgetItem(datetime.now().strftime("%H:%M:%S")))
+        self.history_table.setItem(row, 3, QTableWidgetItem(f"{duration:.2f}s"))
+        self.history_table.setItem(row, 4, QTableWidgetItem(datetime.now().strftime("%H:%M:%S")))
     
     def clear_history(self):
         """Clear execution history."""
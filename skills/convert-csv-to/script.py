@@ -3,10 +3,17 @@
 """
 Convert Csv To Skill
 Convert CSV to JSON format
+
+Given a CSV file (or '-' for stdin) the rows are streamed out as JSON Lines,
+one object per row, so the skill works on inputs of any size and can feed
+other skills in an `ask pipe` pipeline.
 """
 
 import sys
 import io
+import os
+import csv
+import json
 
 # Set UTF-8 encoding on Windows
 if sys.platform == 'win32':
@@ -14,16 +21,41 @@ if sys.platform == 'win32':
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
 
 
+def convert(source, out) -> int:
+    """Write each CSV row from source to out as one JSON object per line."""
+    rows = 0
+    for row in csv.DictReader(source):
+        out.write(json.dumps(row, ensure_ascii=False) + "\n")
+        rows += 1
+    return rows
+
+
+def stream(input_arg: str):
+    """Run convert() from a file or stdin ('-') to stdout."""
+    try:
+        if input_arg == '-':
+            convert(io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8', newline=''), sys.stdout)
+        else:
+            with open(input_arg, 'r', encoding='utf-8', newline='') as source:
+                convert(source, sys.stdout)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # The reader went away early (e.g. `| head`): stop quietly
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+
+
 def main(input_arg: str = None):
     """Main execution function."""
+    if input_arg == '-' or (input_arg and os.path.isfile(input_arg)):
+        stream(input_arg)
+        return
+
     if input_arg:
         print(f"🚀 Processing: {input_arg}")
     else:
         print(f"🚀 Convert Csv To is running")
-    
-    # TODO: Implement your skill logic here
-    # This is a skeleton - add your code below
-    
+
     print("✅ Skill execution completed successfully")
 
 
@@ -3,27 +3,108 @@
 """
 Transform Json To Skill
 Transform JSON to YAML
+
+Given a JSON Lines file (or '-' for stdin) each record is streamed out as its
+own YAML document, so the skill can consume `convert-csv-to` output in an
+`ask pipe` pipeline without loading it all into memory. A plain JSON
+document is accepted as well; a top-level list becomes one document per item.
 """
 
 import sys
 import io
+import os
+import re
+import json
 
 # Set UTF-8 encoding on Windows
 if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
 
+_PLAIN_KEY = re.compile(r'^[A-Za-z_][A-Za-z0-9_\-]*$')
+
+
+def _scalar(value) -> str:
+    # JSON scalars are valid YAML flow scalars
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _key(key) -> str:
+    key = str(key)
+    return key if _PLAIN_KEY.match(key) else _scalar(key)
+
+
+def to_yaml(value, indent: int = 0) -> str:
+    """Render a JSON value as block-style YAML."""
+    pad = ' ' * indent
+    if isinstance(value, dict):
+        if not value:
+            return pad + "{}\n"
+        lines = []
+        for key, item in value.items():
+            if isinstance(item, (dict, list)) and item:
+                lines.append(f"{pad}{_key(key)}:\n{to_yaml(item, indent + 2)}")
+            else:
+                lines.append(f"{pad}{_key(key)}: {to_yaml(item).strip()}\n")
+        return ''.join(lines)
+    if isinstance(value, list):
+        if not value:
+            return pad + "[]\n"
+        lines = []
+        for item in value:
+            rendered = to_yaml(item, indent + 2)
+            lines.append(f"{pad}- {rendered.lstrip()}")
+        return ''.join(lines)
+    return pad + _scalar(value) + "\n"
+
+
+def transform(source, out) -> int:
+    """Write every JSON record in source to out as a YAML document."""
+    documents = 0
+    for line in source:
+        if not line.strip():
+            continue
+        try:
+            records = json.loads(line)
+        except ValueError:
+            if documents:
+                raise
+            # Not JSON Lines: parse the whole input as a single document
+            records = json.loads(line + source.read())
+        if not isinstance(records, list):
+            records = [records]
+        for record in records:
+            out.write("---\n" + to_yaml(record))
+            documents += 1
+    return documents
+
+
+def stream(input_arg: str):
+    """Run transform() from a file or stdin ('-') to stdout."""
+    try:
+        if input_arg == '-':
+            transform(io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8'), sys.stdout)
+        else:
+            with open(input_arg, 'r', encoding='utf-8') as source:
+                transform(source, sys.stdout)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # The reader went away early (e.g. `| head`): stop quietly
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+
 
 def main(input_arg: str = None):
     """Main execution function."""
+    if input_arg == '-' or (input_arg and os.path.isfile(input_arg)):
+        stream(input_arg)
+        return
+
     if input_arg:
         print(f"🚀 Processing: {input_arg}")
     else:
         print(f"🚀 Transform Json To is running")
-    
-    # TODO: Implement your skill logic here
-    # This is a skeleton - add your code below
-    
+
     print("✅ Skill execution completed successfully")
 
 
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Gateway Concurrency
+N slow tool calls issued at once through an in-memory MCP session must
+overlap: the batch takes about as long as one call, not N times as long.
+"""
+
+import sys
+import time
+import asyncio
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from core.mcp_gateway import SkillMCPServer
+
+CALLS = 4
+SLEEP = 1.0
+
+MANIFEST = """name: {name}
+description: Sleep, then report
+version: 1.0.0
+"""
+
+SCRIPT = """import time
+time.sleep({sleep})
+print("slept")
+"""
+
+
+def make_sleep_skills(skills_dir: Path, count: int):
+    # Distinct skills, so identical-call coalescing cannot merge the calls
+    for index in range(count):
+        name = f"sleep-{index}"
+        folder = skills_dir / name
+        folder.mkdir(parents=True)
+        (folder / "manifest.yaml").write_text(MANIFEST.format(name=name), encoding='utf-8')
+        (folder / "script.py").write_text(SCRIPT.format(sleep=SLEEP), encoding='utf-8')
+
+
+async def call_all(server: SkillMCPServer, names):
+    async with create_connected_server_and_client_session(server.server) as client:
+        start = time.perf_counter()
+        results = await asyncio.gather(*(client.call_tool(name, {}) for name in names))
+        return time.perf_counter() - start, results
+
+
+def test_parallel_slow_calls_overlap(tmp_path, monkeypatch):
+    monkeypatch.setenv('ASK_TELEMETRY', '0')
+    monkeypatch.setenv('ASK_CACHE_DIR', str(tmp_path / "cache"))
+    monkeypatch.delenv('ASK_MCP_WORKERS', raising=False)
+    skills_dir = tmp_path / "skills"
+    make_sleep_skills(skills_dir, CALLS)
+
+    server = SkillMCPServer(str(skills_dir), max_concurrency=CALLS)
+    elapsed, results = asyncio.run(call_all(server, [f"sleep-{i}" for i in range(CALLS)]))
+
+    for result in results:
+        assert not result.isError
+        assert "slept" in result.content[0].text
+    # Serial execution would take CALLS * SLEEP; allow start-up slack over one call
+    assert elapsed < SLEEP * 2, f"{CALLS} calls of {SLEEP}s took {elapsed:.2f}s"